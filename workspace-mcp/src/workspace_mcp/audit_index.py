@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Entry fields with a posting list, in the order they are stored on a row.
+INDEXED_FIELDS = ("owner", "run_id", "tool", "decision", "code", "violation_key")
+DEFAULT_MAX_ENTRIES = 50_000
+
+Row = Dict[str, Any]
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Epoch seconds for an ISO 8601 timestamp; a trailing 'Z' means UTC.
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _fields(entry: Mapping[str, Any]) -> Tuple[Any, ...]:
+    violation = entry.get("violation") or {}
+    return (
+        entry.get("owner_id_hash"),
+        entry.get("run_id"),
+        entry.get("tool"),
+        entry.get("decision"),
+        entry.get("code"),
+        violation.get("key") if isinstance(violation, dict) else None,
+    )
+
+
+class AuditIndex:
+    """
+    Secondary indexes over audit entries for filtered, paged queries.
+
+    Each insert takes the next sequence number; every indexed field value has a
+    posting list of sequence numbers in ascending order. A query walks only the
+    shortest posting list among its filters (from the cursor onwards) and checks
+    the other filters against the row, so its cost follows the narrowest filter,
+    not the log size. Time ranges bisect a timestamp list kept in insert order.
+
+    Updates that change an indexed field (a post-validation block) append the
+    entry under a new sequence number; stale postings are skipped at query time
+    and dropped when the index is compacted. At most `max_entries` entries are
+    kept, oldest first out.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        self._rows: Dict[int, Row] = {}
+        self._row_fields: Dict[int, Tuple[Any, ...]] = {}
+        self._seq_of: Dict[str, int] = {}  # audit_id -> current sequence number
+        self._postings: Dict[Tuple[str, Any], List[int]] = {}
+        self._all: List[int] = []  # every sequence number, ascending
+        self._times: List[float] = []  # per entry of _all, clamped to be nondecreasing
+        self._ts: Dict[int, float] = {}  # actual timestamp per live sequence number
+        self._stale = 0
+        self._head = 0  # position in _all of the oldest possibly-live entry
+
+    def __len__(self) -> int:
+        return len(self._seq_of)
+
+    @staticmethod
+    def _row(entry: Mapping[str, Any], fields: Tuple[Any, ...]) -> Row:
+        return {
+            "audit_id": entry.get("audit_id"),
+            "timestamp": entry.get("timestamp"),
+            "tool": entry.get("tool"),
+            "risk": entry.get("risk"),
+            "decision": entry.get("decision"),
+            "code": entry.get("code"),
+            "violation_key": fields[5],
+            "run_id": entry.get("run_id"),
+            "duration_ms": entry.get("duration_ms"),
+        }
+
+    def add(self, entry: Mapping[str, Any]) -> None:
+        """
+        Indexes a new entry, or refreshes one already indexed under its audit_id.
+        """
+        audit_id = entry["audit_id"]
+        fields = _fields(entry)
+        with self._lock:
+            seq = self._seq_of.get(audit_id)
+            if seq is not None and self._row_fields[seq] == fields:
+                self._rows[seq] = self._row(entry, fields)
+                return
+            if seq is not None:
+                self._drop(seq)
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seq_of[audit_id] = seq
+            self._rows[seq] = self._row(entry, fields)
+            self._row_fields[seq] = fields
+            for name, value in zip(INDEXED_FIELDS, fields):
+                self._postings.setdefault((name, value), []).append(seq)
+            self._all.append(seq)
+            try:
+                ts = parse_timestamp(str(entry.get("timestamp")))
+            except ValueError:
+                ts = self._times[-1] if self._times else 0.0
+            self._ts[seq] = ts
+            # Re-added entries and clock steps must not break the bisect invariant.
+            self._times.append(max(ts, self._times[-1]) if self._times else ts)
+
+            while len(self._seq_of) > self.max_entries:
+                while self._all[self._head] not in self._rows:
+                    self._head += 1
+                oldest = self._all[self._head]
+                self._seq_of.pop(self._rows[oldest]["audit_id"], None)
+                self._drop(oldest)
+            if self._stale > len(self._rows):
+                self._compact()
+
+    def _drop(self, seq: int) -> None:
+        self._rows.pop(seq, None)
+        self._row_fields.pop(seq, None)
+        self._ts.pop(seq, None)
+        self._stale += 1
+
+    def _compact(self) -> None:
+        keep = [i for i, s in enumerate(self._all) if s in self._rows]
+        self._all = [self._all[i] for i in keep]
+        self._times = [self._times[i] for i in keep]
+        self._postings = {}
+        for seq in self._all:
+            for name, value in zip(INDEXED_FIELDS, self._row_fields[seq]):
+                self._postings.setdefault((name, value), []).append(seq)
+        self._stale = 0
+        self._head = 0
+
+    def query(
+        self,
+        filters: Mapping[str, Any],
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: int = -1,
+        limit: int = 50,
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Rows matching every filter (field name -> required value), in insert order,
+        starting after sequence number `after`. Returns (rows, next cursor or None).
+        """
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown audit filters: {sorted(unknown)}")
+        wanted = [(INDEXED_FIELDS.index(name), value) for name, value in filters.items()]
+        with self._lock:
+            start = after + 1
+            stop = self._next_seq
+            if since is not None:
+                pos = bisect_left(self._times, since)
+                start = max(start, self._all[pos] if pos < len(self._all) else self._next_seq)
+            if until is not None:
+                pos = bisect_right(self._times, until)
+                stop = self._all[pos] if pos < len(self._all) else self._next_seq
+            candidates = self._all
+            for name, value in filters.items():
+                postings = self._postings.get((name, value), [])
+                if len(postings) < len(candidates):
+                    candidates = postings
+
+            rows: List[Row] = []
+            last = -1
+            for i in range(bisect_left(candidates, start), len(candidates)):
+                seq = candidates[i]
+                if seq >= stop:
+                    break
+                fields = self._row_fields.get(seq)
+                if fields is None or any(fields[idx] != value for idx, value in wanted):
+                    continue
+                ts = self._ts[seq]
+                if (since is not None and ts < since) or (until is not None and ts > until):
+                    continue
+                if len(rows) == limit:
+                    return rows, last
+                rows.append(dict(self._rows[seq]))
+                last = seq
+            return rows, None
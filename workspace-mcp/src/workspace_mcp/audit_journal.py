@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .mcp_logging import logger
+
+DEFAULT_SEGMENT_MAX_BYTES = 16_000_000
+DEFAULT_MAX_SEGMENTS = 16
+
+_SEGMENT_RE = re.compile(r"^audit-(\d{8})\.jsonl$")
+
+Location = Tuple[int, int]  # (segment number, byte offset of the line)
+
+
+def _segment_name(number: int) -> str:
+    return f"audit-{number:08d}.jsonl"
+
+
+class AuditJournal:
+    """
+    Append-only audit log on disk: JSONL segments rotated at `segment_max_bytes`,
+    with at most `max_segments` kept (the oldest is deleted on rotation).
+
+    An in-memory audit_id -> (segment, offset) index makes lookups one seek and
+    one readline. An entry that changes after it was written (e.g. duration_ms)
+    is appended again and the index moves to the newest line. The index is
+    rebuilt by scanning the retained segments when the journal is opened (each
+    entry is also passed to `on_entry`), so entries survive restarts.
+
+    Each `append` batch is flushed and fsynced before it returns, so a written
+    entry survives a power loss as well as a process crash. Batch appends (the
+    Governor's background writer does) to amortize the fsync.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+        on_entry: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        if segment_max_bytes <= 0 or max_segments <= 0:
+            raise ValueError("segment_max_bytes and max_segments must be > 0")
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self._index: Dict[str, Location] = {}
+        self._segments: List[int] = []
+        self._lock = threading.Lock()
+        self._handle: Optional[IO[bytes]] = None
+        self._size = 0
+        self.appended = 0
+        self._on_entry = on_entry
+
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        for path in sorted(self.directory.iterdir()):
+            m = _SEGMENT_RE.match(path.name)
+            if m:
+                self._segments.append(int(m.group(1)))
+        for number in self._segments:
+            self._scan(number)
+        self._open(self._segments[-1] if self._segments else 1)
+
+    def _path(self, number: int) -> Path:
+        return self.directory / _segment_name(number)
+
+    def _scan(self, number: int) -> None:
+        offset = 0
+        with self._path(number).open("rb") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                    audit_id = entry["audit_id"]
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line from a crash; later appends start after it.
+                    audit_id = None
+                if isinstance(audit_id, str):
+                    self._index[audit_id] = (number, offset)
+                    if self._on_entry is not None:
+                        self._on_entry(entry)
+                offset += len(line)
+
+    def _open(self, number: int) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        path = self._path(number)
+        self._handle = path.open("ab")
+        os.chmod(path, 0o600)
+        self._size = self._handle.tell()
+        if self._size:
+            with path.open("rb") as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b"\n":
+                    # Terminate a torn line so the next entry starts cleanly.
+                    self._handle.write(b"\n")
+                    self._size += 1
+        if number not in self._segments:
+            self._segments.append(number)
+
+    def _rotate(self) -> None:
+        self._open(self._segments[-1] + 1)
+        while len(self._segments) > self.max_segments:
+            oldest = self._segments.pop(0)
+            self._index = {k: loc for k, loc in self._index.items() if loc[0] != oldest}
+            self._path(oldest).unlink(missing_ok=True)
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """
+        Writes entries in order and flushes once for the whole batch.
+        """
+        with self._lock:
+            assert self._handle is not None
+            for entry in entries:
+                line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+                if self._size and self._size + len(line) > self.segment_max_bytes:
+                    self._handle.flush()
+                    os.fsync(self._handle.fileno())
+                    self._rotate()
+                self._handle.write(line)
+                self._index[entry["audit_id"]] = (self._segments[-1], self._size)
+                self._size += len(line)
+                self.appended += 1
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+    def get(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            location = self._index.get(audit_id)
+        if location is None:
+            return None
+        number, offset = location
+        try:
+            with self._path(number).open("rb") as handle:
+                handle.seek(offset)
+                return json.loads(handle.readline())
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable audit journal entry {audit_id}: {e}")
+            return None
+
+    def __contains__(self, audit_id: str) -> bool:
+        return audit_id in self._index
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "segments": len(self._segments),
+                "indexed_entries": len(self._index),
+                "appended": self.appended,
+                "current_segment_bytes": self._size,
+            }
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from .mcp_logging import logger
+
+# ("log", entry) appends a new audit entry; ("update", audit_id, fields) patches one.
+AuditRecord = Tuple[Any, ...]
+BatchWriter = Callable[[List[AuditRecord]], None]
+
+DEFAULT_MAX_PENDING = 10_000
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_BLOCK_SECONDS = 0.05
+
+
+class AuditPipeline:
+    """
+    Bounded FIFO of audit records drained by one background writer thread.
+
+    Producers only append to the queue; store inserts and log emission happen in
+    the writer, `batch_size` records at a time, in submission order (so an
+    update always lands after the entry it patches). When the queue is full a
+    producer waits up to `max_block_seconds` for room (backpressure) and then
+    drops the record, counting it in `dropped`, rather than stalling the tool call.
+    """
+
+    def __init__(
+        self,
+        write_batch: BatchWriter,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_block_seconds: float = DEFAULT_MAX_BLOCK_SECONDS,
+    ):
+        if max_pending <= 0 or batch_size <= 0:
+            raise ValueError("max_pending and batch_size must be > 0")
+        self._write_batch = write_batch
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.max_block_seconds = max_block_seconds
+        self._pending: Deque[AuditRecord] = deque()
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.submitted = 0
+        self.dropped = 0
+        self.batches = 0
+        self.blocked_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name="workspace-audit", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: AuditRecord) -> bool:
+        """
+        Queues a record; False if it was dropped because the queue stayed full.
+        """
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                started = time.monotonic()
+                self._cond.wait_for(lambda: len(self._pending) < self.max_pending or self._closed, timeout=self.max_block_seconds)
+                self.blocked_seconds += time.monotonic() - started
+                if len(self._pending) >= self.max_pending or self._closed:
+                    self.dropped += 1
+                    return False
+            self._pending.append(record)
+            self.submitted += 1
+            self._cond.notify_all()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._pending) or self._closed)
+                if not self._pending:
+                    return
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Audit writer failed on a batch of {len(batch)}: {e}")
+            with self._cond:
+                self._in_flight = 0
+                self.batches += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waits until everything submitted so far is written. False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": len(self._pending) + self._in_flight,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "blocked_seconds": round(self.blocked_seconds, 3),
+            }
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from .task_parsers import collect_report, prepare_report_file
+from .task_runner import OutputLine, Spawner, TaskCancelled, TaskOutput, run_command
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class OutputLog:
+    """
+    Append-only line log with absolute cursors, capped at `max_bytes`.
+
+    When the cap is exceeded the oldest lines are dropped; cursors keep counting,
+    so a poller that fell behind learns how many lines it missed.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lines: Deque[OutputLine] = deque()
+        self._bytes = 0
+        self._base = 0
+        self._lock = threading.Lock()
+
+    def extend(self, batch: List[OutputLine]) -> None:
+        with self._lock:
+            for stream, line in batch:
+                self._lines.append((stream, line))
+                self._bytes += len(line) + 1
+            while self._bytes > self.max_bytes and self._lines:
+                _, dropped = self._lines.popleft()
+                self._bytes -= len(dropped) + 1
+                self._base += 1
+
+    def read(self, cursor: int, limit: int) -> Dict[str, Any]:
+        with self._lock:
+            start = max(cursor, self._base)
+            lines = list(self._lines)[start - self._base:start - self._base + limit]
+            return {
+                "lines": [{"stream": stream, "line": line} for stream, line in lines],
+                "next_cursor": start + len(lines),
+                "dropped_lines": start - cursor if cursor < start else 0,
+            }
+
+
+class BackgroundTask:
+    """
+    One allowlisted task submitted to the governor's worker pool.
+    """
+
+    def __init__(self, task_id: str, task_name: str, command: Sequence[str], owner_hash: Optional[str], run_id: Optional[str], max_output_bytes: int, parser: Optional[str] = None, limits: Optional[Dict[str, int]] = None, spawn: Optional[Spawner] = None):
+        self.task_id = task_id
+        self.task_name = task_name
+        self.command = list(command)
+        self.owner_hash = owner_hash
+        self.run_id = run_id
+        self.status = "queued"
+        self.exit_code: Optional[int] = None
+        self.error: Optional[str] = None
+        self.result: Optional[TaskOutput] = None
+        self.parser = parser
+        self.limits = limits
+        self.spawn = spawn
+        self.report: Optional[Dict[str, Any]] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.output = OutputLog(max_output_bytes)
+        self._cancel = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        if self.status == "queued":
+            self._finish("cancelled")
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.time()
+
+    def run(self, cwd: Path, timeout: float, max_output_bytes: int) -> None:
+        if self._cancel.is_set():
+            return
+        self.status = "running"
+        self.started_at = time.time()
+        argv, report_path = prepare_report_file(self.command) if self.parser else (self.command, None)
+        try:
+            self.result = run_command(
+                argv,
+                cwd=cwd,
+                timeout=timeout,
+                max_output_bytes=max_output_bytes,
+                on_output=self.output.extend,
+                cancel=self._cancel,
+                limits=self.limits,
+                spawn=self.spawn,
+            )
+            self.exit_code = self.result.exit_code
+            if self.parser:
+                self.report = collect_report(self.parser, report_path, self.result.stdout, cwd)
+            self._finish("succeeded" if self.exit_code == 0 else "failed")
+        except TaskCancelled:
+            self._finish("cancelled")
+        except subprocess.TimeoutExpired:
+            self.error = f"Task '{self.task_name}' timed out after {timeout}s"
+            self._finish("timeout")
+        except Exception as e:
+            self.error = f"Execution failed: {str(e)}"
+            self._finish("failed")
+        finally:
+            if report_path is not None:
+                report_path.unlink(missing_ok=True)
+
+    def snapshot(self, cursor: int = 0, limit: int = 200) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        begin = self.started_at or end
+        data: Dict[str, Any] = {
+            "task_id": self.task_id,
+            "task_name": self.task_name,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "duration_seconds": round(end - begin, 2),
+            **self.output.read(cursor, limit),
+        }
+        if self.error:
+            data["error"] = self.error
+        if self.result is not None:
+            data["output_truncated"] = self.result.output_truncated
+            data["output_stats"] = self.result.output_stats()
+            data["rusage"] = self.result.rusage.as_dict() if self.result.rusage else None
+        if self.report is not None:
+            data["report"] = self.report
+        return data
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Range = Tuple[int, int]  # inclusive old-file line range
+Entry = Tuple[int, int, str]  # (start, end, bundle_id)
+
+
+class _Node:
+    __slots__ = ("key", "priority", "max_end", "left", "right")
+
+    def __init__(self, key: Entry) -> None:
+        self.key = key
+        self.priority = random.random()
+        self.max_end = key[1]
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _update(node: _Node) -> None:
+    max_end = node.key[1]
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    top = node.left
+    assert top is not None
+    node.left = top.right
+    top.right = node
+    _update(node)
+    _update(top)
+    return top
+
+
+def _rotate_left(node: _Node) -> _Node:
+    top = node.right
+    assert top is not None
+    node.right = top.left
+    top.left = node
+    _update(node)
+    _update(top)
+    return top
+
+
+def _insert(node: Optional[_Node], key: Entry) -> _Node:
+    if node is None:
+        return _Node(key)
+    if key < node.key:
+        node.left = _insert(node.left, key)
+        if node.left.priority > node.priority:
+            return _rotate_right(node)
+    else:
+        node.right = _insert(node.right, key)
+        if node.right.priority > node.priority:
+            return _rotate_left(node)
+    _update(node)
+    return node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    # Every key in `left` sorts before every key in `right`.
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _delete(node: Optional[_Node], key: Entry) -> Optional[_Node]:
+    if node is None:
+        return None
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif key > node.key:
+        node.right = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+
+def _collect(node: Optional[_Node], start: int, end: int, out: List[Entry]) -> int:
+    """
+    Appends entries overlapping [start, end] in key order; returns nodes visited.
+    """
+    visited = 0
+    while node is not None and node.max_end >= start:
+        visited += 1
+        visited += _collect(node.left, start, end, out)
+        if node.key[0] > end:
+            break
+        if node.key[1] >= start:
+            out.append(node.key)
+        node = node.right
+    return visited
+
+
+class _FileIntervals:
+    """
+    Intervals for one file in an augmented interval tree: a treap ordered by
+    (start, end, bundle_id) where every node carries the max end of its subtree.
+
+    Insert and delete are O(log n) expected. A query skips every subtree whose
+    max end is below the probe start and stops at the first node starting after
+    the probe end, so it costs O(log n) per reported overlap; one wide interval
+    (a whole-file range) only keeps its own ancestors from being pruned.
+    """
+
+    __slots__ = ("_root", "_size", "last_visited")
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self.last_visited = 0  # nodes visited by the last query, for diagnostics
+
+    def add(self, start: int, end: int, bundle_id: str) -> None:
+        self._root = _insert(self._root, (start, end, bundle_id))
+        self._size += 1
+
+    def remove(self, start: int, end: int, bundle_id: str) -> None:
+        self._root = _delete(self._root, (start, end, bundle_id))
+        self._size -= 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def overlapping(self, start: int, end: int) -> List[Entry]:
+        out: List[Entry] = []
+        self.last_visited = _collect(self._root, start, end, out)
+        return out
+
+
+class HunkIntervalIndex:
+    """
+    Per-file interval index of hunk ranges across all live bundles.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, _FileIntervals] = {}
+        self._by_bundle: Dict[str, Dict[str, List[Range]]] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, bundle_id: object) -> bool:
+        with self._lock:
+            return bundle_id in self._by_bundle
+
+    def add(self, bundle_id: str, hunk_ranges: Dict[str, Sequence[Sequence[int]]]) -> None:
+        with self._lock:
+            if bundle_id in self._by_bundle:
+                return
+            ranges: Dict[str, List[Range]] = {}
+            for path, path_ranges in hunk_ranges.items():
+                intervals = self._files.setdefault(path, _FileIntervals())
+                ranges[path] = []
+                seen = set()
+                for start, end in path_ranges:
+                    entry = (int(start), int(end))
+                    if entry in seen:
+                        continue
+                    seen.add(entry)
+                    intervals.add(entry[0], entry[1], bundle_id)
+                    ranges[path].append(entry)
+            self._by_bundle[bundle_id] = ranges
+
+    def remove(self, bundle_id: str) -> None:
+        with self._lock:
+            ranges = self._by_bundle.pop(bundle_id, None)
+            if not ranges:
+                return
+            for path, path_ranges in ranges.items():
+                intervals = self._files.get(path)
+                if intervals is None:
+                    continue
+                for start, end in path_ranges:
+                    intervals.remove(start, end, bundle_id)
+                if not len(intervals):
+                    del self._files[path]
+
+    def conflicts(self, bundle_id: str) -> Dict[str, Dict[str, List[Range]]]:
+        """
+        Returns {other_bundle_id: {path: [overlapping ranges of the other bundle]}}.
+        """
+        with self._lock:
+            out: Dict[str, Dict[str, List[Range]]] = {}
+            for path, ranges in self._by_bundle.get(bundle_id, {}).items():
+                intervals = self._files.get(path)
+                if intervals is None:
+                    continue
+                for start, end in ranges:
+                    for o_start, o_end, other_id in intervals.overlapping(start, end):
+                        if other_id == bundle_id:
+                            continue
+                        hits = out.setdefault(other_id, {}).setdefault(path, [])
+                        if (o_start, o_end) not in hits:
+                            hits.append((o_start, o_end))
+            for files in out.values():
+                for hits in files.values():
+                    hits.sort()
+            return out
+
+    def independent_groups(self, bundle_ids: Sequence[str], order: Optional[Dict[str, float]] = None) -> List[List[str]]:
+        """
+        Greedy partition into groups with no pairwise overlap; each group can be applied
+        in parallel. Bundles are placed in creation order (then id) for determinism.
+        """
+        with self._lock:
+            ordering = order or {}
+            ordered = sorted(dict.fromkeys(bundle_ids), key=lambda b: (ordering.get(b, 0.0), b))
+            wanted = set(ordered)
+            groups: List[List[str]] = []
+            group_of: Dict[str, int] = {}
+            for bundle_id in ordered:
+                blocked = {group_of[o] for o in self.conflicts(bundle_id) if o in wanted and o in group_of}
+                slot = next((i for i in range(len(groups)) if i not in blocked), len(groups))
+                if slot == len(groups):
+                    groups.append([])
+                groups[slot].append(bundle_id)
+                group_of[bundle_id] = slot
+            return groups
@@ -124,6 +124,42 @@ TOOL_REGISTRY: dict[str, ToolCapability] = {
         expected_artifacts=["patch_result", "modified_files"],
     ),
     
+    "begin_diff_upload": ToolCapability(
+        tool_id="begin_diff_upload",
+        display_name="Begin Diff Upload",
+        description="Open a spooled upload for a large diff sent in chunks",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.WRITE,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve"],
+        expected_artifacts=["upload_id"],
+    ),
+    
+    "append_diff_chunk": ToolCapability(
+        tool_id="append_diff_chunk",
+        display_name="Append Diff Chunk",
+        description="Append the next sequenced chunk to a diff upload",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.WRITE,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve"],
+        expected_artifacts=["upload_id"],
+    ),
+    
+    "commit_diff_upload": ToolCapability(
+        tool_id="commit_diff_upload",
+        display_name="Commit Diff Upload",
+        description="Seal a diff upload and return a handle usable by patch and bundle tools",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.WRITE,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve"],
+        expected_artifacts=["diff_handle"],
+    ),
+    
     "create_change_bundle": ToolCapability(
         tool_id="create_change_bundle",
         display_name="Create Change Bundle",
@@ -136,6 +172,18 @@ TOOL_REGISTRY: dict[str, ToolCapability] = {
         expected_artifacts=["bundle_id", "bundle_summary"],
     ),
     
+    "squash_bundles": ToolCapability(
+        tool_id="squash_bundles",
+        display_name="Squash Bundles",
+        description="Compose a chain of change bundles into one canonical bundle",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.WRITE,
+        approval_posture=ApprovalPosture.ASK,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve"],
+        expected_artifacts=["bundle_id", "bundle_summary"],
+    ),
+    
     "bundle_report": ToolCapability(
         tool_id="bundle_report",
         display_name="Bundle Report",
@@ -148,6 +196,42 @@ TOOL_REGISTRY: dict[str, ToolCapability] = {
         expected_artifacts=["bundle_details"],
     ),
     
+    "bundle_status": ToolCapability(
+        tool_id="bundle_status",
+        display_name="Bundle Status",
+        description="Check whether a change bundle is fresh, stale or conflicting against the current workspace",
+        category=ToolCategory.ANALYSIS,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve", "review_and_signoff"],
+        expected_artifacts=["bundle_freshness"],
+    ),
+    
+    "bundle_conflicts": ToolCapability(
+        tool_id="bundle_conflicts",
+        display_name="Bundle Conflicts",
+        description="List live bundles whose hunks overlap a change bundle",
+        category=ToolCategory.ANALYSIS,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve", "review_and_signoff"],
+        expected_artifacts=["bundle_conflicts"],
+    ),
+    
+    "bundle_groups": ToolCapability(
+        tool_id="bundle_groups",
+        display_name="Bundle Groups",
+        description="Partition bundles into non-overlapping groups that can be applied in parallel",
+        category=ToolCategory.ANALYSIS,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["draft_and_approve", "review_and_signoff"],
+        expected_artifacts=["bundle_groups"],
+    ),
+    
     # === LIFECYCLE TOOLS ===
     "start_run": ToolCapability(
         tool_id="start_run",
@@ -197,6 +281,66 @@ TOOL_REGISTRY: dict[str, ToolCapability] = {
         expected_artifacts=["task_result"],
     ),
     
+    "run_pipeline": ToolCapability(
+        tool_id="run_pipeline",
+        display_name="Run Pipeline",
+        description="Run a task and its declared dependencies with bounded parallelism",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.EXECUTE,
+        approval_posture=ApprovalPosture.ASK,
+        requires_owner=True,
+        supported_workflows=["generic"],
+        expected_artifacts=["pipeline_result"],
+    ),
+    
+    "start_task": ToolCapability(
+        tool_id="start_task",
+        display_name="Start Task",
+        description="Start a predefined task in the background worker pool",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.EXECUTE,
+        approval_posture=ApprovalPosture.ASK,
+        requires_owner=True,
+        supported_workflows=["generic"],
+        expected_artifacts=["task_id"],
+    ),
+    
+    "read_task_output": ToolCapability(
+        tool_id="read_task_output",
+        display_name="Read Task Output",
+        description="Page through or grep the full output of a truncated task run",
+        category=ToolCategory.READ,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=False,
+        supported_workflows=["generic"],
+        expected_artifacts=["task_output_page"],
+    ),
+    
+    "poll_task": ToolCapability(
+        tool_id="poll_task",
+        display_name="Poll Task",
+        description="Read status and incremental output of a background task",
+        category=ToolCategory.READ,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=False,
+        supported_workflows=["generic"],
+        expected_artifacts=["task_status", "task_result"],
+    ),
+    
+    "cancel_task": ToolCapability(
+        tool_id="cancel_task",
+        display_name="Cancel Task",
+        description="Cancel a queued or running background task",
+        category=ToolCategory.WRITE,
+        risk_level=RiskLevel.WRITE,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=True,
+        supported_workflows=["generic"],
+        expected_artifacts=["task_status"],
+    ),
+    
     # === POLICY TOOLS ===
     "explain_policy_decision": ToolCapability(
         tool_id="explain_policy_decision",
@@ -210,6 +354,18 @@ TOOL_REGISTRY: dict[str, ToolCapability] = {
         expected_artifacts=["policy_explanation"],
     ),
     
+    "query_audit": ToolCapability(
+        tool_id="query_audit",
+        display_name="Query Audit Log",
+        description="List audit entries filtered by run, tool, decision, code, violation key or time range, with paging",
+        category=ToolCategory.POLICY,
+        risk_level=RiskLevel.READ,
+        approval_posture=ApprovalPosture.AUTO,
+        requires_owner=False,
+        supported_workflows=["generic", "review_and_signoff"],
+        expected_artifacts=["audit_entries"],
+    ),
+    
     "self_check": ToolCapability(
         tool_id="self_check",
         display_name="Self Check",
@@ -255,12 +411,24 @@ WORKFLOW_CAPABILITY_BUNDLES: dict[str, list[str]] = {
         "read_file",
         "validate_patch",
         "apply_patch",
+        "begin_diff_upload",
+        "append_diff_chunk",
+        "commit_diff_upload",
         "create_change_bundle",
+        "squash_bundles",
         "bundle_report",
+        "bundle_status",
+        "bundle_conflicts",
+        "bundle_groups",
         "start_run",
         "end_run",
         "get_run_summary",
         "run_task",
+        "run_pipeline",
+        "start_task",
+        "poll_task",
+        "read_task_output",
+        "cancel_task",
         "explain_policy_decision",
         "self_check",
         "kernel_version",
@@ -270,6 +438,9 @@ WORKFLOW_CAPABILITY_BUNDLES: dict[str, list[str]] = {
         "repo_search",
         "read_file",
         "bundle_report",
+        "bundle_status",
+        "bundle_conflicts",
+        "bundle_groups",
         "start_run",
         "end_run",
         "get_run_summary",
@@ -283,12 +454,24 @@ WORKFLOW_CAPABILITY_BUNDLES: dict[str, list[str]] = {
         "read_file",
         "validate_patch",
         "apply_patch",
+        "begin_diff_upload",
+        "append_diff_chunk",
+        "commit_diff_upload",
         "create_change_bundle",
+        "squash_bundles",
         "bundle_report",
+        "bundle_status",
+        "bundle_conflicts",
+        "bundle_groups",
         "start_run",
         "end_run",
         "get_run_summary",
         "run_task",
+        "run_pipeline",
+        "start_task",
+        "poll_task",
+        "read_task_output",
+        "cancel_task",
         "explain_policy_decision",
         "self_check",
         "kernel_version",
@@ -323,6 +506,14 @@ ARTIFACT_TYPES = {
         "description": "List of files modified by patch",
         "mime_type": "application/json",
     },
+    "upload_id": {
+        "description": "Identifier of an in-progress chunked diff upload",
+        "mime_type": "text/plain",
+    },
+    "diff_handle": {
+        "description": "Committed diff upload usable in place of diff_text",
+        "mime_type": "text/plain",
+    },
     "bundle_id": {
         "description": "Unique identifier for a change bundle",
         "mime_type": "text/plain",
@@ -335,6 +526,18 @@ ARTIFACT_TYPES = {
         "description": "Detailed bundle report",
         "mime_type": "application/json",
     },
+    "bundle_freshness": {
+        "description": "Per-file fresh/stale/conflicting status of a bundle",
+        "mime_type": "application/json",
+    },
+    "bundle_conflicts": {
+        "description": "Bundles with overlapping hunk ranges",
+        "mime_type": "application/json",
+    },
+    "bundle_groups": {
+        "description": "Independent bundle sets that can be applied in parallel",
+        "mime_type": "application/json",
+    },
     "run_id": {
         "description": "Unique run identifier",
         "mime_type": "text/plain",
@@ -355,6 +558,22 @@ ARTIFACT_TYPES = {
         "description": "Complete audit log for the run",
         "mime_type": "application/json",
     },
+    "pipeline_result": {
+        "description": "Per-task status and timing for a task pipeline run",
+        "mime_type": "application/json",
+    },
+    "task_id": {
+        "description": "Handle of a background task",
+        "mime_type": "text/plain",
+    },
+    "task_output_page": {
+        "description": "A byte range or grep matches from a task's full output",
+        "mime_type": "application/json",
+    },
+    "task_status": {
+        "description": "Background task status with incremental output lines",
+        "mime_type": "application/json",
+    },
     "task_result": {
         "description": "Result of running a predefined task",
         "mime_type": "application/json",
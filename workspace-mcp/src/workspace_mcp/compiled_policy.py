@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+from fnmatch import translate
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .config import PolicyConfig
+
+_TERMINAL = ""  # trie key marking the end of an allow_paths root; never a real path component
+
+
+def compile_globs(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    """
+    One regex equivalent to "any fnmatch pattern matches". translate() output is
+    anchored and self-contained, so the alternation keeps each pattern's meaning.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate(p)})" for p in patterns))
+
+
+def _allow_root(path: str) -> str:
+    return str(Path(path).as_posix()).lstrip("./")
+
+
+class CompiledPolicy:
+    """
+    Path matchers built once per policy load.
+
+    deny_globs become a single compiled regex, so a path is tested in one scan
+    instead of one fnmatch call per glob; the per-glob patterns are only consulted
+    to name the culprit once a path is already known to be denied. allow_paths
+    roots go into a trie over path components, so membership costs the path's
+    depth rather than the number of roots. Matching follows fnmatch on POSIX
+    (case-sensitive, '*' crosses '/'), like the checks it replaces.
+    """
+
+    def __init__(self, deny_globs: Sequence[str], allow_paths: Sequence[str], risk_rules: Optional[Mapping[str, Sequence[str]]] = None):
+        self.deny_globs: Tuple[str, ...] = tuple(deny_globs)
+        self.allow_paths: Tuple[str, ...] = tuple(allow_paths)
+        self._deny = compile_globs(self.deny_globs)
+        self._deny_each: List[Tuple[str, Pattern[str]]] = [(p, re.compile(translate(p))) for p in self.deny_globs]
+
+        roots = [_allow_root(p) for p in self.allow_paths]
+        self.allow_all = "" in roots
+        self._trie: Dict[str, dict] = {}
+        for root in roots:
+            node = self._trie
+            for part in root.split("/"):
+                node = node.setdefault(part, {})
+            node[_TERMINAL] = {}
+
+        rules = risk_rules or {}
+        self._high = compile_globs(list(rules.get("high_globs", [])))
+        self._medium = compile_globs(list(rules.get("medium_globs", [])))
+
+    @classmethod
+    def from_config(cls, config: "PolicyConfig") -> "CompiledPolicy":
+        return cls(config.deny_globs, config.allow_paths, config.risk_rules)
+
+    def is_denied(self, rel_path: str) -> bool:
+        return self._deny is not None and self._deny.match(rel_path) is not None
+
+    def denied_by(self, rel_path: str) -> Optional[str]:
+        """
+        The first deny glob (in policy order) matching rel_path, or None.
+        """
+        if not self.is_denied(rel_path):
+            return None
+        return next(p for p, regex in self._deny_each if regex.match(rel_path))
+
+    def is_allowed(self, rel_path: str) -> bool:
+        """
+        True when the path equals or lies under an allow_paths root. An empty
+        allow_paths list allows nothing; callers that treat "no allowlist" as
+        unrestricted check `allow_paths` first.
+        """
+        if self.allow_all:
+            return True
+        node = self._trie
+        for part in rel_path.replace("\\", "/").lstrip("./").split("/"):
+            node = node.get(part)  # type: ignore[assignment]
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+    def classify_risk(self, rel_path: str) -> str:
+        if self._high is not None and self._high.match(rel_path):
+            return "high"
+        if self._medium is not None and self._medium.match(rel_path):
+            return "medium"
+        return "low"
+
+
+@lru_cache(maxsize=32)
+def compile_policy(deny_globs: Tuple[str, ...], allow_paths: Tuple[str, ...] = ()) -> CompiledPolicy:
+    """
+    Memoized matchers for call sites that only have raw glob lists.
+    """
+    return CompiledPolicy(deny_globs, allow_paths)
@@ -0,0 +1,70 @@
+"""
+Locking primitives shared by the Governor and its stores.
+
+Concurrency contract
+--------------------
+Tool functions may be called from several threads at once. FastMCP itself calls
+sync tools inline on the event loop, so the stdio server binds read-risk tools,
+run_task and run_pipeline as async tools that hand the call to an anyio worker
+thread; run_pipeline also runs its nodes on a thread pool. Other write tools
+still run on the event loop, one at a time. The guarantees are:
+
+- Every store and cache the Governor owns (BoundedStore, TaskResultCache,
+  FileDigestCache, HunkIntervalIndex, DecisionCache, AuditIndex, AuditJournal,
+  AuditPipeline, RateLimiter, ImportGraph, WarmPool) serializes its own
+  operations with an internal lock. Single operations are atomic; sequences of
+  operations (get, then set) are not.
+- Run records (RunRecord) are shared between threads. Mutate one, or read more
+  than one field of it consistently, only while holding
+  `Governor.run_lock(run_id)`.
+  This is one of a fixed set of striped locks, so unrelated runs rarely contend.
+- Governor counters (`run_counter`) are AtomicCounters.
+- Read-risk tools only read shared state, apart from appending their audit entry
+  and run accounting, which follow the rules above. They can run in parallel
+  with each other and with write/execute tools. Write tools that touch the same
+  files (apply_patch, squash_bundles) are not serialized against each other;
+  callers that need ordering must provide it, as before.
+
+No lock is held while calling back into another store, except for BoundedStore
+on_evict hooks. Those run under the store's lock and must not re-enter that
+store.
+"""
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import List
+
+
+class AtomicCounter:
+    """
+    Integer counter whose increment-and-read is atomic across threads.
+    """
+
+    def __init__(self, value: int = 0):
+        self._value = value
+        self._lock = threading.Lock()
+
+    def increment(self, amount: int = 1) -> int:
+        with self._lock:
+            self._value += amount
+            return self._value
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class StripedLock:
+    """
+    A fixed pool of locks selected by key hash: per-key mutual exclusion without
+    a lock object per key (or the bookkeeping to free them).
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes <= 0:
+            raise ValueError("stripes must be > 0")
+        self._locks: List[threading.RLock] = [threading.RLock() for _ in range(stripes)]
+
+    def for_key(self, key: str) -> threading.RLock:
+        return self._locks[zlib.crc32(key.encode("utf-8")) % len(self._locks)]
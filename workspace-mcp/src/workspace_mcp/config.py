@@ -16,6 +16,10 @@ class PolicyConfig:
     allow_paths: list[str] = field(default_factory=lambda: ["."])
     deny_globs: list[str] = field(default_factory=list)
     allow_tasks: dict[str, list[str]] = field(default_factory=dict)
+    # Per-task settings keyed by allow_tasks name, e.g. {"test": {"inputs": ["src/**/*.py"]}}.
+    task_options: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Call rates and quotas, e.g. {"per_owner": {"calls_per_minute": 600}, "per_run": {"max_calls": 5000}}.
+    rate_limits: dict[str, dict[str, int]] = field(default_factory=dict)
     profile: str = "dev"
     policy_hash: str = ""
     max_file_bytes: int = 200000
@@ -27,6 +31,19 @@ class PolicyConfig:
     bundle_ttl_seconds: int = 3600
     max_audit_logs: int = 100
     audit_ttl_seconds: int = 86400
+    max_diff_upload_bytes: int = 20_000_000
+    max_uploads: int = 20
+    upload_ttl_seconds: int = 900
+    max_background_tasks: int = 2
+    max_task_handles: int = 50
+    task_ttl_seconds: int = 3600
+    max_background_runtime_seconds: int = 600
+    task_cache_max_bytes: int = 5000000
+    max_pipeline_parallelism: int = 2
+    max_warm_workers: int = 2
+    max_task_outputs: int = 50
+    task_output_ttl_seconds: int = 3600
+    max_task_output_bytes: int = 10000000
     risk_rules: dict[str, list[str]] = field(default_factory=lambda: {
         "high_globs": ["*config*", "*.yaml", "*.json", ".env*", "*policy*"],
         "medium_globs": ["*.py", "*.ts", "*.js", "*.sh"],
@@ -55,6 +72,8 @@ class PolicyConfig:
                     "allow_paths": list(policy["allow_paths"]),
                     "deny_globs": list(policy["deny_globs"]),
                     "allow_tasks": dict(policy["allow_tasks"]),
+                    "task_options": dict(policy.get("task_options", {})),
+                    "rate_limits": dict(policy.get("rate_limits", {})),
                     "max_file_bytes": int(policy["max_file_bytes"]),
                     "max_runtime_seconds": int(policy["max_runtime_seconds"]),
                     "max_output_bytes": int(policy["max_output_bytes"]),
@@ -64,6 +83,19 @@ class PolicyConfig:
                     "bundle_ttl_seconds": int(policy["bundle_ttl_seconds"]),
                     "max_audit_logs": int(policy["max_audit_logs"]),
                     "audit_ttl_seconds": int(policy["audit_ttl_seconds"]),
+                    "max_diff_upload_bytes": int(policy.get("max_diff_upload_bytes", cls.max_diff_upload_bytes)),
+                    "max_uploads": int(policy.get("max_uploads", cls.max_uploads)),
+                    "upload_ttl_seconds": int(policy.get("upload_ttl_seconds", cls.upload_ttl_seconds)),
+                    "max_background_tasks": int(policy.get("max_background_tasks", cls.max_background_tasks)),
+                    "max_task_handles": int(policy.get("max_task_handles", cls.max_task_handles)),
+                    "task_ttl_seconds": int(policy.get("task_ttl_seconds", cls.task_ttl_seconds)),
+                    "max_background_runtime_seconds": int(policy.get("max_background_runtime_seconds", cls.max_background_runtime_seconds)),
+                    "task_cache_max_bytes": int(policy.get("task_cache_max_bytes", cls.task_cache_max_bytes)),
+                    "max_pipeline_parallelism": int(policy.get("max_pipeline_parallelism", cls.max_pipeline_parallelism)),
+                    "max_warm_workers": int(policy.get("max_warm_workers", cls.max_warm_workers)),
+                    "max_task_outputs": int(policy.get("max_task_outputs", cls.max_task_outputs)),
+                    "task_output_ttl_seconds": int(policy.get("task_output_ttl_seconds", cls.task_output_ttl_seconds)),
+                    "max_task_output_bytes": int(policy.get("max_task_output_bytes", cls.max_task_output_bytes)),
                     "risk_rules": {
                         "high_globs": list(risk_rules["high_globs"]),
                         "medium_globs": list(risk_rules["medium_globs"]),
@@ -80,6 +112,8 @@ class PolicyConfig:
             allow_paths=list(policy["allow_paths"]),
             deny_globs=list(policy["deny_globs"]),
             allow_tasks={str(k): list(v) for k, v in dict(policy["allow_tasks"]).items()},
+            task_options={str(k): dict(v) for k, v in dict(policy.get("task_options", {})).items()},
+            rate_limits={str(k): {str(n): int(x) for n, x in dict(v).items()} for k, v in dict(policy.get("rate_limits", {})).items()},
             max_file_bytes=int(policy["max_file_bytes"]),
             max_runtime_seconds=int(policy["max_runtime_seconds"]),
             max_output_bytes=int(policy["max_output_bytes"]),
@@ -89,6 +123,19 @@ class PolicyConfig:
             bundle_ttl_seconds=int(policy["bundle_ttl_seconds"]),
             max_audit_logs=int(policy["max_audit_logs"]),
             audit_ttl_seconds=int(policy["audit_ttl_seconds"]),
+            max_diff_upload_bytes=int(policy.get("max_diff_upload_bytes", cls.max_diff_upload_bytes)),
+            max_uploads=int(policy.get("max_uploads", cls.max_uploads)),
+            upload_ttl_seconds=int(policy.get("upload_ttl_seconds", cls.upload_ttl_seconds)),
+            max_background_tasks=int(policy.get("max_background_tasks", cls.max_background_tasks)),
+            max_task_handles=int(policy.get("max_task_handles", cls.max_task_handles)),
+            task_ttl_seconds=int(policy.get("task_ttl_seconds", cls.task_ttl_seconds)),
+            max_background_runtime_seconds=int(policy.get("max_background_runtime_seconds", cls.max_background_runtime_seconds)),
+            task_cache_max_bytes=int(policy.get("task_cache_max_bytes", cls.task_cache_max_bytes)),
+            max_pipeline_parallelism=int(policy.get("max_pipeline_parallelism", cls.max_pipeline_parallelism)),
+            max_warm_workers=int(policy.get("max_warm_workers", cls.max_warm_workers)),
+            max_task_outputs=int(policy.get("max_task_outputs", cls.max_task_outputs)),
+            task_output_ttl_seconds=int(policy.get("task_output_ttl_seconds", cls.task_output_ttl_seconds)),
+            max_task_output_bytes=int(policy.get("max_task_output_bytes", cls.max_task_output_bytes)),
             risk_rules=risk_rules,
         )
 
@@ -99,6 +146,8 @@ class RuntimeConfig:
     policy_path: Path | None
     profile: str
     strict: bool
+    # Directory for the on-disk audit journal; None keeps audit entries in memory only.
+    audit_dir: Path | None = None
 
 
 def _read_yaml_file(path: Path) -> dict[str, Any]:
@@ -124,6 +173,7 @@ def load_runtime_config(
         "policy_path": None,
         "profile": "dev",
         "strict": False,
+        "audit_dir": None,
     }
 
     file_data: dict[str, Any] = {}
@@ -135,6 +185,7 @@ def load_runtime_config(
         "policy_path": env.get("POLICY_PATH"),
         "profile": env.get("PROFILE"),
         "strict": env.get("STRICT_MODE"),
+        "audit_dir": env.get("AUDIT_DIR"),
     }
 
     def norm_path(v: Any) -> Path | None:
@@ -168,6 +219,8 @@ def load_runtime_config(
         env_layer["profile"] = str(env_data["profile"])
     if env_data["strict"] is not None:
         env_layer["strict"] = norm_bool(env_data["strict"])
+    if env_data["audit_dir"] is not None:
+        env_layer["audit_dir"] = norm_path(env_data["audit_dir"])
     merged.update(env_layer)
 
     cli_layer: dict[str, Any] = {}
@@ -179,6 +232,8 @@ def load_runtime_config(
         cli_layer["profile"] = str(cli["profile"])
     if cli.get("strict") is not None:
         cli_layer["strict"] = bool(cli["strict"])
+    if cli.get("audit_dir") is not None:
+        cli_layer["audit_dir"] = norm_path(cli["audit_dir"])
     if cli_layer:
         merged.update(cli_layer)
 
@@ -190,15 +245,27 @@ def load_runtime_config(
     if policy_path is not None and not isinstance(policy_path, Path):
         policy_path = norm_path(policy_path)
 
+    audit_dir = merged["audit_dir"]
+    if audit_dir is not None and not isinstance(audit_dir, Path):
+        audit_dir = norm_path(audit_dir)
+
     profile = str(merged["profile"] or "dev")
     strict = bool(merged["strict"])
 
     if profile not in {"dev", "ci", "read_only"}:
         raise ValueError(f"Invalid profile: {profile}")
 
+    workspace_root = workspace_root.resolve()
+    if audit_dir is not None:
+        audit_dir = audit_dir.resolve()
+        # Inside the workspace the journal would be readable and patchable by the tools it audits.
+        if audit_dir == workspace_root or workspace_root in audit_dir.parents:
+            raise ValueError(f"audit_dir must be outside workspace_root: {audit_dir}")
+
     return RuntimeConfig(
-        workspace_root=workspace_root.resolve(),
+        workspace_root=workspace_root,
         policy_path=policy_path.resolve() if policy_path else None,
         profile=profile,
         strict=strict,
+        audit_dir=audit_dir,
     )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+# (policy_hash, tool, risk, task_name, normalized paths)
+DecisionKey = Tuple[str, str, str, Optional[str], Optional[FrozenSet[str]]]
+
+_MISS = object()
+
+
+class DecisionCache:
+    """
+    LRU of pure-policy verdicts: the violation key a (tool, risk, task, paths)
+    tuple earns under one policy hash, or None when the policy allows it.
+
+    Only the verdict is cached. Violation details echo the caller's raw arguments
+    and are rebuilt on every call, as are run/owner checks and the audit entry.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[DecisionKey, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: DecisionKey) -> Tuple[bool, Optional[str]]:
+        """
+        (found, verdict); a None verdict means "allowed", so presence is separate.
+        """
+        with self._lock:
+            verdict = self._entries.get(key, _MISS)
+            if verdict is _MISS:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, verdict  # type: ignore[return-value]
+
+    def set(self, key: DecisionKey, verdict: Optional[str]) -> None:
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
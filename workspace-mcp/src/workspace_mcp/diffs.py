@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+
+class DiffApplyError(ValueError):
+    pass
+
+_HEADER_RE = re.compile(r"^(?:\+\+\+|---) (?:[ab]/)?(.+)$")
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_GIT_HEADER_RE = re.compile(r"^diff --git a/(.+) b/(.+)$")
+_BINARY_RE = re.compile(r"^Binary files (?:[ab]/)?(.+) and (?:[ab]/)?(.+) differ$")
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_len: int
+    new_start: int
+    new_len: int
+    lines: List[str] = field(default_factory=list)
+    added: int = 0
+    removed: int = 0
+
+    @property
+    def anchor(self) -> int:
+        """0-based base-file index the hunk is recorded at (insert point for pure additions)."""
+        return self.old_start - 1 if self.old_len > 0 else self.old_start
+
+    @property
+    def preimage(self) -> List[str]:
+        """Base-file lines the hunk expects (context + removed), without prefixes."""
+        return [line[1:] for line in self.lines if line == "" or line[0] in " -"]
+
+    @property
+    def postimage(self) -> List[str]:
+        """Lines the hunk leaves behind (context + added), without prefixes."""
+        return [line[1:] for line in self.lines if line == "" or line[0] in " +"]
+
+
+@dataclass
+class FileDiff:
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    hunks: List[Hunk] = field(default_factory=list)
+    binary: bool = False
+
+    @property
+    def path(self) -> str:
+        return self.new_path or self.old_path or ""
+
+    @property
+    def lines_added(self) -> int:
+        return sum(h.added for h in self.hunks)
+
+    @property
+    def lines_removed(self) -> int:
+        return sum(h.removed for h in self.hunks)
+
+
+def _header_path(line: str) -> Optional[str]:
+    """
+    Extracts a header path the same way target parsing does; /dev/null maps to None.
+    """
+    m = _HEADER_RE.match(line)
+    if not m or m.group(1) == "/dev/null":
+        return None
+    return m.group(1).strip()
+
+
+def header_targets(lines: Iterable[str]) -> List[str]:
+    """
+    Raw '---'/'+++' header paths (including /dev/null) from a line stream, so large
+    spooled diffs can be scanned without loading them whole.
+    """
+    targets: List[str] = []
+    for line in lines:
+        m = _HEADER_RE.match(line)
+        if m:
+            targets.append(m.group(1))
+    return targets
+
+
+def parse_unified_diff(diff_text: str) -> List[FileDiff]:
+    """
+    Single-pass unified diff parser.
+
+    Hunk bodies are consumed by their declared line counts, so removed lines that
+    happen to look like '--- ' headers are not mistaken for a new file section.
+    """
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    seen_old_header = False
+    hunk: Optional[Hunk] = None
+    old_remaining = 0
+    new_remaining = 0
+
+    text = diff_text.replace("\r\n", "\n").replace("\r", "\n")
+    for line in text.split("\n"):
+        if hunk is not None and (old_remaining > 0 or new_remaining > 0):
+            if line.startswith("\\"):
+                hunk.lines.append(line)
+                continue
+            if line == "" or line.startswith(" "):
+                old_remaining -= 1
+                new_remaining -= 1
+                hunk.lines.append(line)
+                continue
+            if line.startswith("-"):
+                old_remaining -= 1
+                hunk.removed += 1
+                hunk.lines.append(line)
+                continue
+            if line.startswith("+"):
+                new_remaining -= 1
+                hunk.added += 1
+                hunk.lines.append(line)
+                continue
+            # Malformed/short hunk: fall through to header handling.
+            hunk = None
+        elif hunk is not None and line.startswith("\\"):
+            hunk.lines.append(line)
+            continue
+
+        git_match = _GIT_HEADER_RE.match(line)
+        if git_match:
+            current = FileDiff(old_path=git_match.group(1).strip(), new_path=git_match.group(2).strip())
+            files.append(current)
+            seen_old_header = False
+            hunk = None
+            continue
+
+        if line.startswith("--- "):
+            if current is None or seen_old_header or current.hunks:
+                current = FileDiff()
+                files.append(current)
+            current.old_path = _header_path(line)
+            seen_old_header = True
+            hunk = None
+            continue
+
+        if line.startswith("+++ ") and current is not None:
+            current.new_path = _header_path(line)
+            hunk = None
+            continue
+
+        hunk_match = _HUNK_RE.match(line)
+        if hunk_match and current is not None:
+            old_len = int(hunk_match.group(2)) if hunk_match.group(2) is not None else 1
+            new_len = int(hunk_match.group(4)) if hunk_match.group(4) is not None else 1
+            hunk = Hunk(
+                old_start=int(hunk_match.group(1)),
+                old_len=old_len,
+                new_start=int(hunk_match.group(3)),
+                new_len=new_len,
+            )
+            current.hunks.append(hunk)
+            old_remaining = old_len
+            new_remaining = new_len
+            continue
+
+        binary_match = _BINARY_RE.match(line)
+        if binary_match or line.startswith("GIT binary patch"):
+            if current is None:
+                current = FileDiff()
+                files.append(current)
+            if binary_match:
+                old_raw, new_raw = binary_match.group(1).strip(), binary_match.group(2).strip()
+                current.old_path = current.old_path or (None if old_raw == "/dev/null" else old_raw)
+                current.new_path = current.new_path or (None if new_raw == "/dev/null" else new_raw)
+            current.binary = True
+            hunk = None
+            continue
+
+    return files
+
+
+def locate_hunk(hunk: Hunk, lines: List[str], offset: int = 0) -> Optional[int]:
+    """
+    Finds the 0-based index where the hunk preimage matches `lines`.
+
+    The recorded position (shifted by `offset` from earlier hunks) is tried first,
+    then the nearest match in either direction, like patch's offset search.
+    Lines are compared with trailing whitespace stripped, matching diff normalization.
+    """
+    expected = [line.rstrip() for line in hunk.preimage]
+    size = len(expected)
+    anchor = max(0, hunk.anchor + offset)
+    last = len(lines) - size
+    if last < 0:
+        return None
+
+    def matches(at: int) -> bool:
+        return all(lines[at + i].rstrip() == expected[i] for i in range(size))
+
+    for distance in range(0, max(anchor, last - anchor) + 1):
+        for at in (anchor - distance, anchor + distance):
+            if 0 <= at <= last and matches(at):
+                return at
+            if distance == 0:
+                break
+    return None
+
+
+def apply_hunks(lines: List[str], hunks: List[Hunk]) -> List[str]:
+    """
+    Applies hunks to a list of lines (no line terminators) in memory.
+
+    Context lines keep the base file's text; added lines come from the diff.
+    Raises DiffApplyError when a hunk cannot be located.
+    """
+    out: List[str] = []
+    cursor = 0
+    offset = 0
+    for hunk in hunks:
+        at = locate_hunk(hunk, lines, offset)
+        if at is None or at < cursor:
+            raise DiffApplyError(f"Hunk @@ -{hunk.old_start},{hunk.old_len} does not apply")
+        out.extend(lines[cursor:at])
+        i = at
+        for line in hunk.lines:
+            if line.startswith("\\"):
+                continue
+            if line == "" or line[0] == " ":
+                out.append(lines[i])
+                i += 1
+            elif line[0] == "-":
+                i += 1
+            else:
+                out.append(line[1:])
+        cursor = i
+        offset = at - hunk.anchor
+    out.extend(lines[cursor:])
+    return out
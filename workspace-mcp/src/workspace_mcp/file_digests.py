@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class FileDigestCache:
+    """
+    (mtime_ns, size) -> sha256 cache for workspace files.
+
+    A lookup costs one stat() when the file is unchanged; content is only re-read
+    and hashed when its mtime or size moved. Bounded LRU by entry count.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, path: Path) -> Optional[str]:
+        """
+        Returns the hex sha256 of the file content, or None if it does not exist
+        or cannot be read as a file (a directory, no permission).
+        """
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            self._forget(key)
+            return None
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        # Hashing happens outside the lock so large files do not stall other lookups.
+        h = hashlib.sha256()
+        try:
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(65536), b""):
+                    h.update(chunk)
+        except OSError:
+            self._forget(key)
+            return None
+        value = h.hexdigest()
+        with self._lock:
+            self._entries[key] = (st.st_mtime_ns, st.st_size, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
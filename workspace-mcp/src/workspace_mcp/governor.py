@@ -1,32 +1,104 @@
+import logging
+import threading
 import uuid
 import hashlib
-from typing import TYPE_CHECKING, Any, Dict, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 from pathlib import Path
 from datetime import datetime, timezone
 from .mcp_logging import logger
 from .hashing import hash_arguments
 from .response_schema import ToolResponse, Decision, Violation
 from .store import BoundedStore
+from .bundle_index import HunkIntervalIndex
+from .file_digests import FileDigestCache
+from .uploads import DiffUpload
+from .background_tasks import BackgroundTask
+from .task_cache import TaskResultCache
+from .warm_pool import WarmPool
+from .import_graph import ImportGraph
+from .task_output import TaskOutputArtifact
+from .compiled_policy import CompiledPolicy
+from .concurrency import AtomicCounter, StripedLock
+from .decision_cache import DecisionCache
+from .audit_pipeline import AuditPipeline, AuditRecord
+from .audit_journal import AuditJournal
+from .audit_index import DEFAULT_MAX_ENTRIES as DEFAULT_AUDIT_INDEX_ENTRIES, AuditIndex
+from .rate_limits import RateLimiter, ScopeKey
+from .run_record import RunRecord
 
 if TYPE_CHECKING:
     from .config import PolicyConfig
 
 RiskLevel = Literal["read", "write", "execute", "network"]
 
+# Tools a caller needs to wind down or diagnose a run; never rate limited.
+RATE_LIMIT_EXEMPT_TOOLS = {"end_run", "get_run_summary", "kernel_version", "self_check"}
+
 class Governor:
-    def __init__(self, config: "PolicyConfig", workspace_root: Path | None = None, strict: bool = False):
+    """
+    Policy enforcement, audit and shared state for all tools. Safe to call from
+    several threads; see concurrency.py for the contract (run records are
+    mutated only under run_lock(run_id)).
+    """
+
+    def __init__(self, config: "PolicyConfig", workspace_root: Path | None = None, strict: bool = False, audit_async: bool = False, audit_dir: Path | None = None):
         self.config = config
         self.root = (workspace_root or Path(self.config.workspace_root)).resolve()
         self.strict = strict
         self.server_instance_id = str(uuid.uuid4())
-        self.run_counter = 0
+        self._run_counter = AtomicCounter()
+        self._run_locks = StripedLock()
+        self._closed = False
         self.config_hash = self.config.policy_hash
+        # Path matchers for every deny_globs/allow_paths/risk_rules check, built once.
+        self.policy = CompiledPolicy.from_config(config)
+        self.decision_cache = DecisionCache()
+        self.rate_limiter = RateLimiter(config.rate_limits)
 
         # Bounded Stores
-        self.runs = BoundedStore[str, Dict[str, Any]](max_size=config.max_runs, ttl_seconds=config.run_ttl_seconds)
-        self.bundles = BoundedStore[str, Dict[str, Any]](max_size=config.max_bundles, ttl_seconds=config.bundle_ttl_seconds)
+        self.runs = BoundedStore[str, RunRecord](max_size=config.max_runs, ttl_seconds=config.run_ttl_seconds)
+        self.file_digests = FileDigestCache()
+        self.bundle_index = HunkIntervalIndex()
+        self.import_graph = ImportGraph(self.root, config.deny_globs)
+        self.bundles = BoundedStore[str, Dict[str, Any]](
+            max_size=config.max_bundles,
+            ttl_seconds=config.bundle_ttl_seconds,
+            on_evict=lambda bundle_id, _bundle: self.bundle_index.remove(bundle_id),
+        )
+        self.uploads = BoundedStore[str, DiffUpload](
+            max_size=config.max_uploads,
+            ttl_seconds=config.upload_ttl_seconds,
+            on_evict=lambda _upload_id, upload: upload.discard(),
+        )
+        # Background tasks: handles are bounded like other state, and evicting a
+        # handle cancels its task. Workers are created lazily by the executor.
+        self.tasks = BoundedStore[str, BackgroundTask](
+            max_size=config.max_task_handles,
+            ttl_seconds=config.task_ttl_seconds,
+            on_evict=lambda _task_id, task: task.cancel(),
+        )
+        self.task_cache = TaskResultCache(config.task_cache_max_bytes)
+        # Full output of truncated run_task calls, keyed by audit_id.
+        self.task_outputs = BoundedStore[str, TaskOutputArtifact](
+            max_size=config.max_task_outputs,
+            ttl_seconds=config.task_output_ttl_seconds,
+            on_evict=lambda _audit_id, artifact: artifact.discard(),
+        )
+        self.task_pool = ThreadPoolExecutor(max_workers=max(1, config.max_background_tasks), thread_name_prefix="workspace-task")
+        # Warm interpreters start on first use by a task that sets task_options.preload.
+        self.warm_pool = WarmPool(self.root, config.max_warm_workers)
         self.audit_logs = BoundedStore[str, Dict[str, Any]](max_size=config.max_audit_logs, ttl_seconds=config.audit_ttl_seconds)
         self.event_logs = BoundedStore[str, Dict[str, Any]](max_size=config.max_audit_logs * 2, ttl_seconds=config.audit_ttl_seconds)
+        # With audit_async, audit store writes and log lines leave the request path;
+        # run accounting in _log_audit stays synchronous either way.
+        self.audit_pipeline = AuditPipeline(self._write_audit_batch) if audit_async else None
+        # Secondary indexes for query_audit. Rows are self-contained, so with a
+        # journal they cover far more history than the hot store.
+        self.audit_index = AuditIndex(DEFAULT_AUDIT_INDEX_ENTRIES if audit_dir is not None else config.max_audit_logs * 2)
+        # With audit_dir, every entry is also journaled on disk and audit_logs is
+        # only the hot cache in front of it (see get_audit).
+        self.audit_journal = AuditJournal(audit_dir, on_entry=self.audit_index.add) if audit_dir is not None else None
 
         if not self.root.exists():
             try:
@@ -34,6 +106,16 @@ class Governor:
             except Exception as e:
                 logger.error(f"Failed to create workspace root: {e}")
 
+    @property
+    def run_counter(self) -> int:
+        return self._run_counter.value
+
+    def run_lock(self, run_id: str) -> "threading.RLock":
+        """
+        Lock guarding the run record for run_id (striped, re-entrant).
+        """
+        return self._run_locks.for_key(run_id)
+
     def _hash_args(self, arguments: Dict[str, Any]) -> str:
         """
         Deterministic salted hash for audit-safe argument fingerprints.
@@ -71,7 +153,7 @@ class Governor:
         Central policy enforcement point.
         """
         if not skip_audit:
-            self.run_counter += 1
+            self._run_counter.increment()
             
         audit_id = str(uuid.uuid4())
         decision_kind: Literal["allowed", "blocked", "error"] = "allowed"
@@ -93,13 +175,13 @@ class Governor:
                     decision_kind = "error"
                     code = "not_found"
                     violation = {"key": "RUN_NOT_FOUND", "details": {"run_id": run_id}, "config_path": ""}
-                elif run.get("status") == "ended":
+                elif run.status == "ended":
                     decision_kind = "error"
                     code = "invalid_input"
                     violation = {"key": "RUN_ALREADY_ENDED", "details": {"run_id": run_id}, "config_path": ""}
                 else:
                     owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
-                    if run.get("owner_hash") != owner_hash:
+                    if run.owner_hash != owner_hash:
                         decision_kind = "error"
                         code = "not_found"
                         violation = {"key": "RUN_NOT_FOUND", "details": {"run_id": run_id}, "config_path": ""}
@@ -111,44 +193,22 @@ class Governor:
                 code = "blocked"
                 violation = {"key": "RUN_ID_REQUIRED", "details": {"profile": self.config.profile, "risk": risk}, "config_path": f"profiles.{self.config.profile}"}
 
+        # Rate limits and quotas (introspection calls with skip_audit are not charged)
+        if decision_kind == "allowed" and not skip_audit and tool_name not in RATE_LIMIT_EXEMPT_TOOLS and self.rate_limiter.enabled:
+            exceeded = self.rate_limiter.check(self._rate_limit_keys(run_id, owner_id))
+            if exceeded is not None:
+                decision_kind = "blocked"
+                code = "blocked"
+                violation = {"key": "RATE_LIMITED", "details": exceeded, "config_path": f"profiles.{self.config.profile}.rate_limits.{exceeded['scope']}.{exceeded['limit']}"}
+
         # 2. Check Policy constraints if still allowed
         if decision_kind == "allowed":
             try:
-                if risk == "execute":
-                    task_name = arguments.get("task_name")
-                    if not isinstance(task_name, str) or task_name not in self.config.allow_tasks:
-                        decision_kind = "blocked"
-                        code = "blocked"
-                        violation = {"key": "TASK_NOT_ALLOWLISTED", "details": {"task_name": task_name, "allowed": list(self.config.allow_tasks.keys())}, "config_path": f"profiles.{self.config.profile}.allow_tasks"}
-
-                if risk == "read" and "path" in arguments:
-                    target = arguments.get("path")
-                    if isinstance(target, str):
-                        if self._is_denied_by_glob(target):
-                            decision_kind = "blocked"
-                            code = "blocked"
-                            violation = {"key": "PATH_MATCHES_DENY_GLOBS", "details": {"path": target}, "config_path": f"profiles.{self.config.profile}.deny_globs"}
-                        elif not self._is_allowed_path(target):
-                            decision_kind = "blocked"
-                            code = "blocked"
-                            violation = {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"path": target}, "config_path": f"profiles.{self.config.profile}.allow_paths"}
-
-                if risk == "write":
-                    paths_obj: Any = None
-                    if "path" in arguments and isinstance(arguments.get("path"), str):
-                        paths_obj = [arguments["path"]]
-                    elif "paths" in arguments:
-                        paths_obj = arguments.get("paths")
-                    if isinstance(paths_obj, list):
-                        paths = [str(p) for p in paths_obj]
-                        if any(self._is_denied_by_glob(p) for p in paths):
-                            decision_kind = "blocked"
-                            code = "blocked"
-                            violation = {"key": "PATH_MATCHES_DENY_GLOBS", "details": {"paths": paths}, "config_path": f"profiles.{self.config.profile}.deny_globs"}
-                        elif any(not self._is_allowed_path(p) for p in paths):
-                            decision_kind = "blocked"
-                            code = "blocked"
-                            violation = {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"paths": paths}, "config_path": f"profiles.{self.config.profile}.allow_paths"}
+                verdict = self._policy_verdict(tool_name, risk, arguments)
+                if verdict is not None:
+                    decision_kind = "blocked"
+                    code = "blocked"
+                    violation = self._policy_violation(verdict, risk, arguments)
 
             except Exception as e:
                 decision_kind = "error"
@@ -189,6 +249,21 @@ class Governor:
             block_response=block_response
         )
 
+    @staticmethod
+    def _rate_limit_keys(run_id: Optional[str], owner_id: Optional[str]) -> List[ScopeKey]:
+        owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+        keys: List[ScopeKey] = [("per_owner", owner_hash)]
+        if run_id:
+            keys.append(("per_run", run_id))
+        return keys
+
+    def charge_usage(self, run_id: Optional[str], owner_id: Optional[str], bytes_read: int = 0, task_cpu_seconds: float = 0.0) -> None:
+        """
+        Adds work measured after an allowed call to the caller's quotas.
+        """
+        if self.rate_limiter.enabled:
+            self.rate_limiter.charge(self._rate_limit_keys(run_id, owner_id), bytes_read=bytes_read, task_cpu_seconds=task_cpu_seconds)
+
     def _log_audit(
         self,
         audit_id: str,
@@ -229,55 +304,187 @@ class Governor:
             if owner_id:
                 owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
                 
-            if run and (not owner_hash or run.get("owner_hash") == owner_hash) and run.get("status") == "active":
+            if run and (not owner_hash or run.owner_hash == owner_hash) and run.status == "active":
                 # Control-plane lifecycle tools should not skew run activity metrics.
                 non_counted_tools = {"start_run", "end_run", "get_run_summary", "kernel_version", "self_check"}
                 if tool in non_counted_tools:
-                    self.audit_logs.set(audit_id, log_entry)
-                    self.event_logs.set(audit_id, log_entry)
-                    logger.info(f"AUDIT: {log_entry}")
+                    self._store_audit(log_entry)
                     return
-                run["tool_sequence"].append(tool)
-                run["risk_distribution"][risk] = run["risk_distribution"].get(risk, 0) + 1
-                if decision == "allowed":
-                    run["allowed_count"] += 1
-                else:
-                    run["blocked_count"] += 1
+                with self.run_lock(run_id):
+                    run.record_call(tool, risk, decision == "allowed")
                 self.runs.set(run_id, run)
 
         if owner_id:
             owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
             log_entry["owner_id_hash"] = owner_hash
             
-        self.audit_logs.set(audit_id, log_entry)
-        self.event_logs.set(audit_id, log_entry)
-        logger.info(f"AUDIT: {log_entry}")
+        self._store_audit(log_entry)
+
+    def _store_audit(self, log_entry: Dict[str, Any]) -> None:
+        if self.audit_pipeline is not None:
+            self.audit_pipeline.submit(("log", log_entry))
+            return
+        self.audit_logs.set(log_entry["audit_id"], log_entry)
+        self.event_logs.set(log_entry["audit_id"], log_entry)
+        logger.info("AUDIT: %s", log_entry)
+        self.audit_index.add(log_entry)
+        if self.audit_journal is not None:
+            self.audit_journal.append([log_entry])
 
     def update_audit(self, audit_id: str, updates: Dict[str, Any]) -> None:
         """
         Update an existing audit log with additional fields like duration_ms.
         """
+        if self.audit_pipeline is not None:
+            self.audit_pipeline.submit(("update", audit_id, updates))
+            return
         entry = self.audit_logs.get(audit_id)
         if entry:
             entry.update(updates)
             self.audit_logs.set(audit_id, entry)
             self.event_logs.set(audit_id, entry)
+            self.audit_index.add(entry)
+            if self.audit_journal is not None:
+                self.audit_journal.append([entry])
+
+    def _write_audit_batch(self, batch: List[AuditRecord]) -> None:
+        """
+        Audit writer for one pipeline batch. Updates to entries in the same batch
+        are merged before insertion, so each entry is stored and logged once.
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        changed: Dict[str, Dict[str, Any]] = {}
+        for record in batch:
+            if record[0] == "log":
+                fresh[record[1]["audit_id"]] = record[1]
+                continue
+            _, audit_id, updates = record
+            entry = fresh.get(audit_id) or self.audit_logs.get(audit_id)
+            if entry is None:
+                continue
+            entry.update(updates)
+            if audit_id not in fresh:
+                self.audit_logs.set(audit_id, entry)
+                self.event_logs.set(audit_id, entry)
+                changed[audit_id] = entry
+        for audit_id, entry in fresh.items():
+            self.audit_logs.set(audit_id, entry)
+            self.event_logs.set(audit_id, entry)
+        for entry in [*changed.values(), *fresh.values()]:
+            self.audit_index.add(entry)
+        if self.audit_journal is not None:
+            self.audit_journal.append([*changed.values(), *fresh.values()])
+        if logger.isEnabledFor(logging.INFO):
+            for entry in fresh.values():
+                logger.info("AUDIT: %s", entry)
+
+    def get_audit(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Audit entry by id: the hot store first, then the on-disk journal (which
+        repopulates the hot store). Waits for queued writes first.
+        """
+        self.flush_audit()
+        entry = self.audit_logs.get(audit_id)
+        if entry is None and self.audit_journal is not None:
+            entry = self.audit_journal.get(audit_id)
+            if entry is not None:
+                self.audit_logs.set(audit_id, entry)
+        return entry
+
+    def flush_audit(self, timeout: float = 5.0) -> bool:
+        """
+        Makes queued audit writes visible to readers; a no-op when auditing is synchronous.
+        """
+        return self.audit_pipeline.flush(timeout) if self.audit_pipeline is not None else True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Shuts down background work so nothing queued is lost at exit: cancels
+        background tasks, stops warm interpreters, drains the audit queue into the
+        stores and journal, then closes the journal. Idempotent.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for task in self.tasks.values():
+            if task.active:
+                task.cancel()
+        self.task_pool.shutdown(wait=False, cancel_futures=True)
+        self.warm_pool.close()
+        if self.audit_pipeline is not None:
+            self.audit_pipeline.close(timeout)
+        if self.audit_journal is not None:
+            self.audit_journal.close()
 
     def get_root(self) -> Path:
         return self.root
 
-    def _is_denied_by_glob(self, rel_path: str) -> bool:
-        from fnmatch import fnmatch
+    @staticmethod
+    def _policy_paths(risk: RiskLevel, arguments: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        The paths read/write rules apply to, as the caller passed them.
+        """
+        if risk == "read":
+            target = arguments.get("path")
+            return [target] if isinstance(target, str) else None
+        if risk == "write":
+            if isinstance(arguments.get("path"), str):
+                return [arguments["path"]]
+            paths_obj = arguments.get("paths")
+            if isinstance(paths_obj, list):
+                return [str(p) for p in paths_obj]
+        return None
+
+    def _policy_verdict(self, tool_name: str, risk: RiskLevel, arguments: Dict[str, Any]) -> Optional[str]:
+        """
+        Violation key from allow_tasks/deny_globs/allow_paths alone, or None.
 
-        normalized = rel_path.replace("\\", "/").lstrip("./")
-        return any(fnmatch(normalized, pattern) for pattern in self.config.deny_globs)
+        Depends only on the policy and the normalized arguments, so verdicts are
+        memoized; callers rebuild the violation details from their own arguments.
+        """
+        task_name = arguments.get("task_name") if risk == "execute" else None
+        if not isinstance(task_name, str):
+            task_name = None
+        paths = self._policy_paths(risk, arguments)
+        normalized = frozenset(p.replace("\\", "/").lstrip("./") for p in paths) if paths is not None else None
+        key = (self.config_hash, tool_name, risk, task_name, normalized)
+        found, verdict = self.decision_cache.get(key)
+        if found:
+            return verdict
 
-    def _is_allowed_path(self, rel_path: str) -> bool:
-        normalized = rel_path.replace("\\", "/").lstrip("./")
-        allowed_roots = [str(Path(p).as_posix()).lstrip("./") for p in self.config.allow_paths]
-        if "" in allowed_roots:
-            return True
-        return any(
-            normalized == allowed or normalized.startswith(f"{allowed}/")
-            for allowed in allowed_roots
-        )
+        verdict = None
+        if risk == "execute" and (task_name is None or task_name not in self.config.allow_tasks):
+            verdict = "TASK_NOT_ALLOWLISTED"
+        elif normalized is not None:
+            # One pass, one regex scan and one trie walk per path.
+            outside = False
+            for p in normalized:
+                if self.policy.is_denied(p):
+                    verdict = "PATH_MATCHES_DENY_GLOBS"
+                    break
+                outside = outside or not self.policy.is_allowed(p)
+            else:
+                if outside:
+                    verdict = "PATH_OUTSIDE_ALLOW_PATHS"
+        self.decision_cache.set(key, verdict)
+        return verdict
+
+    def _policy_violation(self, verdict: str, risk: RiskLevel, arguments: Dict[str, Any]) -> Violation:
+        profile = self.config.profile
+        if verdict == "TASK_NOT_ALLOWLISTED":
+            return {"key": verdict, "details": {"task_name": arguments.get("task_name"), "allowed": list(self.config.allow_tasks.keys())}, "config_path": f"profiles.{profile}.allow_tasks"}
+        config_key = "deny_globs" if verdict == "PATH_MATCHES_DENY_GLOBS" else "allow_paths"
+        paths = self._policy_paths(risk, arguments) or []
+        details: Dict[str, Any] = {"path": paths[0]} if risk == "read" else {"paths": paths}
+        return {"key": verdict, "details": details, "config_path": f"profiles.{profile}.{config_key}"}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hot-path counters for diagnostics.
+        """
+        return {
+            "decision_cache": self.decision_cache.stats(),
+            "rate_limits": self.rate_limiter.stats(),
+            "audit_pipeline": self.audit_pipeline.stats() if self.audit_pipeline is not None else None,
+            "audit_journal": self.audit_journal.stats() if self.audit_journal is not None else None,
+        }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import ast
+import os
+import posixpath
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .task_cache import matching_files
+
+PY_PATTERNS = ["**/*.py"]
+JS_EXTENSIONS = (".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs")
+JS_PATTERNS = [f"**/*{ext}" for ext in JS_EXTENSIONS]
+MAX_SOURCE_BYTES = 2_000_000
+
+# import x from './a'; export * from './a'; import './a'; require('./a'); import('./a')
+_JS_IMPORT_RE = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*|\brequire\s*\(\s*|\bimport\s*\(\s*)(['"])([^'"\n]+)\1"""
+)
+_JS_TEST_RE = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$")
+
+StatKey = Tuple[int, int]  # (mtime_ns, size)
+
+
+def is_test_file(rel_path: str) -> bool:
+    name = posixpath.basename(rel_path)
+    if name.endswith(".py"):
+        return name.startswith("test_") or name.endswith("_test.py")
+    return bool(_JS_TEST_RE.search(name)) or "/__tests__/" in f"/{rel_path}"
+
+
+def _python_imports(source: str, module: str, is_package: bool) -> List[str]:
+    """
+    Absolute dotted names a Python file imports. `from x import y` yields both
+    x.y and x, since y may be a submodule or an attribute.
+    """
+    tree = ast.parse(source)
+    package = module if is_package else module.rpartition(".")[0]
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                parts = parts[:len(parts) - (node.level - 1)]
+                base = ".".join(parts + ([base] if base else []))
+            if not base:
+                continue
+            names.append(base)
+            names.extend(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+    return names
+
+
+def _js_imports(source: str) -> List[str]:
+    return [m.group(2) for m in _JS_IMPORT_RE.finditer(source) if m.group(2).startswith(".")]
+
+
+class ImportGraph:
+    """
+    Module import graph over the workspace's Python and TS/JS files.
+
+    refresh() stats every source file and re-parses only those whose (mtime, size)
+    changed, so repeated queries after small edits stay cheap. Python imports are
+    resolved through package roots (the first ancestor without __init__.py);
+    TS/JS only follows relative specifiers, since bare ones name packages.
+
+    refresh() rebuilds the edge maps in place, so every query refreshes and walks
+    the graph under one lock; a concurrent refresh cannot expose a half-built graph.
+    """
+
+    def __init__(self, root: Path, deny_globs: Sequence[str]):
+        self.root = root
+        self.deny_globs = list(deny_globs)
+        self._stats: Dict[str, StatKey] = {}
+        self._raw: Dict[str, List[str]] = {}  # file -> unresolved imports
+        self._packages: Set[str] = set()  # directories with an __init__.py
+        self._modules: Dict[str, str] = {}  # dotted name -> file
+        self._deps: Dict[str, Set[str]] = {}
+        self._importers: Dict[str, Set[str]] = {}
+        # Re-entrant: queries hold it across refresh() and the graph walk.
+        self._lock = threading.RLock()
+        self.parsed_files = 0
+
+    def _module_name(self, rel: str) -> Tuple[str, bool]:
+        parts = rel[:-3].split("/")
+        is_package = parts[-1] == "__init__"
+        if is_package:
+            parts.pop()
+        # Walk up while the directory is a regular package.
+        start = len(parts) - 1
+        while start > 0 and "/".join(parts[:start]) in self._packages:
+            start -= 1
+        return ".".join(parts[start:]), is_package
+
+    def _parse(self, rel: str) -> List[str]:
+        path = self.root / rel
+        try:
+            if path.stat().st_size > MAX_SOURCE_BYTES:
+                return []
+            source = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return []
+        self.parsed_files += 1
+        if rel.endswith(".py"):
+            module, is_package = self._module_name(rel)
+            try:
+                return _python_imports(source, module, is_package)
+            except (SyntaxError, ValueError):
+                return []
+        return _js_imports(source)
+
+    def _resolve_js(self, rel: str, spec: str, files: Set[str]) -> Optional[str]:
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(rel), spec))
+        if base.startswith("../"):
+            return None
+        candidates = [base] + [base + ext for ext in JS_EXTENSIONS] + [f"{base}/index{ext}" for ext in JS_EXTENSIONS]
+        stem, ext = posixpath.splitext(base)
+        if ext in (".js", ".jsx", ".mjs", ".cjs"):
+            # ESM TypeScript imports the emitted .js name of a .ts source.
+            candidates += [stem + ts for ts in (".ts", ".tsx", ".mts", ".cts")]
+        return next((c for c in candidates if c in files), None)
+
+    def _resolve(self, rel: str, raw: Iterable[str], files: Set[str]) -> Set[str]:
+        deps: Set[str] = set()
+        for name in raw:
+            target = self._modules.get(name) if rel.endswith(".py") else self._resolve_js(rel, name, files)
+            if target and target != rel:
+                deps.add(target)
+        return deps
+
+    def refresh(self) -> None:
+        with self._lock:
+            files = matching_files(self.root, PY_PATTERNS + JS_PATTERNS, self.deny_globs)
+            current: Dict[str, StatKey] = {}
+            for rel in files:
+                try:
+                    st = os.stat(self.root / rel)
+                except OSError:
+                    continue
+                current[rel] = (st.st_mtime_ns, st.st_size)
+
+            changed = {rel for rel, key in current.items() if self._stats.get(rel) != key}
+            removed = set(self._stats) - set(current)
+            if not changed and not removed:
+                return
+            packages = {posixpath.dirname(rel) for rel in current if posixpath.basename(rel) == "__init__.py"}
+            if packages != self._packages:
+                # Package layout moved: relative imports resolve differently everywhere.
+                self._packages = packages
+                changed = set(current)
+            for rel in removed:
+                self._raw.pop(rel, None)
+            for rel in changed:
+                self._raw[rel] = self._parse(rel)
+            self._stats = current
+
+            # Edges depend on which modules exist, so they are re-resolved from the
+            # cached raw imports (dict lookups only) rather than patched.
+            self._modules = {}
+            for rel in current:
+                if rel.endswith(".py"):
+                    self._modules[self._module_name(rel)[0]] = rel
+            file_set = set(current)
+            self._deps = {rel: self._resolve(rel, raw, file_set) for rel, raw in self._raw.items()}
+            self._importers = {}
+            for rel, deps in self._deps.items():
+                for dep in deps:
+                    self._importers.setdefault(dep, set()).add(rel)
+
+    def _closure(self, changed: Iterable[str]) -> Set[str]:
+        seen: Set[str] = set()
+        queue = deque(rel.replace("\\", "/") for rel in changed)
+        while queue:
+            rel = queue.popleft()
+            if rel in seen:
+                continue
+            seen.add(rel)
+            queue.extend(self._importers.get(rel, ()))
+        return seen
+
+    def _tests_in(self, affected: Set[str]) -> List[str]:
+        for rel in list(affected):
+            if posixpath.basename(rel) == "conftest.py":
+                prefix = posixpath.dirname(rel)
+                prefix = f"{prefix}/" if prefix else ""
+                affected.update(f for f in self._stats if f.startswith(prefix) and is_test_file(f))
+        return sorted(rel for rel in affected if is_test_file(rel) and rel in self._stats)
+
+    def dependencies(self, rel: str) -> List[str]:
+        with self._lock:
+            self.refresh()
+            return sorted(self._deps.get(rel, set()))
+
+    def affected(self, changed: Iterable[str]) -> List[str]:
+        """
+        Reverse-dependency closure: the changed files plus everything that imports
+        them, directly or transitively.
+        """
+        with self._lock:
+            self.refresh()
+            return sorted(self._closure(changed))
+
+    def affected_tests(self, changed: Iterable[str]) -> List[str]:
+        """
+        Test files in the closure. A changed conftest.py affects every test below
+        its directory, since pytest loads it implicitly rather than by import.
+        """
+        with self._lock:
+            self.refresh()
+            return self._tests_in(self._closure(changed))
+
+    def select_tests(self, changed: Iterable[str]) -> Optional[List[str]]:
+        """
+        affected_tests(changed), or None when a changed file has no node in the
+        graph (config, fixtures, data, deleted files): changes to those can affect
+        tests through paths no import reveals, so the caller should run them all.
+        One refresh for both checks.
+        """
+        with self._lock:
+            self.refresh()
+            files = [rel.replace("\\", "/") for rel in changed]
+            if any(rel not in self._stats for rel in files):
+                return None
+            return self._tests_in(self._closure(files))
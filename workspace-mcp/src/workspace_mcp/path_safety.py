@@ -1,7 +1,8 @@
-import fnmatch
 from pathlib import Path
 from typing import List
 
+from .compiled_policy import CompiledPolicy, compile_policy
+
 class PathSafetyError(Exception):
     pass
 
@@ -42,24 +43,21 @@ def validate_path(
     """
     Validates that a resolved path does not match any deny globs.
     """
+    check_path(path, root, compile_policy(tuple(deny_globs), tuple(allow_paths or ())))
+
+def check_path(path: Path, root: Path, policy: CompiledPolicy) -> None:
+    """
+    validate_path against matchers compiled once at policy load.
+    """
     rel_path = str(path.relative_to(root))
 
-    # Check deny globs
-    for pattern in deny_globs:
-        if fnmatch.fnmatch(rel_path, pattern):
-            raise PathSafetyError(f"Path matches denied pattern '{pattern}': {rel_path}")
+    pattern = policy.denied_by(rel_path)
+    if pattern is not None:
+        raise PathSafetyError(f"Path matches denied pattern '{pattern}': {rel_path}")
 
     # Enforce allow_paths when provided
-    if allow_paths:
-        normalized = rel_path.replace("\\", "/").lstrip("./")
-        allowed_roots = [str(Path(p).as_posix()).lstrip("./") for p in allow_paths]
-        if "" not in allowed_roots:
-            in_allowlist = any(
-                normalized == allowed or normalized.startswith(f"{allowed}/")
-                for allowed in allowed_roots
-            )
-            if not in_allowlist:
-                raise PathSafetyError(f"Path outside allow_paths: {rel_path}")
+    if policy.allow_paths and not policy.is_allowed(rel_path):
+        raise PathSafetyError(f"Path outside allow_paths: {rel_path}")
 
 def is_safe_path(root: Path, target: str, deny_globs: List[str]) -> bool:
     try:
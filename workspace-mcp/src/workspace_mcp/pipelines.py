@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set
+
+Dependencies = Mapping[str, Sequence[str]]
+NodeRunner = Callable[[str], Dict[str, Any]]  # returns a node record with at least "status"
+
+
+def task_dependencies(task_options: Mapping[str, Mapping[str, Any]]) -> Dict[str, List[str]]:
+    return {name: list(opts.get("depends_on", [])) for name, opts in task_options.items() if opts.get("depends_on")}
+
+
+def find_cycle(deps: Dependencies) -> Optional[List[str]]:
+    """
+    Returns one dependency cycle as [a, b, ..., a], or None if the graph is acyclic.
+    """
+    state: Dict[str, int] = {}  # 1 = on stack, 2 = done
+    stack: List[str] = []
+
+    def visit(node: str) -> Optional[List[str]]:
+        state[node] = 1
+        stack.append(node)
+        for dep in deps.get(node, []):
+            if state.get(dep) == 1:
+                return stack[stack.index(dep):] + [dep]
+            if dep not in state:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+        stack.pop()
+        state[node] = 2
+        return None
+
+    for node in sorted(deps):
+        if node not in state:
+            cycle = visit(node)
+            if cycle:
+                return cycle
+    return None
+
+
+def pipeline_order(deps: Dependencies, target: str) -> List[str]:
+    """
+    Topological order of `target` and everything it transitively depends on.
+    Ties are broken by name so the order is deterministic.
+    """
+    needed: Set[str] = set()
+    pending = [target]
+    while pending:
+        node = pending.pop()
+        if node not in needed:
+            needed.add(node)
+            pending.extend(deps.get(node, []))
+
+    remaining = {node: set(deps.get(node, [])) & needed for node in needed}
+    order: List[str] = []
+    while remaining:
+        ready = sorted(node for node, waiting in remaining.items() if not waiting)
+        if not ready:
+            raise ValueError("Task dependencies contain a cycle")
+        for node in ready:
+            order.append(node)
+            del remaining[node]
+        for waiting in remaining.values():
+            waiting.difference_update(ready)
+    return order
+
+
+def run_graph(order: Sequence[str], deps: Dependencies, run_node: NodeRunner, parallelism: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs nodes as soon as their dependencies succeed, at most `parallelism` at once.
+
+    A node whose record status is not "succeeded" marks every transitive dependent
+    as "skipped". Records gain start_offset_seconds/duration_seconds from the
+    scheduler's clock.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    nodes = set(order)
+    started = time.time()
+    running: Dict[Future[Dict[str, Any]], str] = {}
+    offsets: Dict[str, float] = {}
+
+    def blocked_by_failure(node: str) -> bool:
+        return any(dep in results and results[dep]["status"] != "succeeded" for dep in deps.get(node, []) if dep in nodes)
+
+    def ready(node: str) -> bool:
+        return all(dep in results and results[dep]["status"] == "succeeded" for dep in deps.get(node, []) if dep in nodes)
+
+    with ThreadPoolExecutor(max_workers=max(1, parallelism), thread_name_prefix="workspace-pipeline") as pool:
+        while len(results) < len(order):
+            for node in order:
+                if node in results or node in offsets:
+                    continue
+                if blocked_by_failure(node):
+                    failed = [dep for dep in deps.get(node, []) if dep in results and results[dep]["status"] != "succeeded"]
+                    results[node] = {"status": "skipped", "skipped_because": sorted(failed), "start_offset_seconds": None, "duration_seconds": 0.0}
+                elif ready(node) and len(running) < max(1, parallelism):
+                    offsets[node] = time.time() - started
+                    running[pool.submit(run_node, node)] = node
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    record = dict(future.result())
+                except Exception as e:
+                    record = {"status": "failed", "error": str(e)}
+                record["start_offset_seconds"] = round(offsets[node], 3)
+                record["duration_seconds"] = round(time.time() - started - offsets[node], 3)
+                results[node] = record
+    return results
@@ -8,12 +8,19 @@ import importlib.resources as pkg_resources
 import yaml
 
 from .config import PolicyConfig
+from .task_parsers import PARSERS
+from .pipelines import find_cycle, task_dependencies
+from .task_runner import RLIMIT_NAMES
+from .task_args import CHANGED_FILES_PLACEHOLDER
+from .rate_limits import RATE_LIMIT_KEYS, RATE_LIMIT_SCOPES
 
 ALLOWED_TOP_KEYS = {"version", "profiles"}
 ALLOWED_PROFILE_KEYS = {
     "allow_paths",
     "deny_globs",
     "allow_tasks",
+    "task_options",
+    "rate_limits",
     "max_file_bytes",
     "max_runtime_seconds",
     "max_output_bytes",
@@ -23,9 +30,47 @@ ALLOWED_PROFILE_KEYS = {
     "bundle_ttl_seconds",
     "max_audit_logs",
     "audit_ttl_seconds",
+    "max_diff_upload_bytes",
+    "max_uploads",
+    "upload_ttl_seconds",
+    "max_background_tasks",
+    "max_task_handles",
+    "task_ttl_seconds",
+    "max_background_runtime_seconds",
+    "task_cache_max_bytes",
+    "max_pipeline_parallelism",
+    "max_warm_workers",
+    "max_task_outputs",
+    "task_output_ttl_seconds",
+    "max_task_output_bytes",
     "risk_rules",
 }
+OPTIONAL_INT_PROFILE_KEYS = [
+    "max_diff_upload_bytes",
+    "max_uploads",
+    "upload_ttl_seconds",
+    "max_background_tasks",
+    "max_task_handles",
+    "task_ttl_seconds",
+    "max_background_runtime_seconds",
+    "task_cache_max_bytes",
+    "max_pipeline_parallelism",
+    "max_warm_workers",
+    "max_task_outputs",
+    "task_output_ttl_seconds",
+    "max_task_output_bytes",
+]
+# Sizes and TTLs of bounded stores, which cannot be empty or expire immediately.
+POSITIVE_INT_PROFILE_KEYS = {
+    "max_uploads",
+    "upload_ttl_seconds",
+    "max_task_handles",
+    "task_ttl_seconds",
+    "max_task_outputs",
+    "task_output_ttl_seconds",
+}
 ALLOWED_RISK_RULE_KEYS = {"high_globs", "medium_globs", "low_globs"}
+ALLOWED_TASK_OPTION_KEYS = {"inputs", "parser", "depends_on", "limits", "preload", "changed_only", "max_changed_files"}
 
 
 @dataclass(frozen=True)
@@ -64,6 +109,65 @@ def _require_type(name: str, value: Any, t: type) -> None:
         raise ValueError(f"Invalid type for '{name}': expected {t.__name__}")
 
 
+def _validate_task_options(profile_name: str, options: Any, allow_tasks: Mapping[str, Any], *, strict: bool) -> None:
+    _require_type("task_options", options, dict)
+    for task_name, opts in options.items():
+        if task_name not in allow_tasks:
+            raise ValueError(f"task_options['{task_name}'] does not name an allow_tasks entry in '{profile_name}'")
+        _require_type(f"task_options['{task_name}']", opts, dict)
+        if strict:
+            unknown = set(opts.keys()) - ALLOWED_TASK_OPTION_KEYS
+            if unknown:
+                raise ValueError(f"Unknown keys in task_options['{task_name}'] for '{profile_name}': {sorted(unknown)}")
+        if "inputs" in opts and (not isinstance(opts["inputs"], list) or not all(isinstance(x, str) for x in opts["inputs"])):
+            raise ValueError(f"task_options['{task_name}'].inputs must be list[str]")
+        if "preload" in opts and (not isinstance(opts["preload"], list) or not all(isinstance(x, str) for x in opts["preload"])):
+            raise ValueError(f"task_options['{task_name}'].preload must be list[str]")
+        if "max_changed_files" in opts:
+            value = opts["max_changed_files"]
+            if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+                raise ValueError(f"task_options['{task_name}'].max_changed_files must be a positive int")
+        if "changed_only" in opts:
+            _require_type(f"task_options['{task_name}'].changed_only", opts["changed_only"], bool)
+        if "parser" in opts and opts["parser"] not in PARSERS:
+            raise ValueError(f"task_options['{task_name}'].parser must be one of {sorted(PARSERS)}")
+        if "depends_on" in opts:
+            deps = opts["depends_on"]
+            if not isinstance(deps, list) or not all(isinstance(x, str) for x in deps):
+                raise ValueError(f"task_options['{task_name}'].depends_on must be list[str]")
+            missing = [dep for dep in deps if dep not in allow_tasks]
+            if missing:
+                raise ValueError(f"task_options['{task_name}'].depends_on names unknown tasks in '{profile_name}': {missing}")
+        if "limits" in opts:
+            limits = opts["limits"]
+            _require_type(f"task_options['{task_name}'].limits", limits, dict)
+            unknown = set(limits.keys()) - set(RLIMIT_NAMES)
+            if unknown:
+                raise ValueError(f"Unknown keys in task_options['{task_name}'].limits for '{profile_name}': {sorted(unknown)}")
+            for key, value in limits.items():
+                if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+                    raise ValueError(f"task_options['{task_name}'].limits.{key} must be a positive int")
+
+    cycle = find_cycle(task_dependencies(options))
+    if cycle:
+        raise ValueError(f"task_options depends_on cycle in '{profile_name}': {' -> '.join(cycle)}")
+
+
+def _validate_rate_limits(profile_name: str, limits: Any) -> None:
+    _require_type("rate_limits", limits, dict)
+    unknown = set(limits.keys()) - set(RATE_LIMIT_SCOPES)
+    if unknown:
+        raise ValueError(f"Unknown keys in rate_limits for '{profile_name}': {sorted(unknown)}")
+    for scope, values in limits.items():
+        _require_type(f"rate_limits.{scope}", values, dict)
+        unknown = set(values.keys()) - set(RATE_LIMIT_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown keys in rate_limits.{scope} for '{profile_name}': {sorted(unknown)}")
+        for key, value in values.items():
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"rate_limits.{scope}.{key} must be a non-negative integer")
+
+
 def _validate_profile(profile_name: str, prof: Mapping[str, Any], *, strict: bool) -> None:
     _require_type(f"profiles.{profile_name}", prof, dict)
 
@@ -92,6 +196,14 @@ def _validate_profile(profile_name: str, prof: Mapping[str, Any], *, strict: boo
             raise ValueError("allow_tasks keys must be strings")
         if not isinstance(argv, list) or not all(isinstance(x, str) for x in argv):
             raise ValueError(f"allow_tasks['{task_name}'] must be a list[str]")
+        if any(CHANGED_FILES_PLACEHOLDER in arg and arg != CHANGED_FILES_PLACEHOLDER for arg in argv) or argv[:1] == [CHANGED_FILES_PLACEHOLDER]:
+            raise ValueError(f"allow_tasks['{task_name}']: {CHANGED_FILES_PLACEHOLDER} must be a whole argument after the program")
+
+    if "task_options" in prof:
+        _validate_task_options(profile_name, prof["task_options"], prof["allow_tasks"], strict=strict)
+
+    if "rate_limits" in prof:
+        _validate_rate_limits(profile_name, prof["rate_limits"])
 
     for key in [
         "max_file_bytes", "max_runtime_seconds", "max_output_bytes",
@@ -101,6 +213,15 @@ def _validate_profile(profile_name: str, prof: Mapping[str, Any], *, strict: boo
         if not isinstance(prof[key], int) or prof[key] < 0:
             raise ValueError(f"{key} must be a non-negative integer")
 
+    for key in OPTIONAL_INT_PROFILE_KEYS:
+        if key not in prof:
+            continue
+        if key in POSITIVE_INT_PROFILE_KEYS:
+            if not isinstance(prof[key], int) or prof[key] <= 0:
+                raise ValueError(f"{key} must be a positive integer")
+        elif not isinstance(prof[key], int) or prof[key] < 0:
+            raise ValueError(f"{key} must be a non-negative integer")
+
     rr = prof["risk_rules"]
     _require_type("risk_rules", rr, dict)
     if strict:
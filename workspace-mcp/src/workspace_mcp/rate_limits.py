@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+# Policy layout: rate_limits: {per_owner: {...}, per_run: {...}}; 0 or absent means unlimited.
+RATE_LIMIT_SCOPES = ("per_owner", "per_run")
+RATE_LIMIT_KEYS = ("calls_per_minute", "burst", "max_calls", "max_bytes_read", "max_task_cpu_seconds")
+DEFAULT_MAX_TRACKED = 10_000
+
+# (scope, owner hash or run_id); anonymous callers share the ("per_owner", None) entry.
+ScopeKey = Tuple[str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class Limits:
+    calls_per_minute: int = 0
+    burst: int = 0  # bucket capacity; defaults to calls_per_minute
+    max_calls: int = 0
+    max_bytes_read: int = 0
+    max_task_cpu_seconds: int = 0
+
+    @classmethod
+    def from_mapping(cls, data: Optional[Mapping[str, Any]]) -> "Limits":
+        return cls(**{k: int(v) for k, v in dict(data or {}).items() if k in RATE_LIMIT_KEYS})
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.calls_per_minute, self.max_calls, self.max_bytes_read, self.max_task_cpu_seconds))
+
+
+class _Usage:
+    __slots__ = ("tokens", "refilled_at", "calls", "bytes_read", "task_cpu_seconds")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.refilled_at = now
+        self.calls = 0
+        self.bytes_read = 0
+        self.task_cpu_seconds = 0.0
+
+
+class RateLimiter:
+    """
+    Token-bucket call rates plus cumulative quotas (calls, bytes read, task
+    CPU-seconds), per owner hash and per run.
+
+    `check` is O(1) in the number of tracked keys: one dict lookup per scope, a
+    bucket refill computed from the elapsed time, and a few comparisons. A call
+    is admitted only if every scope admits it, and only then is a token taken
+    and the call counted. Bytes read and CPU-seconds are known after the work is
+    done, so `charge` adds them afterwards: the call that crosses a quota
+    completes, and the next one is refused.
+
+    At most `max_tracked` keys are kept, least recently used first out; an
+    evicted key starts again with a full bucket and zero usage.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, Mapping[str, Any]],
+        max_tracked: int = DEFAULT_MAX_TRACKED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_tracked <= 0:
+            raise ValueError("max_tracked must be > 0")
+        self.limits = {scope: Limits.from_mapping(limits.get(scope)) for scope in RATE_LIMIT_SCOPES}
+        self.max_tracked = max_tracked
+        self._clock = clock
+        self._usage: "OrderedDict[ScopeKey, _Usage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return any(limits.enabled for limits in self.limits.values())
+
+    @staticmethod
+    def _capacity(limits: Limits) -> int:
+        return limits.burst or limits.calls_per_minute
+
+    def _entry(self, key: ScopeKey, now: float) -> _Usage:
+        usage = self._usage.get(key)
+        if usage is None:
+            usage = _Usage(float(self._capacity(self.limits[key[0]])), now)
+            self._usage[key] = usage
+            if len(self._usage) > self.max_tracked:
+                self._usage.popitem(last=False)
+        else:
+            self._usage.move_to_end(key)
+        return usage
+
+    @staticmethod
+    def _refill(usage: _Usage, limits: Limits, now: float) -> None:
+        rate = limits.calls_per_minute / 60.0
+        usage.tokens = min(float(RateLimiter._capacity(limits)), usage.tokens + (now - usage.refilled_at) * rate)
+        usage.refilled_at = now
+
+    @staticmethod
+    def _exceeded(usage: _Usage, limits: Limits) -> Optional[Dict[str, Any]]:
+        for limit, used in (
+            ("max_calls", usage.calls),
+            ("max_bytes_read", usage.bytes_read),
+            ("max_task_cpu_seconds", usage.task_cpu_seconds),
+        ):
+            quota = getattr(limits, limit)
+            if quota and used >= quota:
+                return {"limit": limit, "value": quota, "used": round(used, 3), "retry_after_seconds": None}
+        if limits.calls_per_minute and usage.tokens < 1.0:
+            wait = (1.0 - usage.tokens) * 60.0 / limits.calls_per_minute
+            return {"limit": "calls_per_minute", "value": limits.calls_per_minute, "used": None, "retry_after_seconds": round(wait, 3)}
+        return None
+
+    def check(self, keys: Sequence[ScopeKey]) -> Optional[Dict[str, Any]]:
+        """
+        Admits one call against every scope in `keys`, or returns the first limit
+        it would break as {"scope", "limit", "value", "used", "retry_after_seconds"}.
+        """
+        with self._lock:
+            now = self._clock()
+            admitted = []
+            for key in keys:
+                limits = self.limits[key[0]]
+                if not limits.enabled:
+                    continue
+                usage = self._entry(key, now)
+                if limits.calls_per_minute:
+                    self._refill(usage, limits, now)
+                exceeded = self._exceeded(usage, limits)
+                if exceeded is not None:
+                    self.limited += 1
+                    return {"scope": key[0], **exceeded}
+                admitted.append((usage, limits))
+            for usage, limits in admitted:
+                if limits.calls_per_minute:
+                    usage.tokens -= 1.0
+                usage.calls += 1
+            return None
+
+    def charge(self, keys: Sequence[ScopeKey], bytes_read: int = 0, task_cpu_seconds: float = 0.0) -> None:
+        with self._lock:
+            now = self._clock()
+            for key in keys:
+                if not self.limits[key[0]].enabled:
+                    continue
+                usage = self._entry(key, now)
+                usage.bytes_read += bytes_read
+                usage.task_cpu_seconds += task_cpu_seconds
+
+    def usage(self, key: ScopeKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is None:
+                return None
+            return {"calls": usage.calls, "bytes_read": usage.bytes_read, "task_cpu_seconds": round(usage.task_cpu_seconds, 3)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"enabled": self.enabled, "tracked_keys": len(self._usage), "limited": self.limited}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tool names are interned process-wide: a run's sequence stores 2-byte ids.
+_TOOL_NAMES: List[str] = []
+_TOOL_IDS: Dict[str, int] = {}
+_INTERN_LOCK = threading.Lock()
+MAX_TOOL_IDS = 1 << 16
+
+
+def intern_tool(name: str) -> int:
+    tool_id = _TOOL_IDS.get(name)
+    if tool_id is not None:
+        return tool_id
+    with _INTERN_LOCK:
+        tool_id = _TOOL_IDS.get(name)
+        if tool_id is None:
+            if len(_TOOL_NAMES) >= MAX_TOOL_IDS:
+                raise ValueError("Too many distinct tool names to intern")
+            tool_id = len(_TOOL_NAMES)
+            _TOOL_NAMES.append(name)
+            _TOOL_IDS[name] = tool_id
+        return tool_id
+
+
+def tool_name(tool_id: int) -> str:
+    return _TOOL_NAMES[tool_id]
+
+
+class RunRecord:
+    """
+    State of one run. The tool sequence is an array('H') of interned tool ids
+    (two bytes per call instead of a list of str pointers), and every aggregate
+    the summary reports (allowed/blocked counts, per-risk and per-tool counts) is
+    a running counter, so a summary costs O(1) in the run's length and the
+    sequence itself is read a page at a time.
+
+    Mutate a record, or read more than one field consistently, only under
+    `Governor.run_lock(run_id)` (see concurrency.py).
+    """
+
+    __slots__ = (
+        "run_id",
+        "owner_hash",
+        "metadata",
+        "start_time",
+        "end_time",
+        "status",
+        "allowed_count",
+        "blocked_count",
+        "risk_distribution",
+        "changed_files",
+        "task_results",
+        "_tool_ids",
+        "_tool_counts",
+    )
+
+    def __init__(self, run_id: str, owner_hash: str, metadata: Dict[str, Any], start_time: float):
+        self.run_id = run_id
+        self.owner_hash = owner_hash
+        self.metadata = metadata
+        self.start_time = start_time
+        self.end_time: Optional[float] = None
+        self.status = "active"
+        self.allowed_count = 0
+        self.blocked_count = 0
+        self.risk_distribution: Dict[str, int] = {}
+        self.changed_files: List[str] = []
+        self.task_results: Dict[str, Dict[str, Any]] = {}
+        self._tool_ids = array("H")
+        self._tool_counts: Dict[int, int] = {}
+
+    def record_call(self, tool: str, risk: str, allowed: bool) -> None:
+        tool_id = intern_tool(tool)
+        self._tool_ids.append(tool_id)
+        self._tool_counts[tool_id] = self._tool_counts.get(tool_id, 0) + 1
+        self.risk_distribution[risk] = self.risk_distribution.get(risk, 0) + 1
+        if allowed:
+            self.allowed_count += 1
+        else:
+            self.blocked_count += 1
+
+    @property
+    def call_count(self) -> int:
+        return len(self._tool_ids)
+
+    def tool_counts(self) -> Dict[str, int]:
+        return {tool_name(tool_id): count for tool_id, count in self._tool_counts.items()}
+
+    def tool_sequence(self, cursor: int = 0, limit: Optional[int] = None) -> List[str]:
+        """
+        Tool names of calls [cursor, cursor + limit) in call order.
+        """
+        end = len(self._tool_ids) if limit is None else cursor + limit
+        return [_TOOL_NAMES[tool_id] for tool_id in self._tool_ids[cursor:end]]
+
+    def tool_sequence_rle(self, cursor: int = 0, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        The same calls as tool_sequence, run-length encoded as (tool, repeats).
+        """
+        end = len(self._tool_ids) if limit is None else cursor + limit
+        runs: List[Tuple[str, int]] = []
+        previous = -1
+        repeats = 0
+        for tool_id in self._tool_ids[cursor:end]:
+            if tool_id == previous:
+                repeats += 1
+                continue
+            if repeats:
+                runs.append((_TOOL_NAMES[previous], repeats))
+            previous, repeats = tool_id, 1
+        if repeats:
+            runs.append((_TOOL_NAMES[previous], repeats))
+        return runs
@@ -3,13 +3,16 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from mcp.server.fastmcp import FastMCP
+import anyio.from_thread
+import anyio.to_thread
+from mcp.server.fastmcp import Context, FastMCP
 
 from .config import load_runtime_config
 from .policy_loader import load_effective_policy
 from .governor import Governor
+from .response_schema import ToolResponse
 from .mcp_logging import logger
 from .capabilities import to_capability_manifest, get_workflow_bundle, get_capability
 
@@ -17,10 +20,22 @@ from .tools.workspace_info import workspace_info as _workspace_info
 from .tools.repo_search import repo_search as _repo_search
 from .tools.read_file import read_file as _read_file
 from .tools.apply_patch import apply_patch as _apply_patch, validate_patch as _validate_patch
+from .tools.diff_upload import (
+    begin_diff_upload as _begin_diff_upload,
+    append_diff_chunk as _append_diff_chunk,
+    commit_diff_upload as _commit_diff_upload,
+)
 from .tools.run_task import run_task as _run_task
+from .tools.run_pipeline import run_pipeline as _run_pipeline
+from .tools.task_output import read_task_output as _read_task_output
+from .tools.background_task import start_task as _start_task, poll_task as _poll_task, cancel_task as _cancel_task
 from .tools.run_lifecycle import start_run as _start_run, end_run as _end_run, get_run_summary as _get_run_summary
 from .tools.change_bundle import create_change_bundle as _create_change_bundle, bundle_report as _bundle_report
+from .tools.squash_bundles import squash_bundles as _squash_bundles
+from .tools.bundle_status import bundle_status as _bundle_status
+from .tools.bundle_conflicts import bundle_conflicts as _bundle_conflicts, bundle_groups as _bundle_groups
 from .tools.explain_policy import explain_policy_decision as _explain_policy_decision
+from .tools.query_audit import query_audit as _query_audit
 from .tools.kernel_version import kernel_version as _kernel_version
 from .tools.self_check import self_check as _self_check
 
@@ -31,17 +46,28 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--policy-path", default=None)
     parser.add_argument("--profile", choices=["dev", "ci", "read_only"], default=None)
     parser.add_argument("--strict", action="store_true", default=None)
+    parser.add_argument("--audit-dir", default=None, help="Directory for the on-disk audit journal")
     parser.add_argument("--config", default=None, help="Path to workspace-mcp.yaml")
     return parser
 
 
+async def _in_thread(call: Callable[[], ToolResponse]) -> dict[str, Any]:
+    """
+    Runs a tool on an anyio worker thread. FastMCP calls sync tools inline on the
+    event loop, one at a time; read-risk tools go through here so they run in
+    parallel with each other and with long-running calls (see concurrency.py).
+    """
+    response = await anyio.to_thread.run_sync(call)
+    return response.model_dump()
+
+
 def _bind_tools(mcp: FastMCP, governor: Governor) -> None:
     @mcp.tool()
-    def workspace_info(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _workspace_info(governor, run_id=run_id, owner_id=owner_id).model_dump()
+    async def workspace_info(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _workspace_info(governor, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
-    def repo_search(
+    async def repo_search(
         query: str,
         file_globs: str | None = None,
         limit: int = 20,
@@ -49,34 +75,123 @@ def _bind_tools(mcp: FastMCP, governor: Governor) -> None:
         owner_id: Optional[str] = None,
     ) -> dict[str, Any]:
         globs_list = [g.strip() for g in file_globs.split(",")] if file_globs else None
-        return _repo_search(governor, query, globs_list, limit, run_id=run_id, owner_id=owner_id).model_dump()
+        return await _in_thread(lambda: _repo_search(governor, query, globs_list, limit, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
-    def read_file(
+    async def read_file(
         path: str,
         start_line: int | None = None,
         end_line: int | None = None,
         run_id: Optional[str] = None,
         owner_id: Optional[str] = None,
     ) -> dict[str, Any]:
-        return _read_file(governor, path, start_line, end_line, run_id=run_id, owner_id=owner_id).model_dump()
+        return await _in_thread(lambda: _read_file(governor, path, start_line, end_line, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
     def validate_patch(
         target_file: str,
-        diff_text: str,
+        diff_text: str = "",
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        diff_handle: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return _validate_patch(governor, target_file, diff_text, run_id=run_id, owner_id=owner_id, diff_handle=diff_handle).model_dump()
+
+    @mcp.tool()
+    def apply_patch(
+        diff_text: str = "",
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        diff_handle: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return _apply_patch(governor, diff_text, run_id=run_id, owner_id=owner_id, diff_handle=diff_handle).model_dump()
+
+    @mcp.tool()
+    def begin_diff_upload(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return _begin_diff_upload(governor, run_id=run_id, owner_id=owner_id).model_dump()
+
+    @mcp.tool()
+    def append_diff_chunk(
+        upload_id: str,
+        seq: int,
+        chunk: str,
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return _append_diff_chunk(governor, upload_id, seq, chunk, run_id=run_id, owner_id=owner_id).model_dump()
+
+    @mcp.tool()
+    def commit_diff_upload(
+        upload_id: str,
+        sha256: Optional[str] = None,
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return _commit_diff_upload(governor, upload_id, sha256, run_id=run_id, owner_id=owner_id).model_dump()
+
+    @mcp.tool()
+    async def run_task(
+        task_name: str,
+        ctx: Context,  # type: ignore[type-arg]
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        use_cache: bool = True,
+        changed_only: bool = False,
+        bundle_id: Optional[str] = None,
+        diff_previous: bool = False,
+    ) -> dict[str, Any]:
+        # The task runs in a worker thread; output batches are forwarded as progress
+        # notifications (a no-op unless the client sent a progressToken).
+        lines_seen = 0
+
+        def forward(batch: list[tuple[str, str]]) -> None:
+            nonlocal lines_seen
+            lines_seen += len(batch)
+            message = "\n".join(line if stream == "stdout" else f"[stderr] {line}" for stream, line in batch)
+            anyio.from_thread.run(ctx.report_progress, lines_seen, None, message)
+
+        response = await anyio.to_thread.run_sync(
+            lambda: _run_task(governor, task_name, run_id=run_id, owner_id=owner_id, on_output=forward, use_cache=use_cache, changed_only=changed_only, bundle_id=bundle_id, diff_previous=diff_previous)
+        )
+        return response.model_dump()
+
+    @mcp.tool()
+    async def run_pipeline(target: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        response = await anyio.to_thread.run_sync(
+            lambda: _run_pipeline(governor, target, run_id=run_id, owner_id=owner_id)
+        )
+        return response.model_dump()
+
+    @mcp.tool()
+    def start_task(task_name: str, run_id: Optional[str] = None, owner_id: Optional[str] = None, bundle_id: Optional[str] = None) -> dict[str, Any]:
+        return _start_task(governor, task_name, run_id=run_id, owner_id=owner_id, bundle_id=bundle_id).model_dump()
+
+    @mcp.tool()
+    async def poll_task(
+        task_id: str,
+        cursor: int = 0,
+        limit: int = 200,
         run_id: Optional[str] = None,
         owner_id: Optional[str] = None,
     ) -> dict[str, Any]:
-        return _validate_patch(governor, target_file, diff_text, run_id=run_id, owner_id=owner_id).model_dump()
+        return await _in_thread(lambda: _poll_task(governor, task_id, cursor, limit, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
-    def apply_patch(diff_text: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _apply_patch(governor, diff_text, run_id=run_id, owner_id=owner_id).model_dump()
+    async def read_task_output(
+        audit_id: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        grep: Optional[str] = None,
+        stream: str = "stdout",
+        max_matches: int = 100,
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return await _in_thread(lambda: _read_task_output(governor, audit_id, offset, length, grep, stream, max_matches, run_id=run_id, owner_id=owner_id))  # type: ignore[arg-type]
 
     @mcp.tool()
-    def run_task(task_name: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _run_task(governor, task_name, run_id=run_id, owner_id=owner_id).model_dump()
+    def cancel_task(task_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return _cancel_task(governor, task_id, run_id=run_id, owner_id=owner_id).model_dump()
 
     @mcp.tool()
     def start_run(metadata: Optional[Dict[str, Any]] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
@@ -87,33 +202,74 @@ def _bind_tools(mcp: FastMCP, governor: Governor) -> None:
         return _end_run(governor, run_id, owner_id=owner_id).model_dump()
 
     @mcp.tool()
-    def get_run_summary(run_id: str, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _get_run_summary(governor, run_id, owner_id=owner_id).model_dump()
+    async def get_run_summary(run_id: str, owner_id: Optional[str] = None, cursor: int = 0, limit: int = 200, rle: bool = False) -> dict[str, Any]:
+        return await _in_thread(lambda: _get_run_summary(governor, run_id, owner_id=owner_id, cursor=cursor, limit=limit, rle=rle))
 
     @mcp.tool()
     def create_change_bundle(
-        diff_text: str,
+        diff_text: str = "",
         metadata: Optional[Dict[str, Any]] = None,
         run_id: Optional[str] = None,
         owner_id: Optional[str] = None,
+        diff_handle: Optional[str] = None,
     ) -> dict[str, Any]:
-        return _create_change_bundle(governor, diff_text, metadata, run_id=run_id, owner_id=owner_id).model_dump()
+        return _create_change_bundle(governor, diff_text, metadata, run_id=run_id, owner_id=owner_id, diff_handle=diff_handle).model_dump()
+
+    @mcp.tool()
+    async def bundle_report(bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _bundle_report(governor, bundle_id, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
-    def bundle_report(bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _bundle_report(governor, bundle_id, run_id=run_id, owner_id=owner_id).model_dump()
+    def squash_bundles(
+        bundle_ids: list[str],
+        metadata: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return _squash_bundles(governor, bundle_ids, metadata, run_id=run_id, owner_id=owner_id).model_dump()
 
     @mcp.tool()
-    def explain_policy_decision(audit_id: str, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _explain_policy_decision(governor, audit_id, owner_id=owner_id).model_dump()
+    async def bundle_status(bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _bundle_status(governor, bundle_id, run_id=run_id, owner_id=owner_id))
+
+    @mcp.tool()
+    async def bundle_conflicts(bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _bundle_conflicts(governor, bundle_id, run_id=run_id, owner_id=owner_id))
+
+    @mcp.tool()
+    async def bundle_groups(
+        bundle_ids: Optional[list[str]] = None,
+        run_id: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return await _in_thread(lambda: _bundle_groups(governor, bundle_ids, run_id=run_id, owner_id=owner_id))
+
+    @mcp.tool()
+    async def explain_policy_decision(audit_id: str, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _explain_policy_decision(governor, audit_id, owner_id=owner_id))
+
+    @mcp.tool()
+    async def query_audit(
+        run_id: Optional[str] = None,
+        tool: Optional[str] = None,
+        decision: Optional[str] = None,
+        code: Optional[str] = None,
+        violation_key: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        owner_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return await _in_thread(lambda: _query_audit(governor, run_id, tool, decision, code, violation_key, since, until, cursor, limit, owner_id=owner_id))
 
     @mcp.tool()
-    def kernel_version(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _kernel_version(governor, run_id=run_id, owner_id=owner_id).model_dump()
+    async def kernel_version(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _kernel_version(governor, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
-    def self_check(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
-        return _self_check(governor, run_id=run_id, owner_id=owner_id).model_dump()
+    async def self_check(run_id: Optional[str] = None, owner_id: Optional[str] = None) -> dict[str, Any]:
+        return await _in_thread(lambda: _self_check(governor, run_id=run_id, owner_id=owner_id))
 
     @mcp.tool()
     def capability_manifest(workflow: Optional[str] = None) -> dict[str, Any]:
@@ -145,6 +301,7 @@ def main(argv: list[str] | None = None) -> int:
             "policy_path": args.policy_path,
             "profile": args.profile,
             "strict": args.strict,
+            "audit_dir": args.audit_dir,
         },
         config_file=Path(args.config).expanduser() if args.config else None,
     )
@@ -155,13 +312,16 @@ def main(argv: list[str] | None = None) -> int:
         strict=cfg.strict,
     )
 
-    governor = Governor(effective_policy.data, workspace_root=cfg.workspace_root, strict=cfg.strict)
+    governor = Governor(effective_policy.data, workspace_root=cfg.workspace_root, strict=cfg.strict, audit_async=True, audit_dir=cfg.audit_dir)
 
     mcp = FastMCP("workspace-mcp")
     _bind_tools(mcp, governor)
 
     logger.info(f"Server initialized for root: {governor.root}")
-    mcp.run(transport="stdio")
+    try:
+        mcp.run(transport="stdio")
+    finally:
+        governor.close()
     return 0
 
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
-from typing import Generic, Iterable, Optional, Tuple, TypeVar
+from typing import Callable, Generic, Iterable, Optional, Tuple, TypeVar
 from collections import OrderedDict
 
 K = TypeVar("K")
@@ -23,16 +24,21 @@ class BoundedStore(Generic[K, V]):
       - ttl_seconds eviction (based on last_seen_at)
       - eviction on get() and set()
       - last_seen_at updated on successful get()
+      - optional on_evict(key, value) hook for TTL/overflow eviction and delete()
+      - every public operation atomic under an internal lock; on_evict runs
+        under it and must not call back into the same store
     """
 
-    def __init__(self, *, max_size: int, ttl_seconds: int):
+    def __init__(self, *, max_size: int, ttl_seconds: int, on_evict: Optional[Callable[[K, V], None]] = None):
         if max_size <= 0:
             raise ValueError("max_size must be > 0")
         if ttl_seconds <= 0:
             raise ValueError("ttl_seconds must be > 0")
         self._max_size = max_size
         self._ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
         self._data: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()  # value, last_seen_at
+        self._lock = threading.RLock()
 
     @property
     def max_size(self) -> int:
@@ -50,17 +56,22 @@ class BoundedStore(Generic[K, V]):
 
     def _evict_expired(self, now: float) -> int:
         """
-        Evict expired entries. Iterate in insertion order for determinism.
+        Evict expired entries from the front. Every write and get() moves its key
+        to the end with the current time, so entries are ordered by last_seen_at
+        and the scan stops at the first live one: O(expired), not O(size).
         """
         evicted = 0
         keys_to_delete: list[K] = []
         for k, (_, last_seen_at) in self._data.items():
-            if self._is_expired(last_seen_at, now):
-                keys_to_delete.append(k)
+            if not self._is_expired(last_seen_at, now):
+                break
+            keys_to_delete.append(k)
 
         for k in keys_to_delete:
-            self._data.pop(k, None)
+            entry = self._data.pop(k, None)
             evicted += 1
+            if entry is not None and self._on_evict is not None:
+                self._on_evict(k, entry[0])
 
         return evicted
 
@@ -70,58 +81,82 @@ class BoundedStore(Generic[K, V]):
         """
         evicted = 0
         while len(self._data) > self._max_size:
-            self._data.popitem(last=False)
+            k, (v, _) = self._data.popitem(last=False)
             evicted += 1
+            if self._on_evict is not None:
+                self._on_evict(k, v)
         return evicted
 
     def stats_and_evict(self) -> StoreStats:
-        now = self._now()
-        ev_exp = self._evict_expired(now)
-        ev_ovf = self._evict_overflow()
-        return StoreStats(size=len(self._data), evicted_expired=ev_exp, evicted_overflow=ev_ovf)
+        with self._lock:
+            now = self._now()
+            ev_exp = self._evict_expired(now)
+            ev_ovf = self._evict_overflow()
+            return StoreStats(size=len(self._data), evicted_expired=ev_exp, evicted_overflow=ev_ovf)
 
     def set(self, key: K, value: V) -> StoreStats:
         """
         Insert/update, touch last_seen_at, evict expired and overflow deterministically.
         """
-        now = self._now()
-        ev_exp = self._evict_expired(now)
+        with self._lock:
+            now = self._now()
+            ev_exp = self._evict_expired(now)
 
-        # Update insertion order deterministically:
-        # if key exists, delete then re-insert to treat as "latest write"
-        if key in self._data:
-            self._data.pop(key, None)
+            # Update insertion order deterministically:
+            # if key exists, delete then re-insert to treat as "latest write"
+            if key in self._data:
+                self._data.pop(key, None)
 
-        self._data[key] = (value, now)
-        ev_ovf = self._evict_overflow()
-        return StoreStats(size=len(self._data), evicted_expired=ev_exp, evicted_overflow=ev_ovf)
+            self._data[key] = (value, now)
+            ev_ovf = self._evict_overflow()
+            return StoreStats(size=len(self._data), evicted_expired=ev_exp, evicted_overflow=ev_ovf)
 
     def get(self, key: K) -> Optional[V]:
         """
         Get value if present and not expired. Updates last_seen_at and moves to end.
         Returns None if missing or expired.
         """
-        now = self._now()
-        self._evict_expired(now)
+        with self._lock:
+            now = self._now()
+            self._evict_expired(now)
 
-        if key not in self._data:
-            return None
+            if key not in self._data:
+                return None
 
-        value, _last_seen = self._data.pop(key)
-        # Touch and move to end (most recently seen)
-        self._data[key] = (value, now)
-        return value
+            value, _last_seen = self._data.pop(key)
+            # Touch and move to end (most recently seen)
+            self._data[key] = (value, now)
+            return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """
+        Read without touching last_seen_at or order. Expired entries read as missing.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._is_expired(entry[1], self._now()):
+                return None
+            return entry[0]
 
     def delete(self, key: K) -> bool:
-        return self._data.pop(key, None) is not None
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return False
+            if self._on_evict is not None:
+                self._on_evict(key, entry[0])
+            return True
 
     def keys(self) -> Iterable[K]:
         # Deterministic order
-        return list(self._data.keys())
+        with self._lock:
+            return list(self._data.keys())
 
     def values(self) -> Iterable[V]:
         # Deterministic order
-        return [v for v, _ in self._data.values()]
+        with self._lock:
+            return [v for v, _ in self._data.values()]
 
     def __len__(self) -> int:
-        return len(self._data)
\ No newline at end of file
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .compiled_policy import CompiledPolicy
+from .path_safety import PathSafetyError, check_path, resolve_path
+from .task_cache import glob_matches
+
+CHANGED_FILES_PLACEHOLDER = "{changed_files}"
+DEFAULT_MAX_CHANGED_FILES = 100
+
+
+class ChangedFilesError(Exception):
+    """
+    A {changed_files} expansion that cannot proceed; carries the violation the
+    tool reports. `blocked` distinguishes policy blocks from bad input.
+    """
+
+    def __init__(self, message: str, key: str, details: Dict[str, Any], config_path: str = "", code: str = "invalid_input", blocked: bool = False):
+        super().__init__(message)
+        self.violation = {"key": key, "details": details, "config_path": config_path}
+        self.code = code
+        self.blocked = blocked
+
+
+def uses_changed_files(command: Sequence[str]) -> bool:
+    return CHANGED_FILES_PLACEHOLDER in command
+
+
+def within_inputs(files: Iterable[str], inputs: Optional[Sequence[str]]) -> List[str]:
+    """
+    The files matching one of a task's `inputs` globs, in order; all of them when
+    the task declares no inputs.
+    """
+    if not inputs:
+        return list(files)
+    return [rel for rel in files if any(glob_matches(rel, pat) for pat in inputs)]
+
+
+def select_changed_files(
+    files: Iterable[str],
+    root: Path,
+    policy: CompiledPolicy,
+    inputs: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Workspace-relative posix paths to pass to a task: deduplicated, sorted, limited
+    to the task's `inputs` globs when it declares them, and without files that no
+    longer exist. Every path goes through the same allow/deny checks as writes;
+    an unsafe path raises PathSafetyError.
+    """
+    selected = set()
+    for raw in files:
+        safe = resolve_path(root, raw)
+        check_path(safe, root, policy)
+        rel = safe.relative_to(root).as_posix()
+        if inputs and not any(glob_matches(rel, pat) for pat in inputs):
+            continue
+        if safe.is_file():
+            selected.add(rel)
+    return sorted(selected)
+
+
+def expand_changed_files(command: Sequence[str], files: Sequence[str]) -> List[str]:
+    """
+    Replaces the standalone {changed_files} argv element with one argument per
+    file. Paths that look like options get a './' prefix so a file named '-rf'
+    cannot become a flag.
+    """
+    args = [f"./{rel}" if rel.startswith("-") else rel for rel in files]
+    out: List[str] = []
+    for arg in command:
+        if arg == CHANGED_FILES_PLACEHOLDER:
+            out.extend(args)
+        else:
+            out.append(arg)
+    return out
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .file_digests import FileDigestCache
+
+
+def glob_matches(rel_path: str, pattern: str) -> bool:
+    """
+    fnmatch, as elsewhere in the policy, except that a leading '**/' also matches
+    files at the workspace root ('**/*.py' covers 'setup.py').
+    """
+    if fnmatch(rel_path, pattern):
+        return True
+    return pattern.startswith("**/") and fnmatch(rel_path, pattern[3:])
+
+
+# Third-party code and tool caches; never inputs or sources of the workspace.
+VENDORED_DIRS = frozenset({"node_modules", "bower_components", "site-packages", "dist-packages", "__pycache__"})
+
+
+def matching_files(root: Path, patterns: Sequence[str], deny_globs: Sequence[str]) -> List[str]:
+    """
+    Sorted workspace-relative paths matching any pattern. Directories matching a
+    deny glob (e.g. '**/.git/**') are pruned rather than walked, and so are hidden
+    directories (.git, .venv, .tox, ...), VENDORED_DIRS and virtualenvs under any
+    name (a directory holding pyvenv.cfg).
+    """
+    out: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace("\\", "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        if rel_dir and "pyvenv.cfg" in filenames:
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not d.startswith(".") and d not in VENDORED_DIRS
+            and not any(glob_matches(f"{rel_dir}{d}/", pat) for pat in deny_globs)
+        )
+        for name in filenames:
+            rel = f"{rel_dir}{name}"
+            if any(glob_matches(rel, pat) for pat in patterns):
+                out.append(rel)
+    out.sort()
+    return out
+
+
+def input_fingerprint(root: Path, patterns: Sequence[str], deny_globs: Sequence[str], digests: FileDigestCache) -> str:
+    """
+    sha256 over (path, content digest) of every tracked input file. Unchanged files
+    cost one stat() each thanks to the digest cache.
+    """
+    h = hashlib.sha256()
+    for rel in matching_files(root, patterns, deny_globs):
+        digest = digests.digest(root / rel)
+        if digest is None:
+            continue
+        h.update(rel.encode("utf-8"))
+        h.update(b"\0")
+        h.update(digest.encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def cache_key(argv: Sequence[str], policy_hash: str, fingerprint: str) -> str:
+    payload = json.dumps({"argv": list(argv), "policy_hash": policy_hash, "inputs": fingerprint}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaskResultCache:
+    """
+    LRU of finished task results bounded by a byte budget (serialized size).
+    A budget of 0 disables caching.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], bool, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0]), entry[1]
+
+    def put(self, key: str, data: Dict[str, Any], output_truncated: bool) -> None:
+        size = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (dict(data), output_truncated, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from .run_record import RunRecord
+
+SUMMARY_TAIL_LINES = 5
+MAX_SUMMARY_DIFF_LINES = 50
+
+
+def _failure_key(failure: Dict[str, Any]) -> str:
+    # Line numbers are left out so that edits above a failure do not make it "new".
+    return f"{failure.get('id')}|{failure.get('file')}|{failure.get('message')}"
+
+
+def summary_lines(data: Dict[str, Any]) -> List[str]:
+    """
+    The lines compared between runs: the parsed report summary when there is one,
+    otherwise the last few non-empty lines of stdout (where runners print totals).
+    """
+    report = data.get("report") or {}
+    if isinstance(report.get("summary"), dict):
+        return [f"{key}: {value}" for key, value in report["summary"].items()]
+    lines = [line for line in str(data.get("stdout", "")).splitlines() if line.strip()]
+    return lines[-SUMMARY_TAIL_LINES:]
+
+
+def result_snapshot(audit_id: str, data: Dict[str, Any], argv: Sequence[str]) -> Dict[str, Any]:
+    """
+    What the run record keeps per task for the next comparison: no raw output.
+    `argv` is the expanded command, so runs over different selections
+    (changed_only, {changed_files}, bundle_id) are not compared.
+    """
+    report = data.get("report") or {}
+    return {
+        "audit_id": audit_id,
+        "argv": list(argv),
+        "exit_code": data.get("exit_code"),
+        "failures": list(report.get("failures") or []) if "failures" in report else None,
+        "summary_lines": summary_lines(data),
+    }
+
+
+def _surplus(failures: List[Dict[str, Any]], extra: "Counter[str]") -> List[Dict[str, Any]]:
+    # The last `extra[key]` occurrences of each key, in report order.
+    remaining = Counter(_failure_key(f) for f in failures)
+    out = []
+    for failure in failures:
+        key = _failure_key(failure)
+        if remaining[key] <= extra[key]:
+            out.append(failure)
+        remaining[key] -= 1
+    return out
+
+
+def diff_results(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    diff: Dict[str, Any] = {
+        "previous_audit_id": previous["audit_id"],
+        "previous_exit_code": previous["exit_code"],
+        "exit_code": current["exit_code"],
+        "comparable": previous.get("argv") == current["argv"],
+    }
+    if not diff["comparable"]:
+        # A different selection of tests or files: failures outside it are not "resolved".
+        return diff
+    if previous["failures"] is not None and current["failures"] is not None:
+        # Multisets: a second identical violation in the same file is a new failure.
+        before = Counter(_failure_key(f) for f in previous["failures"])
+        after = Counter(_failure_key(f) for f in current["failures"])
+        diff["new_failures"] = _surplus(current["failures"], after - before)
+        diff["resolved_failures"] = _surplus(previous["failures"], before - after)
+        diff["unchanged_failures"] = sum((before & after).values())
+        diff["failure_count_delta"] = len(current["failures"]) - len(previous["failures"])
+    summary_diff = [
+        line for line in difflib.unified_diff(previous["summary_lines"], current["summary_lines"], lineterm="", n=0)
+        if not line.startswith(("---", "+++", "@@"))
+    ]
+    diff["summary_diff"] = summary_diff[:MAX_SUMMARY_DIFF_LINES]
+    return diff
+
+
+def record_and_diff(run: Optional[RunRecord], task_name: str, audit_id: str, data: Dict[str, Any], argv: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """
+    Stores this result in the run record and returns the diff against the
+    previous result of the same task in the run (None for the first one).
+    """
+    if run is None:
+        return None
+    snapshot = result_snapshot(audit_id, data, argv)
+    results = run.task_results
+    previous = results.get(task_name)
+    results[task_name] = snapshot
+    return diff_results(previous, snapshot) if previous is not None else None
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+STREAMS = ("stdout", "stderr")
+MAX_GREP_LINE_CHARS = 2000
+
+
+class TaskOutputArtifact:
+    """
+    Full stdout/stderr of one task run, spooled to temp files as the reader
+    threads receive it, up to `max_bytes` per stream.
+
+    The response keeps only head and tail windows; this keeps everything in
+    between so read_task_output can page or grep it later. Each stream is written
+    by a single reader thread, so writes need no lock.
+    """
+
+    def __init__(self, audit_id: str, task_name: str, owner_hash: Optional[str], run_id: Optional[str], max_bytes: int):
+        self.audit_id = audit_id
+        self.task_name = task_name
+        self.owner_hash = owner_hash
+        self.run_id = run_id
+        self.max_bytes = max_bytes
+        self.paths: Dict[str, Path] = {}
+        self.sizes = {stream: 0 for stream in STREAMS}
+        self.dropped = {stream: 0 for stream in STREAMS}
+        self._handles: Dict[str, BinaryIO] = {}
+        for stream in STREAMS:
+            fd, name = tempfile.mkstemp(prefix=f"workspace-mcp-output-{stream}-", suffix=".log")
+            self.paths[stream] = Path(name)
+            self._handles[stream] = os.fdopen(fd, "wb")
+
+    def write(self, stream: str, data: bytes) -> None:
+        handle = self._handles.get(stream)
+        room = self.max_bytes - self.sizes[stream]
+        if handle is None or room <= 0:
+            self.dropped[stream] += len(data)
+            return
+        piece = data[:room]
+        handle.write(piece)
+        self.sizes[stream] += len(piece)
+        self.dropped[stream] += len(data) - len(piece)
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+
+    def discard(self) -> None:
+        self.close()
+        for path in self.paths.values():
+            path.unlink(missing_ok=True)
+
+    @property
+    def truncated(self) -> bool:
+        return any(self.dropped.values())
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "audit_id": self.audit_id,
+            "stdout_bytes": self.sizes["stdout"],
+            "stderr_bytes": self.sizes["stderr"],
+            "truncated": self.truncated,
+        }
+
+    def read(self, stream: str, offset: int, length: int) -> Dict[str, Any]:
+        total = self.sizes[stream]
+        offset = max(0, min(offset, total))
+        with self.paths[stream].open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read(max(0, length))
+        end = offset + len(data)
+        return {
+            "text": data.decode("utf-8", errors="replace"),
+            "offset": offset,
+            "length": len(data),
+            "next_offset": end if end < total else None,
+            "total_bytes": total,
+        }
+
+    def grep(self, stream: str, pattern: "re.Pattern[str]", offset: int, max_matches: int, max_scan_bytes: int) -> Dict[str, Any]:
+        """
+        Matching lines from `offset`, scanning at most `max_scan_bytes`.
+        `next_offset` resumes the scan; line numbers are only given when the scan
+        starts at 0, since counting them from an arbitrary offset would mean
+        re-reading the file.
+        """
+        total = self.sizes[stream]
+        offset = max(0, min(offset, total))
+        matches: List[Dict[str, Any]] = []
+        position = offset
+        line_no = 1 if offset == 0 else None
+        with self.paths[stream].open("rb") as handle:
+            handle.seek(offset)
+            for raw in handle:
+                if position - offset >= max_scan_bytes or len(matches) >= max_matches:
+                    break
+                text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if pattern.search(text):
+                    matches.append({
+                        "offset": position,
+                        "line": line_no,
+                        "text": text[:MAX_GREP_LINE_CHARS],
+                    })
+                position += len(raw)
+                if line_no is not None:
+                    line_no += 1
+        return {
+            "matches": matches,
+            "offset": offset,
+            "next_offset": position if position < total else None,
+            "total_bytes": total,
+        }
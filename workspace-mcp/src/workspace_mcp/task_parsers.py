@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+REPORT_PLACEHOLDER = "{report_file}"
+MAX_REPORT_BYTES = 10_000_000
+MAX_FAILURES = 100
+MAX_MESSAGE_CHARS = 500
+
+# Last "path.py:123:" location in a traceback is the failing line.
+_TRACEBACK_LOCATION_RE = re.compile(r"^([^\s:][^:\n]*\.\w+):(\d+):", re.MULTILINE)
+_FLAKE8_RE = re.compile(r"^(?P<file>[^:\n]+):(?P<line>\d+):(?P<col>\d+): (?P<code>\S+) (?P<message>.*)$")
+
+Failure = Dict[str, Any]  # {"id": str, "file": str | None, "line": int | None, "message": str}
+ParsedReport = Tuple[Dict[str, Any], List[Failure]]
+Parser = Callable[[str, Path], ParsedReport]
+
+
+def _relative(path: Optional[str], root: Path) -> Optional[str]:
+    if not path:
+        return None
+    candidate = Path(path)
+    if not candidate.is_absolute():
+        candidate = root / candidate
+    try:
+        return candidate.resolve().relative_to(root).as_posix()
+    except (ValueError, OSError):
+        return path.replace("\\", "/")
+
+
+def _clip(message: str) -> str:
+    message = message.strip()
+    return message if len(message) <= MAX_MESSAGE_CHARS else message[:MAX_MESSAGE_CHARS] + "..."
+
+
+def parse_junit(text: str, root: Path) -> ParsedReport:
+    """
+    JUnit XML (pytest --junitxml, most JS/Java runners). Failures and errors are
+    reported; the location prefers the last traceback frame over the testcase line.
+    """
+    tree = ET.fromstring(text)
+    suites = [tree] if tree.tag == "testsuite" else tree.findall("testsuite")
+    summary = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    for suite in suites:
+        for key in summary:
+            summary[key] += int(suite.get(key, 0) or 0)
+
+    failures: List[Failure] = []
+    for case in tree.iter("testcase"):
+        problem = case.find("failure")
+        if problem is None:
+            problem = case.find("error")
+        if problem is None:
+            continue
+        classname, name = case.get("classname", ""), case.get("name", "")
+        file_path: Optional[str] = case.get("file")
+        line: Optional[int] = int(case.get("line", "")) + 1 if case.get("line", "").isdigit() else None
+        locations = _TRACEBACK_LOCATION_RE.findall(problem.text or "")
+        if locations:
+            file_path, line = locations[-1][0], int(locations[-1][1])
+        message = problem.get("message") or ""
+        if not message:
+            body = (problem.text or "").strip().splitlines()
+            message = body[-1] if body else problem.tag
+        failures.append({
+            "id": f"{classname}::{name}" if classname else name,
+            "file": _relative(file_path, root),
+            "line": line,
+            "message": _clip(message),
+        })
+    return summary, failures
+
+
+def parse_ruff_json(text: str, root: Path) -> ParsedReport:
+    """
+    `ruff check --output-format json`.
+    """
+    items = json.loads(text or "[]")
+    failures: List[Failure] = []
+    for item in items:
+        location = item.get("location") or {}
+        failures.append({
+            "id": str(item.get("code") or "ruff"),
+            "file": _relative(item.get("filename"), root),
+            "line": location.get("row"),
+            "message": _clip(str(item.get("message", ""))),
+        })
+    return {"violations": len(failures)}, failures
+
+
+def parse_flake8(text: str, root: Path) -> ParsedReport:
+    """
+    flake8 default format: path:row:col: CODE message.
+    """
+    failures: List[Failure] = []
+    for raw in text.splitlines():
+        m = _FLAKE8_RE.match(raw.strip())
+        if not m:
+            continue
+        failures.append({
+            "id": m.group("code"),
+            "file": _relative(m.group("file"), root),
+            "line": int(m.group("line")),
+            "message": _clip(m.group("message")),
+        })
+    return {"violations": len(failures)}, failures
+
+
+PARSERS: Dict[str, Parser] = {
+    "junit": parse_junit,
+    "ruff_json": parse_ruff_json,
+    "flake8": parse_flake8,
+}
+
+
+def prepare_report_file(command: Sequence[str]) -> Tuple[List[str], Optional[Path]]:
+    """
+    Substitutes {report_file} in the argv with a fresh temp path outside the workspace.
+    Returns the argv unchanged (and no path) when the task reports on stdout.
+    """
+    if not any(REPORT_PLACEHOLDER in arg for arg in command):
+        return list(command), None
+    fd, name = tempfile.mkstemp(prefix="workspace-mcp-report-")
+    os.close(fd)
+    return [arg.replace(REPORT_PLACEHOLDER, name) for arg in command], Path(name)
+
+
+def collect_report(parser_name: str, report_path: Optional[Path], stdout: str, root: Path) -> Dict[str, Any]:
+    """
+    Runs the named parser over the report file (or stdout, which may already be
+    truncated) and removes the file. Parse problems are reported in the result
+    rather than raised.
+    """
+    report: Dict[str, Any] = {"parser": parser_name}
+    try:
+        if report_path is not None:
+            if report_path.stat().st_size > MAX_REPORT_BYTES:
+                report["error"] = f"Report exceeds {MAX_REPORT_BYTES} bytes"
+                return report
+            text = report_path.read_text(encoding="utf-8", errors="replace")
+        else:
+            text = stdout
+        summary, failures = PARSERS[parser_name](text, root)
+        report["summary"] = summary
+        report["failures"] = failures[:MAX_FAILURES]
+        report["failures_truncated"] = len(failures) > MAX_FAILURES
+    except Exception as e:
+        report["error"] = f"Could not parse report: {str(e)}"
+    finally:
+        if report_path is not None:
+            report_path.unlink(missing_ok=True)
+    return report
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Minimal, deterministic environment for allowlisted tasks.
+TASK_ENV = {"PATH": "/usr/bin:/bin:/usr/local/bin", "LANG": "C.UTF-8"}
+TRUNCATION_MARKER = "\n... [TRUNCATED {dropped} bytes] ...\n"
+READ_CHUNK_BYTES = 65536
+# Longer lines are forwarded in pieces so a newline-free stream cannot grow a buffer.
+MAX_LINE_BYTES = 8192
+# Pending streamed lines per task; readers block (and so does the child) beyond this.
+MAX_PENDING_LINES = 2048
+
+# task_options.<task>.limits key -> rlimit name. RLIMIT_NPROC counts every process
+# of the server's user, not just the task's children, so size it with headroom.
+RLIMIT_NAMES = {
+    "cpu_seconds": "RLIMIT_CPU",
+    "address_space_bytes": "RLIMIT_AS",
+    "open_files": "RLIMIT_NOFILE",
+    "processes": "RLIMIT_NPROC",
+}
+REAP_POLL_SECONDS = 0.01
+
+OutputLine = Tuple[str, str]  # (stream, line) where stream is "stdout" or "stderr"
+OutputCallback = Callable[[List[OutputLine]], None]
+OutputSink = Callable[[str, bytes], None]  # (stream, raw chunk), called from reader threads
+# (argv, cwd, env, limits) -> a started process with Popen's stdout/stderr/kill/wait
+# plus reap(deadline), or None to fall back to subprocess.Popen.
+Spawner = Callable[[List[str], Path, Dict[str, str], Optional[Mapping[str, int]]], Any]
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+@dataclass
+class StreamStats:
+    total_bytes: int
+    dropped_bytes: int
+    head_bytes: int
+    tail_bytes: int
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class ResourceUsage:
+    user_cpu_seconds: float
+    system_cpu_seconds: float
+    max_rss_bytes: int
+    block_input_ops: int
+    block_output_ops: int
+
+    @classmethod
+    def from_rusage(cls, usage: Any) -> "ResourceUsage":
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        rss_unit = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            user_cpu_seconds=round(usage.ru_utime, 3),
+            system_cpu_seconds=round(usage.ru_stime, 3),
+            max_rss_bytes=int(usage.ru_maxrss) * rss_unit,
+            block_input_ops=int(usage.ru_inblock),
+            block_output_ops=int(usage.ru_oublock),
+        )
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.user_cpu_seconds + self.system_cpu_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class TaskOutput:
+    exit_code: int
+    stdout: str
+    stderr: str
+    output_truncated: bool
+    duration_seconds: float
+    stdout_stats: StreamStats
+    stderr_stats: StreamStats
+    rusage: Optional[ResourceUsage] = None
+    warm_start: bool = False
+
+    def output_stats(self) -> Dict[str, Dict[str, int]]:
+        return {"stdout": self.stdout_stats.as_dict(), "stderr": self.stderr_stats.as_dict()}
+
+
+class _Capture:
+    """
+    Head + tail windows over a byte stream, `max_bytes` in total.
+
+    The first half of the budget keeps the start of the stream, the rest keeps a
+    sliding window over its end; everything in between is only counted. Memory
+    stays at max_bytes plus one read chunk however much the child writes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.head_limit = max_bytes // 2
+        self.tail_limit = max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+
+    def feed(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head.extend(data[:room])
+            data = data[room:]
+        if not data or self.tail_limit <= 0:
+            return
+        if len(data) >= self.tail_limit:
+            self.tail[:] = data[-self.tail_limit:]
+        else:
+            self.tail.extend(data)
+            overflow = len(self.tail) - self.tail_limit
+            if overflow > 0:
+                del self.tail[:overflow]
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.total_bytes - len(self.head) - len(self.tail)
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_bytes > 0
+
+    def text(self) -> str:
+        head = bytes(self.head).decode("utf-8", errors="replace")
+        tail = bytes(self.tail).decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        return head + TRUNCATION_MARKER.format(dropped=self.dropped_bytes) + tail
+
+    def stats(self) -> StreamStats:
+        return StreamStats(
+            total_bytes=self.total_bytes,
+            dropped_bytes=self.dropped_bytes,
+            head_bytes=len(self.head),
+            tail_bytes=len(self.tail),
+        )
+
+
+def _put(lines: "queue.Queue[Optional[OutputLine]]", item: Optional[OutputLine], stopping: threading.Event) -> None:
+    while not stopping.is_set():
+        try:
+            lines.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _pump(
+    stream_name: str,
+    pipe: IO[bytes],
+    capture: _Capture,
+    lines: "queue.Queue[Optional[OutputLine]]",
+    stream_lines: bool,
+    stopping: threading.Event,
+    sink: Optional[OutputSink] = None,
+) -> None:
+    """
+    Reads the pipe in fixed-size chunks. Lines are only split out (and queued) when
+    a consumer wants them; the capture windows see every byte either way.
+    """
+    partial = bytearray()
+    fd = pipe.fileno()
+    try:
+        while True:
+            chunk = os.read(fd, READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            capture.feed(chunk)
+            if sink is not None:
+                sink(stream_name, chunk)
+            if not stream_lines:
+                continue
+            partial.extend(chunk)
+            while True:
+                cut = partial.find(b"\n")
+                if cut < 0:
+                    if len(partial) < MAX_LINE_BYTES:
+                        break
+                    cut = MAX_LINE_BYTES
+                    raw, partial = bytes(partial[:cut]), partial[cut:]
+                else:
+                    raw, partial = bytes(partial[:cut]), partial[cut + 1:]
+                _put(lines, (stream_name, raw.decode("utf-8", errors="replace").rstrip("\r")), stopping)
+        if stream_lines and partial:
+            _put(lines, (stream_name, bytes(partial).decode("utf-8", errors="replace").rstrip("\r")), stopping)
+    finally:
+        pipe.close()
+        _put(lines, None, stopping)
+
+
+def rlimit_plan(limits: Optional[Mapping[str, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Resolves `limits` (RLIMIT_NAMES keys) to (resource, soft, hard) triples.
+
+    Limits are clamped to the current hard limit, which an unprivileged process
+    cannot raise. The CPU hard limit sits one second above the soft one so the
+    child gets SIGXCPU before SIGKILL.
+    """
+    if not limits or resource is None:
+        return []
+    plan: List[Tuple[int, int, int]] = []
+    for key, value in limits.items():
+        rlimit = getattr(resource, RLIMIT_NAMES[key], None)
+        if rlimit is None:
+            continue
+        _, hard = resource.getrlimit(rlimit)
+        soft = value if hard == resource.RLIM_INFINITY else min(value, hard)
+        new_hard = soft + 1 if key == "cpu_seconds" else soft
+        if hard != resource.RLIM_INFINITY:
+            new_hard = min(new_hard, hard)
+        plan.append((rlimit, soft, new_hard))
+    return plan
+
+
+def rlimit_preexec(limits: Optional[Mapping[str, int]]) -> Optional[Callable[[], None]]:
+    """
+    preexec_fn applying `limits` in the child. Everything is resolved in the
+    parent; the child only calls setrlimit.
+    """
+    plan = rlimit_plan(limits)
+    if not plan:
+        return None
+
+    def apply() -> None:
+        for rlimit, soft, hard in plan:
+            resource.setrlimit(rlimit, (soft, hard))
+
+    return apply
+
+
+def _reap(proc: "subprocess.Popen[bytes]", deadline: float) -> Tuple[int, Optional[ResourceUsage]]:
+    """
+    Waits for the child with os.wait4 so its own rusage comes back with the exit
+    status (getrusage(RUSAGE_CHILDREN) would mix in concurrent tasks).
+    Raises subprocess.TimeoutExpired at `deadline`, leaving the child running.
+    """
+    if not hasattr(os, "wait4"):
+        return proc.wait(timeout=max(0.0, deadline - time.time())), None
+    while True:
+        try:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        except ChildProcessError:
+            return proc.wait(), None
+        if pid:
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            return proc.returncode, ResourceUsage.from_rusage(usage)
+        if time.time() >= deadline:
+            raise subprocess.TimeoutExpired(proc.args, deadline)
+        time.sleep(REAP_POLL_SECONDS)
+
+
+def run_command(
+    command: Sequence[str],
+    cwd: Path,
+    timeout: float,
+    max_output_bytes: int,
+    on_output: Optional[OutputCallback] = None,
+    batch_lines: int = 50,
+    batch_interval: float = 0.5,
+    cancel: Optional[threading.Event] = None,
+    limits: Optional[Mapping[str, int]] = None,
+    spawn: Optional[Spawner] = None,
+    sink: Optional[OutputSink] = None,
+) -> TaskOutput:
+    """
+    Runs an argv (never through a shell) and reads stdout/stderr incrementally.
+
+    Each stream is read in fixed-size chunks into head + tail windows of
+    `max_output_bytes` in total. When `on_output` is given it receives batches of
+    lines as they arrive, flushed every `batch_lines` lines or `batch_interval`
+    seconds, whichever comes first.
+    Raises subprocess.TimeoutExpired after killing the child if `timeout` elapses,
+    and TaskCancelled if `cancel` is set while the child is running.
+    `limits` are applied with setrlimit in the child; the result carries the
+    child's rusage where the platform reports it. `spawn` may start the child
+    another way (see warm_pool); output is captured identically either way.
+    `sink` receives every raw chunk, e.g. to keep the full output on disk.
+    """
+    start = time.time()
+    deadline = start + timeout
+    proc: Any = spawn(list(command), cwd, dict(TASK_ENV), limits) if spawn is not None else None
+    warm_start = proc is not None
+    if proc is None:
+        proc = subprocess.Popen(
+            list(command),
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            shell=False,
+            env=dict(TASK_ENV),
+            preexec_fn=rlimit_preexec(limits),
+        )
+    assert proc.stdout is not None and proc.stderr is not None
+
+    captures = {"stdout": _Capture(max_output_bytes), "stderr": _Capture(max_output_bytes)}
+    lines: "queue.Queue[Optional[OutputLine]]" = queue.Queue(maxsize=MAX_PENDING_LINES)
+    stopping = threading.Event()
+    readers = [
+        threading.Thread(target=_pump, args=(name, pipe, captures[name], lines, on_output is not None, stopping, sink), daemon=True)
+        for name, pipe in (("stdout", proc.stdout), ("stderr", proc.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+
+    batch: List[OutputLine] = []
+    last_flush = time.time()
+    open_streams = len(readers)
+
+    def flush() -> None:
+        nonlocal batch, last_flush
+        if batch and on_output is not None:
+            on_output(batch)
+        batch = []
+        last_flush = time.time()
+
+    def stop() -> None:
+        proc.kill()
+        proc.wait()
+        stopping.set()
+        for reader in readers:
+            reader.join(timeout=1)
+        flush()
+
+    while open_streams:
+        now = time.time()
+        if cancel is not None and cancel.is_set():
+            stop()
+            raise TaskCancelled(list(command))
+        if now >= deadline:
+            stop()
+            raise subprocess.TimeoutExpired(list(command), timeout)
+        try:
+            item = lines.get(timeout=min(batch_interval, deadline - now))
+            if item is None:
+                open_streams -= 1
+            else:
+                batch.append(item)
+        except queue.Empty:
+            pass
+        if len(batch) >= batch_lines or (batch and time.time() - last_flush >= batch_interval):
+            flush()
+
+    try:
+        exit_code, rusage = proc.reap(deadline) if warm_start else _reap(proc, deadline)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise subprocess.TimeoutExpired(list(command), timeout)
+    flush()
+
+    return TaskOutput(
+        exit_code=exit_code,
+        stdout=captures["stdout"].text(),
+        stderr=captures["stderr"].text(),
+        output_truncated=captures["stdout"].truncated or captures["stderr"].truncated,
+        duration_seconds=time.time() - start,
+        stdout_stats=captures["stdout"].stats(),
+        stderr_stats=captures["stderr"].stats(),
+        rusage=rusage,
+        warm_start=warm_start,
+    )
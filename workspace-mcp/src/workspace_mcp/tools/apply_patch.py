@@ -2,14 +2,24 @@ import subprocess
 import tempfile
 import re
 import time
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
 from ..governor import Governor
 from ..response_schema import ToolResponse
-from ..path_safety import resolve_path, validate_path, PathSafetyError
+from ..path_safety import resolve_path, check_path, PathSafetyError
+from ..diffs import header_targets
+from ..uploads import DiffUpload
+from .diff_upload import lookup_upload, upload_not_found
 
-def validate_patch(governor: Governor, target_file: str, diff_text: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+
+def validate_patch(governor: Governor, target_file: str, diff_text: str = "", run_id: Optional[str] = None, owner_id: Optional[str] = None, diff_handle: Optional[str] = None) -> ToolResponse:
     start_time = time.time()
-    decision = governor.validate_action("validate_patch", "read", {"path": target_file, "diff_size": len(diff_text)}, run_id=run_id, owner_id=owner_id)
+    upload: Optional[DiffUpload] = None
+    args: Dict[str, Any] = {"path": target_file, "diff_size": len(diff_text)}
+    if diff_handle:
+        upload = lookup_upload(governor, diff_handle, owner_id)
+        args.update({"diff_size": upload.size if upload else 0, "diff_handle": diff_handle})
+    decision = governor.validate_action("validate_patch", "read", args, run_id=run_id, owner_id=owner_id)
     if not decision.allowed:
         if decision.block_response:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -17,16 +27,27 @@ def validate_patch(governor: Governor, target_file: str, diff_text: str, run_id:
             governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
             return decision.block_response
         return ToolResponse.error("Action blocked", code="blocked")
+
+    has_old_header = "---" in diff_text
+    has_new_header = "+++" in diff_text
+    if diff_handle:
+        if upload is None:
+            return upload_not_found(governor, decision.audit_id, "validate_patch", diff_handle, start_time, run_id, owner_id, risk="read")
+        for line in upload.iter_lines():
+            has_old_header = has_old_header or "---" in line
+            has_new_header = has_new_header or "+++" in line
+            if has_old_header and has_new_header:
+                break
         
     try:
         safe_path = resolve_path(governor.root, target_file)
-        validate_path(safe_path, governor.root, governor.config.deny_globs, governor.config.allow_paths)
+        check_path(safe_path, governor.root, governor.policy)
         
         if not safe_path.exists():
             governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
             return ToolResponse.error("Target file not found", code="not_found", meta=governor.get_meta(decision.audit_id, "validate_patch", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
             
-        if "---" not in diff_text or "+++" not in diff_text:
+        if not (has_old_header and has_new_header):
             governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
             return ToolResponse.error("Invalid diff format", code="invalid_input", meta=governor.get_meta(decision.audit_id, "validate_patch", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
         duration_ms = int((time.time() - start_time) * 1000)
@@ -40,19 +61,29 @@ def validate_patch(governor: Governor, target_file: str, diff_text: str, run_id:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.blocked("Patch targets unsafe file", {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"error": str(e)}, "config_path": ""}, meta=governor.get_meta(decision.audit_id, "validate_patch", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
 
-def apply_patch(governor: Governor, diff_text: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+def apply_patch(governor: Governor, diff_text: str = "", run_id: Optional[str] = None, owner_id: Optional[str] = None, diff_handle: Optional[str] = None) -> ToolResponse:
     """
-    Applies a unified diff to the workspace.
+    Applies a unified diff to the workspace, given inline or as a committed upload handle.
     """
     start_time = time.time()
     # Parse targets from unified diff headers.
-    target_files = set()
-    path_regex = re.compile(r'^(?:\+\+\+|---) (?:[ab]/)?(.+)$', re.MULTILINE)
-
-    matches = path_regex.findall(diff_text)
+    target_files: Set[str] = set()
+    upload: Optional[DiffUpload] = None
+    if diff_handle:
+        upload = lookup_upload(governor, diff_handle, owner_id)
+        # Spooled diffs are scanned line by line and handed to patch as-is.
+        matches = header_targets(upload.iter_lines()) if upload else []
+        diff_size = upload.size if upload else 0
+    else:
+        path_regex = re.compile(r'^(?:\+\+\+|---) (?:[ab]/)?(.+)$', re.MULTILINE)
+        matches = path_regex.findall(diff_text)
+        diff_size = len(diff_text)
     parsed_targets = [target.strip() for target in matches if target != "/dev/null"]
+    args: Dict[str, Any] = {"diff_size": diff_size, "paths": parsed_targets}
+    if diff_handle:
+        args["diff_handle"] = diff_handle
     # Governor Check (includes allow/deny write path checks)
-    decision = governor.validate_action("apply_patch", "write", {"diff_size": len(diff_text), "paths": parsed_targets}, run_id=run_id, owner_id=owner_id)
+    decision = governor.validate_action("apply_patch", "write", args, run_id=run_id, owner_id=owner_id)
     if not decision.allowed:
         if decision.block_response:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -61,6 +92,9 @@ def apply_patch(governor: Governor, diff_text: str, run_id: Optional[str] = None
             return decision.block_response
         return ToolResponse.error("Action blocked", code="blocked")
 
+    if diff_handle and upload is None:
+        return upload_not_found(governor, decision.audit_id, "apply_patch", diff_handle, start_time, run_id, owner_id)
+
     if not matches:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.error("Could not parse any target paths from diff", code="invalid_input", meta=governor.get_meta(decision.audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
@@ -73,7 +107,7 @@ def apply_patch(governor: Governor, diff_text: str, run_id: Optional[str] = None
             clean_target = target.strip()
 
             safe_path = resolve_path(governor.root, clean_target)
-            validate_path(safe_path, governor.root, governor.config.deny_globs, governor.config.allow_paths)
+            check_path(safe_path, governor.root, governor.policy)
             target_files.add(str(safe_path.relative_to(governor.root)))
 
     except PathSafetyError as e:
@@ -82,51 +116,12 @@ def apply_patch(governor: Governor, diff_text: str, run_id: Optional[str] = None
 
     # Apply patch with dry-run first.
     try:
+        if upload is not None:
+            return _apply_patch_file(governor, upload.path, target_files, decision.audit_id, start_time, run_id, owner_id)
         with tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8', delete=True) as tmp:
             tmp.write(diff_text)
             tmp.flush()
-
-            def run_patch(strip_level: str, dry_run: bool) -> subprocess.CompletedProcess[str]:
-                cmd = ["patch", strip_level, "--input", tmp.name]
-                if dry_run:
-                    cmd.insert(1, "--dry-run")
-                return subprocess.run(
-                    cmd,
-                    cwd=governor.root,
-                    capture_output=True,
-                    text=True,
-                    timeout=governor.config.max_runtime_seconds,
-                )
-
-            dry_proc = run_patch("-p1", dry_run=True)
-            if dry_proc.returncode != 0:
-                dry_proc = run_patch("-p0", dry_run=True)
-            if dry_proc.returncode != 0:
-                governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
-                return ToolResponse.error(
-                    "Patch simulation failed",
-                    code="tool_failed",
-                    details={"stderr": dry_proc.stderr, "stdout": dry_proc.stdout},
-                    meta=governor.get_meta(decision.audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
-                )
-
-            proc = run_patch("-p1", dry_run=False)
-            if proc.returncode != 0:
-                proc = run_patch("-p0", dry_run=False)
-            if proc.returncode != 0:
-                governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
-                return ToolResponse.error("Patch failed to apply", code="tool_failed", details={"stderr": proc.stderr, "stdout": proc.stdout}, meta=governor.get_meta(decision.audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
-
-            duration_ms = int((time.time() - start_time) * 1000)
-            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
-            return ToolResponse.success(
-                summary="Patch applied successfully",
-                data={
-                    "modified_files": list(target_files),
-                    "output": proc.stdout
-                },
-                meta=governor.get_meta(decision.audit_id, "apply_patch", "write", duration_ms, run_id=run_id, owner_id=owner_id)
-            )
+            return _apply_patch_file(governor, Path(tmp.name), target_files, decision.audit_id, start_time, run_id, owner_id)
 
     except subprocess.TimeoutExpired:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
@@ -134,3 +129,65 @@ def apply_patch(governor: Governor, diff_text: str, run_id: Optional[str] = None
     except Exception as e:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.error(f"Patch execution error: {str(e)}", code="tool_failed", meta=governor.get_meta(decision.audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+
+
+def record_changed_files(governor: Governor, run_id: str, files: Set[str]) -> None:
+    """
+    Adds files to the run's changed_files (workspace-relative, posix, deduplicated)
+    for change-impact queries later in the run.
+    """
+    run = governor.runs.get(run_id)
+    if run is None:
+        return
+    with governor.run_lock(run_id):
+        changed = run.changed_files
+        for rel in sorted(Path(f).as_posix() for f in files):
+            if rel not in changed:
+                changed.append(rel)
+
+
+def _apply_patch_file(governor: Governor, patch_path: Path, target_files: Set[str], audit_id: str, start_time: float, run_id: Optional[str], owner_id: Optional[str]) -> ToolResponse:
+    def run_patch(strip_level: str, dry_run: bool) -> subprocess.CompletedProcess[str]:
+        cmd = ["patch", strip_level, "--input", str(patch_path)]
+        if dry_run:
+            cmd.insert(1, "--dry-run")
+        return subprocess.run(
+            cmd,
+            cwd=governor.root,
+            capture_output=True,
+            text=True,
+            timeout=governor.config.max_runtime_seconds,
+        )
+
+    dry_proc = run_patch("-p1", dry_run=True)
+    if dry_proc.returncode != 0:
+        dry_proc = run_patch("-p0", dry_run=True)
+    if dry_proc.returncode != 0:
+        governor.update_audit(audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Patch simulation failed",
+            code="tool_failed",
+            details={"stderr": dry_proc.stderr, "stdout": dry_proc.stdout},
+            meta=governor.get_meta(audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    proc = run_patch("-p1", dry_run=False)
+    if proc.returncode != 0:
+        proc = run_patch("-p0", dry_run=False)
+    if proc.returncode != 0:
+        governor.update_audit(audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error("Patch failed to apply", code="tool_failed", details={"stderr": proc.stderr, "stdout": proc.stdout}, meta=governor.get_meta(audit_id, "apply_patch", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+
+    if run_id:
+        record_changed_files(governor, run_id, target_files)
+
+    duration_ms = int((time.time() - start_time) * 1000)
+    governor.update_audit(audit_id, {"duration_ms": duration_ms})
+    return ToolResponse.success(
+        summary="Patch applied successfully",
+        data={
+            "modified_files": list(target_files),
+            "output": proc.stdout
+        },
+        meta=governor.get_meta(audit_id, "apply_patch", "write", duration_ms, run_id=run_id, owner_id=owner_id)
+    )
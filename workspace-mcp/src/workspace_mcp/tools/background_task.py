@@ -0,0 +1,176 @@
+import math
+import time
+import uuid
+import hashlib
+from typing import Any, Dict, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse, RiskLevel
+from ..background_tasks import BackgroundTask
+from ..path_safety import PathSafetyError
+from ..task_args import ChangedFilesError
+from .run_task import changed_files_error, expand_task_command
+
+
+def _owner_hash(owner_id: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+
+
+def _lookup_task(governor: Governor, task_id: str, owner_id: Optional[str]) -> Optional[BackgroundTask]:
+    task = governor.tasks.get(task_id)
+    if task is None:
+        return None
+    if owner_id and task.owner_hash != _owner_hash(owner_id):
+        return None
+    return task
+
+
+def background_limits(governor: Governor, limits: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+    """
+    A task's rlimits for a background run. cpu_seconds is sized for
+    max_runtime_seconds, so it is scaled up in proportion to
+    max_background_runtime_seconds; otherwise a long run would be killed by
+    SIGXCPU long before its own runtime limit.
+    """
+    if not limits or "cpu_seconds" not in limits:
+        return limits
+    foreground = governor.config.max_runtime_seconds
+    background = governor.config.max_background_runtime_seconds
+    if foreground <= 0:
+        cpu_seconds = max(limits["cpu_seconds"], background)
+    else:
+        cpu_seconds = max(limits["cpu_seconds"], math.ceil(limits["cpu_seconds"] * background / foreground))
+    return {**limits, "cpu_seconds": cpu_seconds}
+
+
+def _not_found(governor: Governor, audit_id: str, tool: str, risk: RiskLevel, task_id: str, start_time: float, run_id: Optional[str], owner_id: Optional[str]) -> ToolResponse:
+    governor.update_audit(audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+    return ToolResponse.error(
+        "Task not found",
+        code="not_found",
+        details={"key": "TASK_NOT_FOUND", "details": {"task_id": task_id}, "config_path": ""},
+        meta=governor.get_meta(audit_id, tool, risk, int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+    )
+
+
+def start_task(governor: Governor, task_name: str, run_id: Optional[str] = None, owner_id: Optional[str] = None, bundle_id: Optional[str] = None) -> ToolResponse:
+    """
+    Submits an allowlisted task to the background worker pool and returns a handle.
+    A {changed_files} argument expands as in run_task.
+    """
+    start_time = time.time()
+    args: Dict[str, Any] = {"task_name": task_name}
+    if bundle_id:
+        args["bundle_id"] = bundle_id
+    decision = governor.validate_action("start_task", "execute", args, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    # Queued + running tasks are capped so the pool's internal queue stays bounded.
+    max_active = governor.config.max_background_tasks * 2
+    active = sum(1 for task in governor.tasks.values() if task.active)
+    if active >= max_active:
+        violation = {"key": "TASK_QUEUE_FULL", "details": {"active": active, "max_active": max_active}, "config_path": f"profiles.{governor.config.profile}.max_background_tasks"}
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000), "decision": "blocked", "code": "blocked", "violation": violation})
+        return ToolResponse.blocked(
+            "Too many background tasks",
+            violation,
+            meta=governor.get_meta(decision.audit_id, "start_task", "execute", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    try:
+        command, _, _ = expand_task_command(governor, task_name, governor.config.allow_tasks[task_name], run_id, owner_id, bundle_id)
+    except (ChangedFilesError, PathSafetyError) as e:
+        return changed_files_error(governor, e, decision.audit_id, "start_task", start_time, run_id, owner_id)
+
+    task_id = str(uuid.uuid4())
+    options = governor.config.task_options.get(task_name, {})
+    task = BackgroundTask(
+        task_id,
+        task_name,
+        command,
+        _owner_hash(owner_id),
+        run_id,
+        governor.config.max_output_bytes,
+        parser=options.get("parser"),
+        limits=background_limits(governor, options.get("limits")),
+        spawn=governor.warm_pool.spawner(options.get("preload")),
+    )
+    governor.tasks.set(task_id, task)
+
+    def _run() -> None:
+        task.run(governor.root, governor.config.max_background_runtime_seconds, governor.config.max_output_bytes)
+        if task.result is not None and task.result.rusage is not None:
+            governor.charge_usage(run_id, owner_id, task_cpu_seconds=task.result.rusage.cpu_seconds)
+
+    governor.task_pool.submit(_run)
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Started task '{task_name}' as {task_id}",
+        data={"task_id": task_id, "task_name": task_name, "status": task.status, "max_runtime_seconds": governor.config.max_background_runtime_seconds},
+        meta=governor.get_meta(decision.audit_id, "start_task", "execute", duration, run_id=run_id, owner_id=owner_id)
+    )
+
+
+def poll_task(governor: Governor, task_id: str, cursor: int = 0, limit: int = 200, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Returns task status and output lines from `cursor` onward.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("poll_task", "read", {"task_id": task_id, "cursor": cursor, "limit": limit}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    task = _lookup_task(governor, task_id, owner_id)
+    if task is None:
+        return _not_found(governor, decision.audit_id, "poll_task", "read", task_id, start_time, run_id, owner_id)
+
+    data = task.snapshot(max(0, cursor), max(1, limit))
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Task '{task.task_name}' is {task.status}",
+        data=data,
+        meta=governor.get_meta(decision.audit_id, "poll_task", "read", duration, output_truncated=bool(data.get("output_truncated") or data["dropped_lines"]), run_id=run_id, owner_id=owner_id)
+    )
+
+
+def cancel_task(governor: Governor, task_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Requests cancellation; a running child is killed at the next output check.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("cancel_task", "write", {"task_id": task_id}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    task = _lookup_task(governor, task_id, owner_id)
+    if task is None:
+        return _not_found(governor, decision.audit_id, "cancel_task", "write", task_id, start_time, run_id, owner_id)
+
+    was_active = task.active
+    task.cancel()
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Cancellation requested for task {task_id}" if was_active else f"Task {task_id} already {task.status}",
+        data={"task_id": task_id, "status": task.status, "cancel_requested": was_active},
+        meta=governor.get_meta(decision.audit_id, "cancel_task", "write", duration, run_id=run_id, owner_id=owner_id)
+    )
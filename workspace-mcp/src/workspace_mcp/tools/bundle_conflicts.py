@@ -0,0 +1,107 @@
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse
+
+
+def _owner_hash(owner_id: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+
+
+def _visible(bundle: Dict[str, Any], owner_hash: Optional[str]) -> bool:
+    return owner_hash is None or bundle.get("owner_hash") == owner_hash
+
+
+def bundle_conflicts(governor: Governor, bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Lists live bundles whose hunks overlap the given bundle's hunks.
+    """
+    start_time = time.time()
+
+    decision = governor.validate_action("bundle_conflicts", "read", {"bundle_id": bundle_id}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    owner_hash = _owner_hash(owner_id)
+    bundle = governor.bundles.get(bundle_id)
+    if not bundle or not _visible(bundle, owner_hash):
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Bundle not found",
+            code="not_found",
+            details={"key": "BUNDLE_NOT_FOUND", "details": {"bundle_id": bundle_id}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "bundle_conflicts", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    conflicts: List[Dict[str, Any]] = []
+    foreign_conflicts = 0
+    for other_id, files in sorted(governor.bundle_index.conflicts(bundle_id).items()):
+        other = governor.bundles.peek(other_id)
+        if other is None:
+            continue
+        if not _visible(other, owner_hash):
+            # Other owners' bundles are counted, never named.
+            foreign_conflicts += 1
+            continue
+        conflicts.append({
+            "bundle_id": other_id,
+            "files": [{"path": path, "ranges": [list(r) for r in ranges]} for path, ranges in sorted(files.items())],
+        })
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Bundle {bundle_id} conflicts with {len(conflicts) + foreign_conflicts} bundles",
+        data={
+            "bundle_id": bundle_id,
+            "conflicts": conflicts,
+            "foreign_conflicts": foreign_conflicts,
+        },
+        meta=governor.get_meta(decision.audit_id, "bundle_conflicts", "read", duration, run_id=run_id, owner_id=owner_id)
+    )
+
+
+def bundle_groups(governor: Governor, bundle_ids: Optional[List[str]] = None, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Partitions bundles into groups with no overlapping hunks; groups are applied in order,
+    bundles within a group can be applied in parallel.
+    """
+    start_time = time.time()
+
+    decision = governor.validate_action("bundle_groups", "read", {"bundle_ids": bundle_ids}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    owner_hash = _owner_hash(owner_id)
+    candidates = list(bundle_ids) if bundle_ids is not None else list(governor.bundles.keys())
+    selected: List[str] = []
+    missing: List[str] = []
+    order: Dict[str, float] = {}
+    for candidate in candidates:
+        bundle = governor.bundles.peek(candidate)
+        if bundle is None or not _visible(bundle, owner_hash):
+            missing.append(candidate)
+            continue
+        selected.append(candidate)
+        order[candidate] = float(bundle.get("created_at", 0.0))
+
+    groups = governor.bundle_index.independent_groups(selected, order)
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Partitioned {len(selected)} bundles into {len(groups)} independent groups",
+        data={"groups": groups, "missing": missing},
+        meta=governor.get_meta(decision.audit_id, "bundle_groups", "read", duration, run_id=run_id, owner_id=owner_id)
+    )
@@ -0,0 +1,102 @@
+import time
+import hashlib
+from typing import Any, Dict, List, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse
+from ..diffs import FileDiff, locate_hunk, parse_unified_diff
+
+STATUS_ORDER = {"fresh": 0, "stale": 1, "conflicting": 2}
+
+
+def _hunks_still_apply(file_diffs: List[FileDiff], content: str) -> bool:
+    lines = content.split("\n")
+    for file_diff in file_diffs:
+        offset = 0
+        for hunk in file_diff.hunks:
+            at = locate_hunk(hunk, lines, offset)
+            if at is None:
+                return False
+            offset = at - hunk.anchor
+    return True
+
+
+def bundle_freshness(governor: Governor, bundle: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Per-file status of a bundle against the current tree:
+      fresh       - file content is byte-identical to the bundle's base
+      stale       - file changed since creation but every hunk still matches
+      conflicting - file changed and at least one hunk no longer matches
+    Unchanged files cost one stat() through the digest cache; the diff is only
+    parsed when some digest moved.
+    """
+    statuses: Dict[str, str] = {}
+    changed: List[str] = []
+    for path, base_digest in bundle.get("base_digests", {}).items():
+        current = governor.file_digests.digest(governor.root / path)
+        if current == base_digest:
+            statuses[path] = "fresh"
+        elif base_digest is None or current is None:
+            # Created under a new-file bundle, or deleted under an edit bundle.
+            statuses[path] = "conflicting"
+        else:
+            changed.append(path)
+
+    if changed:
+        by_path: Dict[str, List[FileDiff]] = {}
+        for file_diff in parse_unified_diff(bundle["diff_text"]):
+            for name in {file_diff.old_path, file_diff.new_path}:
+                if name:
+                    by_path.setdefault(name, []).append(file_diff)
+        for path in changed:
+            file_diffs = by_path.get(path, [])
+            if any(f.binary for f in file_diffs):
+                statuses[path] = "conflicting"
+                continue
+            try:
+                content = (governor.root / path).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                statuses[path] = "conflicting"
+                continue
+            statuses[path] = "stale" if _hunks_still_apply(file_diffs, content) else "conflicting"
+    return statuses
+
+
+def bundle_status(governor: Governor, bundle_id: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Reports whether a bundle still applies to the current workspace without running patch.
+    """
+    start_time = time.time()
+
+    decision = governor.validate_action("bundle_status", "read", {"bundle_id": bundle_id}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    bundle = governor.bundles.get(bundle_id)
+    if bundle and owner_id:
+        owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
+        if bundle.get("owner_hash") != owner_hash:
+            bundle = None
+    if not bundle:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Bundle not found",
+            code="not_found",
+            details={"key": "BUNDLE_NOT_FOUND", "details": {"bundle_id": bundle_id}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "bundle_status", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    files = bundle_freshness(governor, bundle)
+    overall = max(files.values(), key=lambda s: STATUS_ORDER[s], default="fresh")
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Bundle {bundle_id} is {overall}",
+        data={"bundle_id": bundle_id, "status": overall, "files": files},
+        meta=governor.get_meta(decision.audit_id, "bundle_status", "read", duration, run_id=run_id, owner_id=owner_id)
+    )
@@ -2,10 +2,17 @@ import time
 import re
 import hashlib
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from ..compiled_policy import CompiledPolicy
 from ..governor import Governor
 from ..response_schema import ToolResponse
-from ..path_safety import resolve_path, validate_path, PathSafetyError
+from ..path_safety import resolve_path, check_path, PathSafetyError
+from ..diffs import header_targets, parse_unified_diff
+from .diff_upload import lookup_upload, upload_not_found
+
+RISK_WEIGHTS = {"low": 1, "medium": 2, "high": 3}
+# Binary changes cannot be located by line, so they claim the whole file.
+WHOLE_FILE_RANGE = [0, 2**31 - 1]
 
 def normalize_diff_text(diff_text: str) -> str:
     text = diff_text.replace("\r\n", "\n").replace("\r", "\n")
@@ -14,15 +21,128 @@ def normalize_diff_text(diff_text: str) -> str:
         lines.pop()
     return "\n".join(lines)
 
-def create_change_bundle(governor: Governor, diff_text: str, metadata: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+def classify_file_risk(path: str, policy: CompiledPolicy) -> str:
+    return policy.classify_risk(path)
+
+def compute_bundle_stats(normalized_diff: str, target_files: List[str], rel_paths: Dict[str, str], policy: CompiledPolicy) -> Dict[str, Any]:
+    """
+    One pass over the diff: per-file churn, hunk counts, binary flags and risk class,
+    plus the bundle-level aggregates that bundle_report serves without recomputation.
+    """
+    file_stats: List[Dict[str, Any]] = []
+    hunk_ranges: Dict[str, List[List[int]]] = {}
+    for file_diff in parse_unified_diff(normalized_diff):
+        raw_path = file_diff.path
+        if not raw_path:
+            continue
+        path = rel_paths.get(raw_path, raw_path)
+        ranges = hunk_ranges.setdefault(path, [])
+        if file_diff.binary:
+            ranges.append(list(WHOLE_FILE_RANGE))
+        for hunk in file_diff.hunks:
+            # Inclusive range of base-file lines the hunk reads; pure insertions claim their anchor line.
+            ranges.append([hunk.old_start, max(hunk.old_start, hunk.old_start + hunk.old_len - 1)])
+        file_stats.append({
+            "path": path,
+            "lines_added": file_diff.lines_added,
+            "lines_removed": file_diff.lines_removed,
+            "hunks": len(file_diff.hunks),
+            "binary": file_diff.binary,
+            "risk": classify_file_risk(path, policy),
+        })
+
+    # Bundle risk is the highest class over all targets (renames count both sides).
+    risk_level = "low"
+    for target in target_files:
+        file_risk = classify_file_risk(target, policy)
+        if RISK_WEIGHTS[file_risk] > RISK_WEIGHTS[risk_level]:
+            risk_level = file_risk
+
+    lines_added = sum(s["lines_added"] for s in file_stats)
+    lines_removed = sum(s["lines_removed"] for s in file_stats)
+    total_churn = lines_added + lines_removed
+    weighted = sum(RISK_WEIGHTS[s["risk"]] * (s["lines_added"] + s["lines_removed"]) for s in file_stats)
+    largest = max(file_stats, key=lambda s: s["lines_added"] + s["lines_removed"], default=None)
+
+    return {
+        "file_stats": file_stats,
+        "hunk_ranges": hunk_ranges,
+        "risk_level": risk_level,
+        "weighted_risk_score": round(weighted / total_churn, 2) if total_churn else 0.0,
+        "churn": {
+            "files": len(file_stats),
+            "lines_added": lines_added,
+            "lines_removed": lines_removed,
+            "hunks": sum(s["hunks"] for s in file_stats),
+            "binary_files": sum(1 for s in file_stats if s["binary"]),
+            "largest_file": largest["path"] if largest else None,
+        },
+    }
+
+def canonical_bundle_id(normalized_diff: str, sorted_targets: List[str], policy_hash: str) -> str:
+    canonical_payload = {
+        "contract_version": "1.1",
+        "policy_hash": policy_hash,
+        "target_files": sorted_targets,
+        "diff": normalized_diff
+    }
+    canonical_json = json.dumps(canonical_payload, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+def register_bundle(
+    governor: Governor,
+    normalized_diff: str,
+    sorted_targets: List[str],
+    rel_paths: Dict[str, str],
+    metadata: Optional[Dict[str, Any]],
+    owner_id: Optional[str],
+    created_at: float,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Content-addresses an already validated, normalized diff and stores it.
+    Returns (bundle, created); an identical existing bundle is returned as-is.
+    """
+    bundle_id = canonical_bundle_id(normalized_diff, sorted_targets, governor.config_hash)
+    existing_bundle = governor.bundles.get(bundle_id)
+    if existing_bundle:
+        return existing_bundle, False
+
+    bundle_data = {
+        "bundle_id": bundle_id,
+        "diff_text": normalized_diff,
+        "metadata": metadata or {},
+        "target_files": sorted_targets,
+        "created_at": created_at,
+        "stats": compute_bundle_stats(normalized_diff, sorted_targets, rel_paths, governor.policy),
+        # Content digests of the base files (None = file absent) for cheap freshness checks.
+        "base_digests": {target: governor.file_digests.digest(governor.root / target) for target in sorted_targets},
+    }
+    if owner_id:
+        bundle_data["owner_hash"] = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
+
+    governor.bundles.set(bundle_id, bundle_data)
+    governor.bundle_index.add(bundle_id, bundle_data["stats"]["hunk_ranges"])
+    return bundle_data, True
+
+def create_change_bundle(governor: Governor, diff_text: str = "", metadata: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None, owner_id: Optional[str] = None, diff_handle: Optional[str] = None) -> ToolResponse:
     start_time = time.time()
 
-    path_regex = re.compile(r'^(?:\+\+\+|---) (?:[ab]/)?(.+)$', re.MULTILINE)
-    matches = path_regex.findall(diff_text)
+    upload = lookup_upload(governor, diff_handle, owner_id) if diff_handle else None
+    if diff_handle:
+        # Only the headers are scanned before validation; the body is read once allowed.
+        matches = header_targets(upload.iter_lines()) if upload else []
+        diff_size = upload.size if upload else 0
+    else:
+        path_regex = re.compile(r'^(?:\+\+\+|---) (?:[ab]/)?(.+)$', re.MULTILINE)
+        matches = path_regex.findall(diff_text)
+        diff_size = len(diff_text)
     parsed_targets = [target.strip() for target in matches if target != "/dev/null"]
 
     # Check write risk for bundle creation
-    decision = governor.validate_action("create_change_bundle", "write", {"diff_size": len(diff_text), "paths": parsed_targets}, run_id=run_id, owner_id=owner_id)
+    args: Dict[str, Any] = {"diff_size": diff_size, "paths": parsed_targets}
+    if diff_handle:
+        args["diff_handle"] = diff_handle
+    decision = governor.validate_action("create_change_bundle", "write", args, run_id=run_id, owner_id=owner_id)
     if not decision.allowed:
         if decision.block_response:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -31,7 +151,14 @@ def create_change_bundle(governor: Governor, diff_text: str, metadata: Optional[
             return decision.block_response
         return ToolResponse.error("Action blocked", code="blocked")
 
+    if diff_handle and upload is None:
+        return upload_not_found(governor, decision.audit_id, "create_change_bundle", diff_handle, start_time, run_id, owner_id)
+    if upload is not None:
+        # Bundles keep the normalized diff in memory, so a committed upload is read once here.
+        diff_text = upload.read_text()
+
     target_files = set()
+    rel_paths: Dict[str, str] = {}
     
     if not matches:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
@@ -43,45 +170,27 @@ def create_change_bundle(governor: Governor, diff_text: str, metadata: Optional[
                 continue
             clean_target = target.strip()
             safe_path = resolve_path(governor.root, clean_target)
-            validate_path(safe_path, governor.root, governor.config.deny_globs, governor.config.allow_paths)
-            target_files.add(str(safe_path.relative_to(governor.root)).replace("\\", "/"))
+            check_path(safe_path, governor.root, governor.policy)
+            rel_path = str(safe_path.relative_to(governor.root)).replace("\\", "/")
+            target_files.add(rel_path)
+            rel_paths[clean_target] = rel_path
     except PathSafetyError as e:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.blocked("Patch targets unsafe file", {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"error": str(e)}, "config_path": ""}, meta=governor.get_meta(decision.audit_id, "create_change_bundle", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
 
     normalized_diff = normalize_diff_text(diff_text)
     sorted_targets = sorted(list(target_files))
+    bundle, created = register_bundle(governor, normalized_diff, sorted_targets, rel_paths, metadata, owner_id, start_time)
+    bundle_id = bundle["bundle_id"]
     
-    canonical_payload = {
-        "contract_version": "1.1",
-        "policy_hash": governor.config_hash,
-        "target_files": sorted_targets,
-        "diff": normalized_diff
-    }
-    canonical_json = json.dumps(canonical_payload, separators=(",", ":"), sort_keys=True)
-    bundle_id = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
-    
-    existing_bundle = governor.bundles.get(bundle_id)
-    if existing_bundle:
+    if not created:
         duration = int((time.time() - start_time) * 1000)
         governor.update_audit(decision.audit_id, {"duration_ms": duration})
         return ToolResponse.success(
             summary=f"Returned existing change bundle {bundle_id}",
-            data={"bundle_id": bundle_id, "target_files": existing_bundle["target_files"]},
+            data={"bundle_id": bundle_id, "target_files": bundle["target_files"]},
             meta=governor.get_meta(decision.audit_id, "create_change_bundle", "write", duration, run_id=run_id, owner_id=owner_id)
         )
-        
-    bundle_data = {
-        "bundle_id": bundle_id,
-        "diff_text": normalized_diff,
-        "metadata": metadata or {},
-        "target_files": sorted_targets,
-        "created_at": start_time
-    }
-    if owner_id:
-        bundle_data["owner_hash"] = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
-        
-    governor.bundles.set(bundle_id, bundle_data)
     
     duration = int((time.time() - start_time) * 1000)
     governor.update_audit(decision.audit_id, {"duration_ms": duration})
@@ -125,22 +234,15 @@ def bundle_report(governor: Governor, bundle_id: str, run_id: Optional[str] = No
             )
         
     target_files = bundle["target_files"]
-    
-    # Policy-driven risk logic
-    risk_level = "low"
-    
-    from fnmatch import fnmatch
-    high_globs = governor.config.risk_rules.get("high_globs", [])
-    medium_globs = governor.config.risk_rules.get("medium_globs", [])
-    
-    for f in target_files:
-        if any(fnmatch(f, pat) for pat in high_globs):
-            risk_level = "high"
-            break
-        elif any(fnmatch(f, pat) for pat in medium_globs):
-            risk_level = "medium"
+    stats = bundle["stats"]
+    risk_level = stats["risk_level"]
         
-    test_recs = ["Run unit tests for affected modules."]
+    affected_tests = governor.import_graph.affected_tests(target_files)
+    if affected_tests:
+        shown = ", ".join(affected_tests[:5]) + (f" and {len(affected_tests) - 5} more" if len(affected_tests) > 5 else "")
+        test_recs = [f"Run affected tests: {shown}."]
+    else:
+        test_recs = ["No tests import the changed files; run the relevant tests manually."]
     if risk_level in ("medium", "high"):
         test_recs.append("Run full test suite and static analysis.")
         
@@ -154,6 +256,10 @@ def bundle_report(governor: Governor, bundle_id: str, run_id: Optional[str] = No
         "bundle_id": bundle_id,
         "changed_files": target_files,
         "risk_level": risk_level,
+        "weighted_risk_score": stats["weighted_risk_score"],
+        "churn": stats["churn"],
+        "file_stats": stats["file_stats"],
+        "affected_tests": affected_tests,
         "test_recommendations": test_recs,
         "suggested_commit_message": commit_msg,
         "rollback_notes": rollback_notes
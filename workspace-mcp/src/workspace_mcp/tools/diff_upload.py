@@ -0,0 +1,148 @@
+import time
+import uuid
+import hashlib
+from typing import Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse, RiskLevel
+from ..uploads import DiffUpload, UploadError
+
+
+def _owner_hash(owner_id: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+
+
+def lookup_upload(governor: Governor, upload_id: str, owner_id: Optional[str], committed: bool = True) -> Optional[DiffUpload]:
+    """
+    Owner-scoped upload lookup; mismatched owners read as missing, like runs and bundles.
+    """
+    upload = governor.uploads.get(upload_id)
+    if upload is None or upload.committed != committed:
+        return None
+    if owner_id and upload.owner_hash != _owner_hash(owner_id):
+        return None
+    return upload
+
+
+def upload_not_found(governor: Governor, audit_id: str, tool: str, upload_id: str, start_time: float, run_id: Optional[str], owner_id: Optional[str], risk: RiskLevel = "write") -> ToolResponse:
+    governor.update_audit(audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+    return ToolResponse.error(
+        "Upload not found",
+        code="not_found",
+        details={"key": "UPLOAD_NOT_FOUND", "details": {"upload_id": upload_id}, "config_path": ""},
+        meta=governor.get_meta(audit_id, tool, risk, int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+    )
+
+
+def begin_diff_upload(governor: Governor, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Opens a spool for a diff that will arrive in chunks.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("begin_diff_upload", "write", {}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    upload_id = str(uuid.uuid4())
+    governor.uploads.set(upload_id, DiffUpload(upload_id, _owner_hash(owner_id), governor.config.max_diff_upload_bytes))
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Started diff upload {upload_id}",
+        data={"upload_id": upload_id, "max_bytes": governor.config.max_diff_upload_bytes, "next_seq": 0},
+        meta=governor.get_meta(decision.audit_id, "begin_diff_upload", "write", duration, run_id=run_id, owner_id=owner_id)
+    )
+
+
+def append_diff_chunk(governor: Governor, upload_id: str, seq: int, chunk: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Appends one chunk; `seq` must be the next expected chunk number.
+    """
+    start_time = time.time()
+    data = chunk.encode("utf-8")
+    decision = governor.validate_action("append_diff_chunk", "write", {"upload_id": upload_id, "seq": seq, "chunk_size": len(data)}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    upload = lookup_upload(governor, upload_id, owner_id, committed=False)
+    if upload is None:
+        return upload_not_found(governor, decision.audit_id, "append_diff_chunk", upload_id, start_time, run_id, owner_id)
+
+    if upload.size + len(data) > upload.max_bytes:
+        governor.uploads.delete(upload_id)
+        violation = {"key": "UPLOAD_EXCEEDS_MAX_BYTES", "details": {"size": upload.size + len(data), "max_size": upload.max_bytes}, "config_path": f"profiles.{governor.config.profile}.max_diff_upload_bytes"}
+        # Recorded on the audit entry so explain_policy_decision can report it.
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000), "decision": "blocked", "code": "blocked", "violation": violation})
+        return ToolResponse.blocked(
+            "Diff upload too large",
+            violation,
+            meta=governor.get_meta(decision.audit_id, "append_diff_chunk", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    try:
+        upload.append(seq, data)
+    except UploadError as e:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            str(e),
+            code="invalid_input",
+            details={"key": "UPLOAD_SEQUENCE_MISMATCH", "details": {"upload_id": upload_id, "expected_seq": upload.chunks, "seq": seq}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "append_diff_chunk", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Appended chunk {seq} to upload {upload_id}",
+        data={"upload_id": upload_id, "size_bytes": upload.size, "next_seq": upload.chunks},
+        meta=governor.get_meta(decision.audit_id, "append_diff_chunk", "write", duration, run_id=run_id, owner_id=owner_id)
+    )
+
+
+def commit_diff_upload(governor: Governor, upload_id: str, sha256: Optional[str] = None, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Seals the spool. The returned `diff_handle` can be passed to validate_patch,
+    apply_patch and create_change_bundle instead of `diff_text`.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("commit_diff_upload", "write", {"upload_id": upload_id, "sha256": sha256}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    upload = lookup_upload(governor, upload_id, owner_id, committed=False)
+    if upload is None:
+        return upload_not_found(governor, decision.audit_id, "commit_diff_upload", upload_id, start_time, run_id, owner_id)
+
+    digest = upload.commit()
+    if sha256 is not None and sha256.lower() != digest:
+        governor.uploads.delete(upload_id)
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Upload digest mismatch",
+            code="invalid_input",
+            details={"key": "UPLOAD_DIGEST_MISMATCH", "details": {"upload_id": upload_id, "expected": sha256, "actual": digest}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "commit_diff_upload", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Committed diff upload {upload_id}",
+        data={"diff_handle": upload_id, "sha256": digest, "size_bytes": upload.size, "chunks": upload.chunks},
+        meta=governor.get_meta(decision.audit_id, "commit_diff_upload", "write", duration, run_id=run_id, owner_id=owner_id)
+    )
@@ -18,8 +18,8 @@ def explain_policy_decision(governor: Governor, audit_id: str, owner_id: Optiona
             return decision_obj.block_response
         return ToolResponse.error("Action blocked", code="blocked")
 
-    # Search for the audit_id
-    log_entry = governor.audit_logs.get(audit_id)
+    # Search for the audit_id (hot store, then the on-disk journal)
+    log_entry = governor.get_audit(audit_id)
     
     if not log_entry:
         return ToolResponse.error("Audit log not found", code="not_found", meta=governor.get_meta(decision_obj.audit_id, "explain_policy_decision", "read", int((time.time() - start_time) * 1000)))
@@ -70,6 +70,24 @@ def explain_policy_decision(governor: Governor, audit_id: str, owner_id: Optiona
         elif violation_key == "BUNDLE_NOT_FOUND":
             explanation["evidence"] = "The specified bundle was not found or ownership mismatched."
             explanation["compliant_alternative"] = "Ensure the bundle_id is correct and belongs to the provided owner_id."
+        elif violation_key == "UPLOAD_EXCEEDS_MAX_BYTES":
+            explanation["evidence"] = "The chunked diff upload grew past the maximum allowed size and was discarded."
+            explanation["compliant_alternative"] = "Split the change into smaller bundles or increase max_diff_upload_bytes."
+        elif violation_key == "TASK_QUEUE_FULL":
+            explanation["evidence"] = "The background worker pool already has the maximum number of queued and running tasks."
+            explanation["compliant_alternative"] = "Poll or cancel existing tasks before starting another, or increase max_background_tasks."
+        elif violation_key == "CHANGED_FILES_EXCEED_MAX_ARGS":
+            explanation["evidence"] = "The {changed_files} argument would expand to more files than the task allows."
+            explanation["compliant_alternative"] = "Run the task on a smaller change, use the task's whole-workspace variant, or raise task_options.<task>.max_changed_files."
+        elif violation_key == "RATE_LIMITED":
+            details = violation.get("details") or {}
+            scope = "owner" if details.get("scope") == "per_owner" else "run"
+            if details.get("limit") == "calls_per_minute":
+                explanation["evidence"] = f"The {scope} made calls faster than the configured rate of {details.get('value')} per minute."
+                explanation["compliant_alternative"] = f"Retry after {details.get('retry_after_seconds')} seconds, space calls out, or raise rate_limits.{details.get('scope')}.calls_per_minute / burst."
+            else:
+                explanation["evidence"] = f"The {scope} used up its {details.get('limit')} quota ({details.get('used')} of {details.get('value')})."
+                explanation["compliant_alternative"] = f"Start a new run if the quota is per run, or raise rate_limits.{details.get('scope')}.{details.get('limit')}."
         else:
             explanation["evidence"] = "The action violated the workspace security policy."
             explanation["compliant_alternative"] = "Review the policy configuration to ensure this action is permitted."
@@ -0,0 +1,74 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+from ..audit_index import parse_timestamp
+from ..governor import Governor
+from ..response_schema import ToolResponse
+
+DEFAULT_QUERY_LIMIT = 50
+MAX_QUERY_LIMIT = 500
+
+
+def query_audit(
+    governor: Governor,
+    run_id: Optional[str] = None,
+    tool: Optional[str] = None,
+    decision: Optional[str] = None,
+    code: Optional[str] = None,
+    violation_key: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+    owner_id: Optional[str] = None,
+) -> ToolResponse:
+    """
+    Lists audit entries matching every given filter, oldest first, one page at a
+    time. Results are scoped to the caller: entries recorded with the same
+    owner_id, or only owner-less entries when no owner_id is given. `since` and
+    `until` are ISO 8601 timestamps (inclusive); pass the returned next_cursor
+    to continue.
+    """
+    start_time = time.time()
+
+    # Like explain_policy_decision, reading the audit trail does not add to it;
+    # run_id here is a filter, not the caller's run context.
+    decision_obj = governor.validate_action("query_audit", "read", {"run_id": run_id, "tool": tool}, skip_audit=True)
+    if not decision_obj.allowed:
+        if decision_obj.block_response:
+            decision_obj.block_response.meta["duration_ms"] = int((time.time() - start_time) * 1000)
+            return decision_obj.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    def invalid(message: str) -> ToolResponse:
+        return ToolResponse.error(message, code="invalid_input", meta=governor.get_meta(decision_obj.audit_id, "query_audit", "read", int((time.time() - start_time) * 1000), owner_id=owner_id))
+
+    try:
+        since_ts = parse_timestamp(since) if since else None
+        until_ts = parse_timestamp(until) if until else None
+    except ValueError:
+        return invalid("since/until must be ISO 8601 timestamps")
+    try:
+        after = int(cursor) if cursor else -1
+    except ValueError:
+        return invalid("Invalid cursor")
+    if after < -1:
+        return invalid("Invalid cursor")
+
+    filters: Dict[str, Any] = {"owner": hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None}
+    for name, value in (("run_id", run_id), ("tool", tool), ("decision", decision), ("code", code), ("violation_key", violation_key)):
+        if value is not None:
+            filters[name] = value
+
+    governor.flush_audit()
+    rows, next_seq = governor.audit_index.query(filters, since=since_ts, until=until_ts, after=after, limit=max(1, min(limit, MAX_QUERY_LIMIT)))
+
+    duration = int((time.time() - start_time) * 1000)
+    return ToolResponse.success(
+        summary=f"Found {len(rows)} audit entries" + (" (more available)" if next_seq is not None else ""),
+        data={
+            "entries": rows,
+            "next_cursor": str(next_seq) if next_seq is not None else None,
+        },
+        meta=governor.get_meta(decision_obj.audit_id, "query_audit", "read", duration, owner_id=owner_id)
+    )
@@ -2,7 +2,7 @@ import time
 from typing import Optional
 from ..governor import Governor
 from ..response_schema import ToolResponse
-from ..path_safety import resolve_path, validate_path, PathSafetyError
+from ..path_safety import resolve_path, check_path, PathSafetyError
 
 def read_file(
     governor: Governor,
@@ -30,7 +30,7 @@ def read_file(
     try:
         # Path Safety
         safe_path = resolve_path(governor.root, path)
-        validate_path(safe_path, governor.root, governor.config.deny_globs, governor.config.allow_paths)
+        check_path(safe_path, governor.root, governor.policy)
 
         # Size Check
         stats = safe_path.stat()
@@ -62,6 +62,7 @@ def read_file(
         end = end_line if end_line and end_line <= total_lines else total_lines
 
         content = "".join(lines[start:end])
+        governor.charge_usage(run_id, owner_id, bytes_read=stats.st_size)
 
         duration_ms = int((time.time() - start_time) * 1000)
         governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
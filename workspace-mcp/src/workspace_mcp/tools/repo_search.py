@@ -1,10 +1,10 @@
-import fnmatch
 import os
 import time
 import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from ..compiled_policy import compile_globs
 from ..governor import Governor
 from ..response_schema import ToolResponse
 
@@ -19,6 +19,8 @@ def repo_search(
 ) -> ToolResponse:
     """
     Search for text in workspace files using ripgrep when available.
+    ripgrep's output, or the bytes of every file the fallback scanned, count
+    toward the max_bytes_read quota.
     """
     start_time = time.time()
     decision = governor.validate_action(
@@ -41,8 +43,10 @@ def repo_search(
         return ToolResponse.blocked("Invalid query", {"key": "INVALID_QUERY", "details": {"reason": "query must be non-empty"}, "config_path": ""}, meta=governor.get_meta(decision.audit_id, "repo_search", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
 
     bounded_limit = max(1, min(limit, 200))
-    rg_results = _search_with_rg(governor, query, file_globs, bounded_limit)
-    if rg_results is not None:
+    rg_search = _search_with_rg(governor, query, file_globs, bounded_limit)
+    if rg_search is not None:
+        rg_results, output_bytes = rg_search
+        governor.charge_usage(run_id, owner_id, bytes_read=output_bytes)
         duration_ms = int((time.time() - start_time) * 1000)
         governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
         return ToolResponse.success(
@@ -51,7 +55,8 @@ def repo_search(
             meta=governor.get_meta(decision.audit_id, "repo_search", "read", duration_ms, run_id=run_id, owner_id=owner_id)
         )
 
-    py_results = _search_with_python(governor, query, file_globs, bounded_limit)
+    py_results, scanned_bytes = _search_with_python(governor, query, file_globs, bounded_limit)
+    governor.charge_usage(run_id, owner_id, bytes_read=scanned_bytes)
     duration_ms = int((time.time() - start_time) * 1000)
     governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
     return ToolResponse.success(
@@ -66,7 +71,10 @@ def _search_with_rg(
     query: str,
     file_globs: Optional[List[str]],
     limit: int,
-) -> Optional[List[str]]:
+) -> Optional[Tuple[List[str], int]]:
+    """
+    Matches and the size of ripgrep's output, or None when rg is not installed.
+    """
     try:
         subprocess.run(["rg", "--version"], capture_output=True, check=True, text=True)
     except (FileNotFoundError, subprocess.CalledProcessError):
@@ -96,13 +104,13 @@ def _search_with_rg(
             timeout=min(10, governor.config.max_runtime_seconds),
         )
     except subprocess.TimeoutExpired:
-        return ["[search timed out]"]
+        return ["[search timed out]"], 0
 
     if proc.returncode not in (0, 1):
-        return [f"[ripgrep error] {proc.stderr.strip()}"]
+        return [f"[ripgrep error] {proc.stderr.strip()}"], 0
 
     results = [line for line in proc.stdout.splitlines() if line.strip()]
-    return results[:limit]
+    return results[:limit], len(proc.stdout.encode("utf-8"))
 
 
 def _search_with_python(
@@ -110,31 +118,37 @@ def _search_with_python(
     query: str,
     file_globs: Optional[List[str]],
     limit: int,
-) -> List[str]:
+) -> Tuple[List[str], int]:
+    """
+    Matches and the total size of the files opened to find them.
+    """
     matches: List[str] = []
-    globs = file_globs or ["*"]
+    scanned = 0
+    include = compile_globs(file_globs or ["*"])
 
     for dirpath, _, filenames in os.walk(governor.root):
         for file_name in filenames:
             if len(matches) >= limit:
-                return matches
+                return matches, scanned
             rel_path = str(Path(dirpath, file_name).resolve().relative_to(governor.root)).replace("\\", "/")
 
-            if any(fnmatch.fnmatch(rel_path, pattern) for pattern in governor.config.deny_globs):
+            if governor.policy.is_denied(rel_path):
                 continue
-            if not any(fnmatch.fnmatch(rel_path, pattern) for pattern in globs):
+            if include is None or not include.match(rel_path):
                 continue
 
             full_path = Path(governor.root, rel_path)
             try:
-                if full_path.stat().st_size > governor.config.max_file_bytes:
+                size = full_path.stat().st_size
+                if size > governor.config.max_file_bytes:
                     continue
                 with full_path.open("r", encoding="utf-8", errors="replace") as handle:
+                    scanned += size
                     for line_number, line in enumerate(handle, start=1):
                         if query in line:
                             matches.append(f"{rel_path}:{line_number}:{line.rstrip()}")
                             if len(matches) >= limit:
-                                return matches
+                                return matches, scanned
             except OSError:
                 continue
-    return matches
+    return matches, scanned
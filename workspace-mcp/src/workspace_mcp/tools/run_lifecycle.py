@@ -4,6 +4,10 @@ import hashlib
 from typing import Dict, Any, Optional
 from ..governor import Governor
 from ..response_schema import ToolResponse
+from ..run_record import RunRecord
+
+MAX_SEQUENCE_PAGE = 1000
+MAX_SUMMARY_CHANGED_FILES = 200
 
 def start_run(governor: Governor, metadata: Optional[Dict[str, Any]] = None, owner_id: Optional[str] = None) -> ToolResponse:
     start_time = time.time()
@@ -30,20 +34,7 @@ def start_run(governor: Governor, metadata: Optional[Dict[str, Any]] = None, own
     run_id = str(uuid.uuid4())
     owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
     
-    run_data = {
-        "run_id": run_id,
-        "owner_hash": owner_hash,
-        "metadata": metadata or {},
-        "start_time": start_time,
-        "end_time": None,
-        "status": "active",
-        "tool_sequence": [],
-        "risk_distribution": {},
-        "allowed_count": 0,
-        "blocked_count": 0,
-    }
-    
-    governor.runs.set(run_id, run_data)
+    governor.runs.set(run_id, RunRecord(run_id, owner_hash, metadata or {}, start_time))
     
     duration = int((time.time() - start_time) * 1000)
     meta = governor.get_meta(audit_id, "start_run", "write", duration, run_id=run_id, owner_id=owner_id)
@@ -113,7 +104,7 @@ def end_run(governor: Governor, run_id: str, owner_id: Optional[str] = None) ->
         )
         
     owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
-    if run.get("owner_hash") != owner_hash:
+    if run.owner_hash != owner_hash:
         duration = int((time.time() - start_time) * 1000)
         governor._log_audit(
             audit_id=audit_id,
@@ -133,7 +124,7 @@ def end_run(governor: Governor, run_id: str, owner_id: Optional[str] = None) ->
             meta=governor.get_meta(audit_id, "end_run", "write", duration)
         )
         
-    if run.get("status") == "ended":
+    if run.status == "ended":
         duration = int((time.time() - start_time) * 1000)
         governor._log_audit(
             audit_id=audit_id,
@@ -154,8 +145,9 @@ def end_run(governor: Governor, run_id: str, owner_id: Optional[str] = None) ->
             meta=governor.get_meta(audit_id, "end_run", "write", duration)
         )
         
-    run["end_time"] = time.time()
-    run["status"] = "ended"
+    with governor.run_lock(run_id):
+        run.end_time = time.time()
+        run.status = "ended"
     governor.runs.set(run_id, run) # Update last_seen_at
         
     duration = int((time.time() - start_time) * 1000)
@@ -178,11 +170,17 @@ def end_run(governor: Governor, run_id: str, owner_id: Optional[str] = None) ->
     
     return ToolResponse.success(
         summary=f"Ended run {run_id}",
-        data={"run_id": run_id, "duration_seconds": round(run["end_time"] - run["start_time"], 2)},
+        data={"run_id": run_id, "duration_seconds": round(run.end_time - run.start_time, 2)},
         meta=meta
     )
 
-def get_run_summary(governor: Governor, run_id: str, owner_id: Optional[str] = None) -> ToolResponse:
+def get_run_summary(governor: Governor, run_id: str, owner_id: Optional[str] = None, cursor: int = 0, limit: int = 200, rle: bool = False) -> ToolResponse:
+    """
+    Run aggregates plus one page of the tool sequence: calls [cursor, cursor + limit),
+    as names or, with rle, as [tool, repeats] pairs. Follow tool_sequence_next_cursor
+    for the rest. limit is clamped to 1..MAX_SEQUENCE_PAGE, and changed_files lists at
+    most MAX_SUMMARY_CHANGED_FILES paths (changed_files_count has the total).
+    """
     start_time = time.time()
     
     audit_id = str(uuid.uuid4())
@@ -226,7 +224,7 @@ def get_run_summary(governor: Governor, run_id: str, owner_id: Optional[str] = N
         )
         
     owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest()
-    if run.get("owner_hash") != owner_hash:
+    if run.owner_hash != owner_hash:
         duration = int((time.time() - start_time) * 1000)
         governor._log_audit(
             audit_id=audit_id,
@@ -246,22 +244,32 @@ def get_run_summary(governor: Governor, run_id: str, owner_id: Optional[str] = N
             meta=governor.get_meta(audit_id, "get_run_summary", "read", duration)
         )
         
-    duration_s = None
-    if run.get("end_time") is not None:
-        duration_s = run["end_time"] - run["start_time"]
-    else:
-        duration_s = time.time() - run["start_time"]
-        
-    summary_data = {
-        "run_id": run["run_id"],
-        "metadata": run["metadata"],
-        "tool_sequence": run["tool_sequence"],
-        "risk_distribution": run["risk_distribution"],
-        "allowed_count": run["allowed_count"],
-        "blocked_count": run["blocked_count"],
-        "status": run["status"],
-        "duration_seconds": round(duration_s, 2) if duration_s is not None else None
-    }
+    cursor = max(0, cursor)
+    limit = min(max(1, limit), MAX_SEQUENCE_PAGE)
+    with governor.run_lock(run_id):
+        duration_s = None
+        if run.end_time is not None:
+            duration_s = run.end_time - run.start_time
+        else:
+            duration_s = time.time() - run.start_time
+
+        total = run.call_count
+        end = min(total, cursor + limit)
+        summary_data = {
+            "run_id": run.run_id,
+            "metadata": run.metadata,
+            "tool_sequence": [list(pair) for pair in run.tool_sequence_rle(cursor, limit)] if rle else run.tool_sequence(cursor, limit),
+            "tool_sequence_length": total,
+            "tool_sequence_next_cursor": end if end < total else None,
+            "tool_counts": run.tool_counts(),
+            "risk_distribution": dict(run.risk_distribution),
+            "allowed_count": run.allowed_count,
+            "blocked_count": run.blocked_count,
+            "changed_files": run.changed_files[:MAX_SUMMARY_CHANGED_FILES],
+            "changed_files_count": len(run.changed_files),
+            "status": run.status,
+            "duration_seconds": round(duration_s, 2) if duration_s is not None else None
+        }
     
     duration = int((time.time() - start_time) * 1000)
     meta = governor.get_meta(audit_id, "get_run_summary", "read", duration, run_id=run_id, owner_id=owner_id)
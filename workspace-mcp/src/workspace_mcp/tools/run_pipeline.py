@@ -0,0 +1,63 @@
+import time
+from typing import Any, Dict, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse
+from ..pipelines import pipeline_order, run_graph, task_dependencies
+from .run_task import run_task
+
+
+def run_pipeline(governor: Governor, target: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Runs `target` and its declared task dependencies (task_options.<task>.depends_on)
+    with bounded parallelism. Each node goes through run_task, so it is validated,
+    audited and cached like a direct call.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("run_pipeline", "execute", {"task_name": target}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    deps = task_dependencies(governor.config.task_options)
+    order = pipeline_order(deps, target)
+
+    def run_node(task_name: str) -> Dict[str, Any]:
+        res = run_task(governor, task_name, run_id=run_id, owner_id=owner_id)
+        exit_code = res.data.get("exit_code")
+        record: Dict[str, Any] = {
+            # A skipped task (nothing to run) has no exit code but does not fail the pipeline.
+            "status": "succeeded" if res.status == "ok" and (exit_code == 0 or res.data.get("skipped")) else "failed",
+            "exit_code": exit_code,
+            "code": res.code,
+            "summary": res.summary,
+            "audit_id": res.meta.get("audit_id"),
+        }
+        for key in ("cached", "report"):
+            if key in res.data:
+                record[key] = res.data[key]
+        return record
+
+    nodes = run_graph(order, deps, run_node, governor.config.max_pipeline_parallelism)
+    failed = [name for name in order if nodes[name]["status"] == "failed"]
+    skipped = [name for name in order if nodes[name]["status"] == "skipped"]
+    status = "succeeded" if not failed and not skipped else "failed"
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"Pipeline '{target}' {status}: {len(order) - len(failed) - len(skipped)}/{len(order)} tasks succeeded",
+        data={
+            "target": target,
+            "status": status,
+            "order": order,
+            "failed": failed,
+            "skipped": skipped,
+            "nodes": nodes,
+            "duration_seconds": round(duration / 1000, 2),
+        },
+        meta=governor.get_meta(decision.audit_id, "run_pipeline", "execute", duration, run_id=run_id, owner_id=owner_id)
+    )
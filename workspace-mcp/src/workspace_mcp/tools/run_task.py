@@ -1,17 +1,164 @@
+import hashlib
 import subprocess
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from ..governor import Governor
 from ..response_schema import ToolResponse
+from ..task_runner import OutputCallback, run_command
+from ..task_cache import cache_key, input_fingerprint
+from ..task_parsers import collect_report, prepare_report_file
+from ..task_args import DEFAULT_MAX_CHANGED_FILES, ChangedFilesError, expand_changed_files, select_changed_files, uses_changed_files, within_inputs
+from ..path_safety import PathSafetyError
+from ..task_output import TaskOutputArtifact
+from ..task_diff import record_and_diff
 
-def run_task(governor: Governor, task_name: str, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+
+def changed_files_for(governor: Governor, run_id: Optional[str], owner_id: Optional[str], bundle_id: Optional[str]) -> List[str]:
+    """
+    Changed files of a bundle (owner-scoped like bundle_report) or, without one,
+    of the run's applied patches. Raises ChangedFilesError when neither exists.
+    """
+    if bundle_id:
+        bundle = governor.bundles.get(bundle_id)
+        if bundle is None or (owner_id and bundle.get("owner_hash") != hashlib.sha256(owner_id.encode("utf-8")).hexdigest()):
+            raise ChangedFilesError("Bundle not found", "BUNDLE_NOT_FOUND", {"bundle_id": bundle_id}, code="not_found")
+        return list(bundle["target_files"])
+    run = governor.runs.get(run_id) if run_id else None
+    if run is None:
+        raise ChangedFilesError("Changed files need a bundle_id or an active run_id", "RUN_NOT_FOUND", {"run_id": run_id})
+    with governor.run_lock(run.run_id):
+        return list(run.changed_files)
+
+
+def expand_task_command(
+    governor: Governor,
+    task_name: str,
+    command: List[str],
+    run_id: Optional[str],
+    owner_id: Optional[str],
+    bundle_id: Optional[str] = None,
+    changed_only: bool = False,
+) -> Tuple[List[str], Optional[List[str]], Optional[List[str]]]:
+    """
+    Applies changed_only test selection and {changed_files} expansion to an
+    allowlisted argv. Returns (argv, selected_tests, changed_files), where the
+    lists are None when the corresponding mode is not in use. Selected tests are
+    limited to the task's `inputs` globs. changed_only falls back to the full task
+    (selected_tests None) when a changed file is not a source file the import
+    graph tracks.
+    Raises ChangedFilesError or PathSafetyError.
+    """
+    options = governor.config.task_options.get(task_name, {})
+    selected_tests: Optional[List[str]] = None
+    selected_files: Optional[List[str]] = None
+    if changed_only and not options.get("changed_only"):
+        raise ChangedFilesError(
+            f"Task '{task_name}' does not support changed_only",
+            "CHANGED_ONLY_NOT_SUPPORTED",
+            {"task_name": task_name},
+            f"profiles.{governor.config.profile}.task_options.{task_name}.changed_only",
+        )
+    if not changed_only and not uses_changed_files(command):
+        return list(command), None, None
+
+    changed = changed_files_for(governor, run_id, owner_id, bundle_id)
+    affected = governor.import_graph.select_tests(changed) if changed_only else None
+    if affected is not None:
+        # The graph also covers TS/JS; a task only gets the test files its inputs name.
+        selected_tests = within_inputs(affected, options.get("inputs"))
+        command = list(command) + selected_tests
+    if uses_changed_files(command):
+        selected_files = select_changed_files(changed, governor.root, governor.policy, options.get("inputs"))
+        max_files = options.get("max_changed_files", DEFAULT_MAX_CHANGED_FILES)
+        if len(selected_files) > max_files:
+            raise ChangedFilesError(
+                f"{len(selected_files)} changed files exceed the task's limit of {max_files}",
+                "CHANGED_FILES_EXCEED_MAX_ARGS",
+                {"task_name": task_name, "changed_files": len(selected_files), "max_changed_files": max_files},
+                f"profiles.{governor.config.profile}.task_options.{task_name}.max_changed_files",
+                code="blocked",
+                blocked=True,
+            )
+        command = expand_changed_files(command, selected_files)
+    return list(command), selected_tests, selected_files
+
+
+def changed_files_error(governor: Governor, error: Exception, audit_id: str, tool: str, start_time: float, run_id: Optional[str], owner_id: Optional[str]) -> ToolResponse:
+    """
+    Response for expand_task_command failures. Path and argument-limit violations
+    are policy blocks and are recorded as such in the audit entry.
+    """
+    duration_ms = int((time.time() - start_time) * 1000)
+    meta = governor.get_meta(audit_id, tool, "execute", duration_ms, run_id=run_id, owner_id=owner_id)
+    if isinstance(error, PathSafetyError):
+        violation = {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"error": str(error)}, "config_path": ""}
+        governor.update_audit(audit_id, {"duration_ms": duration_ms, "decision": "blocked", "code": "blocked", "violation": violation})
+        return ToolResponse.blocked("Changed file failed path checks", violation, meta=meta)
+    assert isinstance(error, ChangedFilesError)
+    if error.blocked:
+        governor.update_audit(audit_id, {"duration_ms": duration_ms, "decision": "blocked", "code": "blocked", "violation": error.violation})
+        return ToolResponse.blocked(str(error), error.violation, meta=meta)
+    governor.update_audit(audit_id, {"duration_ms": duration_ms})
+    return ToolResponse.error(str(error), code=error.code, details=error.violation, meta=meta)
+
+
+def _keep_artifact(governor: Governor, artifact: TaskOutputArtifact) -> Dict[str, Any]:
+    artifact.close()
+    governor.task_outputs.set(artifact.audit_id, artifact)
+    return artifact.describe()
+
+
+def _apply_diff(governor: Governor, run_id: Optional[str], task_name: str, command: List[str], audit_id: str, data: Dict[str, Any], diff_previous: bool, keep_output: bool = False) -> bool:
+    """
+    Records the result in the run and, with diff_previous, replaces the raw output
+    by the difference to the previous run of the task. When the previous run used
+    a different expanded command, the diff is flagged not comparable and the output
+    is kept. `keep_output` adds the diff but keeps the output too, for results with
+    no output artifact to fall back on (cache hits). Returns True if output was
+    left out of the response.
+    """
+    run = governor.runs.get(run_id) if run_id else None
+    if run is None:
+        return False
+    with governor.run_lock(run.run_id):
+        diff = record_and_diff(run, task_name, audit_id, data, command)
+    if not diff_previous or diff is None:
+        return False
+    data["diff"] = diff
+    if not diff["comparable"] or keep_output:
+        return False
+    data["stdout"] = ""
+    data["stderr"] = ""
+    if "report" in data:
+        data["report"] = {k: v for k, v in data["report"].items() if k != "failures"}
+    data["output_omitted"] = True
+    return True
+
+
+def run_task(governor: Governor, task_name: str, run_id: Optional[str] = None, owner_id: Optional[str] = None, on_output: Optional[OutputCallback] = None, use_cache: bool = True, changed_only: bool = False, bundle_id: Optional[str] = None, diff_previous: bool = False) -> ToolResponse:
     """
     Executes a pre-defined task from the policy.
+
+    `on_output` receives batches of (stream, line) pairs while the task runs;
+    the final response still carries the truncated stdout/stderr.
+    Tasks that declare `inputs` in task_options are cached by input fingerprint.
+    With `changed_only`, tasks that opt in (task_options.changed_only) receive only
+    the test files affected by the changed files as extra arguments, and a
+    `{changed_files}` argv element expands to the changed files themselves. Changed
+    files come from `bundle_id` when given, otherwise from the run's applied patches.
+    Within a run, `diff_previous` returns new/resolved failures and a summary diff
+    against the task's previous result instead of the raw output (still readable
+    through read_task_output). Cached results keep their output alongside the diff.
     """
     start_time = time.time()
     
     # 1. Governor Validation (Creates Audit Log internally)
-    decision = governor.validate_action("run_task", "execute", {"task_name": task_name}, run_id=run_id, owner_id=owner_id)
+    args: Dict[str, Any] = {"task_name": task_name}
+    if changed_only:
+        args["changed_only"] = True
+    if bundle_id:
+        args["bundle_id"] = bundle_id
+    decision = governor.validate_action("run_task", "execute", args, run_id=run_id, owner_id=owner_id)
     if not decision.allowed:
         if decision.block_response:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -25,77 +172,133 @@ def run_task(governor: Governor, task_name: str, run_id: Optional[str] = None, o
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.blocked("Task not found", {"key": "TASK_NOT_ALLOWLISTED", "details": {"task_name": task_name, "allowed": list(governor.config.allow_tasks.keys())}, "config_path": f"profiles.{governor.config.profile}.allow_tasks"}, meta=governor.get_meta(decision.audit_id, "run_task", "execute", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
 
+    options = governor.config.task_options.get(task_name, {})
     try:
-        # 2. Secure Tool Execution
-        proc = subprocess.run(
-            command,
+        command, selected_tests, selected_files = expand_task_command(governor, task_name, command, run_id, owner_id, bundle_id, changed_only)
+    except (ChangedFilesError, PathSafetyError) as e:
+        return changed_files_error(governor, e, decision.audit_id, "run_task", start_time, run_id, owner_id)
+
+    # changed_only ran the whole task because a changed file is invisible to the import graph.
+    full_run_fallback = changed_only and selected_tests is None
+
+    if selected_tests == [] or selected_files == []:
+        # Nothing ran, so there is no exit code; 0 would read as a passing run.
+        duration_ms = int((time.time() - start_time) * 1000)
+        governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+        data: Dict[str, Any] = {"exit_code": None, "stdout": "", "stderr": "", "duration_seconds": 0.0, "skipped": True}
+        if selected_tests is not None:
+            data["selected_tests"] = selected_tests
+        if selected_files is not None:
+            data["changed_files"] = selected_files
+        return ToolResponse.success(
+            summary=f"Task '{task_name}' skipped: nothing affected by the changed files",
+            data=data,
+            meta=governor.get_meta(decision.audit_id, "run_task", "execute", duration_ms, run_id=run_id, owner_id=owner_id)
+        )
+
+    # Result cache: same argv, same policy and unchanged input files -> same result.
+    key: Optional[str] = None
+    inputs = options.get("inputs")
+    if inputs and governor.task_cache.enabled:
+        fingerprint = input_fingerprint(governor.root, inputs, governor.config.deny_globs, governor.file_digests)
+        key = cache_key(command, governor.config_hash, fingerprint)
+        cached = governor.task_cache.get(key) if use_cache else None
+        if cached is not None:
+            cached_data, cached_truncated = cached
+            cached_data["cached"] = True
+            if full_run_fallback:
+                cached_data["changed_only_fallback"] = True
+            # Nothing of this call is on disk for read_task_output, so the output stays.
+            _apply_diff(governor, run_id, task_name, command, decision.audit_id, cached_data, diff_previous, keep_output=True)
+            duration_ms = int((time.time() - start_time) * 1000)
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return ToolResponse.success(
+                summary=f"Task '{task_name}' finished with code {cached_data['exit_code']} (cached)",
+                data=cached_data,
+                meta=governor.get_meta(decision.audit_id, "run_task", "execute", duration_ms, output_truncated=cached_truncated, run_id=run_id, owner_id=owner_id)
+            )
+
+    parser_name = options.get("parser")
+    argv, report_path = prepare_report_file(command) if parser_name else (list(command), None)
+    artifact: Optional[TaskOutputArtifact] = None
+    if governor.config.max_task_output_bytes > 0:
+        owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+        artifact = TaskOutputArtifact(decision.audit_id, task_name, owner_hash, run_id, governor.config.max_task_output_bytes)
+    try:
+        # 2. Secure Tool Execution (output is read incrementally and capped per stream)
+        result = run_command(
+            argv,
             cwd=governor.root,
-            capture_output=True,
-            text=True,
-            shell=False,
             timeout=governor.config.max_runtime_seconds,
-            env={"PATH": "/usr/bin:/bin:/usr/local/bin", "LANG": "C.UTF-8"},
+            max_output_bytes=governor.config.max_output_bytes,
+            on_output=on_output,
+            limits=options.get("limits"),
+            spawn=governor.warm_pool.spawner(options.get("preload")),
+            sink=artifact.write if artifact is not None else None,
         )
-
+        stdout = result.stdout
+        output_truncated = result.output_truncated
+        if result.rusage is not None:
+            governor.charge_usage(run_id, owner_id, task_cpu_seconds=result.rusage.cpu_seconds)
         duration = time.time() - start_time
 
-        # 3. Output Truncation
-        max_bytes = governor.config.max_output_bytes
-        stdout_raw = proc.stdout.encode("utf-8", errors="replace")
-        stderr_raw = proc.stderr.encode("utf-8", errors="replace")
-        
-        output_truncated = False
-        
-        stdout = stdout_raw[:max_bytes].decode("utf-8", errors="replace")
-        stderr = stderr_raw[:max_bytes].decode("utf-8", errors="replace")
-
-        if len(stdout_raw) > max_bytes:
-            stdout += "\n... [TRUNCATED]"
-            output_truncated = True
-        if len(stderr_raw) > max_bytes:
-            stderr += "\n... [TRUNCATED]"
-            output_truncated = True
-
         data = {
-            "exit_code": proc.returncode,
+            "exit_code": result.exit_code,
             "stdout": stdout,
-            "stderr": stderr,
-            "duration_seconds": round(duration, 2)
+            "stderr": result.stderr,
+            "duration_seconds": round(duration, 2),
+            "output_stats": result.output_stats(),
+            "rusage": result.rusage.as_dict() if result.rusage else None,
+            "warm_start": result.warm_start,
         }
+        if selected_tests is not None:
+            data["selected_tests"] = selected_tests
+        if selected_files is not None:
+            data["changed_files"] = selected_files
+        if full_run_fallback:
+            data["changed_only_fallback"] = True
         
-        # 4. Structured Output Parsing
-        if task_name == "pytest":
-            try:
-                # Basic parsing for pytest
-                summary_line = [line for line in stdout.splitlines() if "==" in line and ("passed" in line or "failed" in line)]
-                if summary_line:
-                    data["pytest_summary"] = summary_line[-1].strip()
-            except Exception:
-                pass
-        elif task_name == "ruff":
-            try:
-                # Basic parsing for ruff
-                violations = [line for line in stdout.splitlines() if ".py:" in line]
-                data["ruff_violations_count"] = len(violations)
-            except Exception:
-                pass
-
-        # 5. Safe Meta Creation
+        # 3. Structured Output Parsing (opt-in per task via task_options.parser)
+        if parser_name:
+            data["report"] = collect_report(parser_name, report_path, stdout, governor.root)
+
+        if key is not None:
+            governor.task_cache.put(key, data, output_truncated)
+            data["cached"] = False
+
+        omitted = _apply_diff(governor, run_id, task_name, command, decision.audit_id, data, diff_previous)
+
+        # The full output only needs keeping when the response dropped some of it.
+        if artifact is not None and (output_truncated or omitted):
+            data["output_artifact"] = _keep_artifact(governor, artifact)
+            artifact = None
+
+        # 4. Safe Meta Creation
         duration_ms = int(duration * 1000)
         governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
         return ToolResponse.success(
-            summary=f"Task '{task_name}' finished with code {proc.returncode}",
+            summary=f"Task '{task_name}' finished with code {result.exit_code}",
             data=data,
             meta=governor.get_meta(decision.audit_id, "run_task", "execute", duration_ms, output_truncated=output_truncated, run_id=run_id, owner_id=owner_id)
         )
 
     except subprocess.TimeoutExpired:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        details: Dict[str, Any] = {}
+        if artifact is not None:
+            details["output_artifact"] = _keep_artifact(governor, artifact)
+            artifact = None
         return ToolResponse.error(
             f"Task '{task_name}' timed out after {governor.config.max_runtime_seconds}s",
             code="timeout",
+            details=details,
             meta=governor.get_meta(decision.audit_id, "run_task", "execute", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
         )
     except Exception as e:
         governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
         return ToolResponse.error(f"Execution failed: {str(e)}", code="tool_failed", meta=governor.get_meta(decision.audit_id, "run_task", "execute", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+    finally:
+        if report_path is not None:
+            report_path.unlink(missing_ok=True)
+        if artifact is not None:
+            artifact.discard()
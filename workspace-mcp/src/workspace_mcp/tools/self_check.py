@@ -42,7 +42,7 @@ def self_check(governor: Governor, run_id: Optional[str] = None, owner_id: Optio
         err("policy_loaded", str(exc))
 
     try:
-        for attr in ("runs", "bundles", "audit_logs"):
+        for attr in ("runs", "bundles", "uploads", "tasks", "task_outputs", "audit_logs"):
             store = getattr(governor, attr, None)
             if store is None:
                 raise ValueError(f"Missing {attr}")
@@ -0,0 +1,130 @@
+import time
+import difflib
+import hashlib
+from typing import Any, Dict, List, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse
+from ..path_safety import resolve_path, check_path, PathSafetyError
+from ..diffs import DiffApplyError, apply_hunks, parse_unified_diff
+from .change_bundle import normalize_diff_text, register_bundle
+
+
+def squash_bundles(governor: Governor, bundle_ids: List[str], metadata: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None, owner_id: Optional[str] = None) -> ToolResponse:
+    """
+    Composes a chain of bundles in memory and stores the result as one canonical bundle.
+
+    Bundles are applied in the given order to a virtual copy of the affected files;
+    the workspace is never touched. The squashed diff is rendered from the original
+    file contents to the final virtual contents and hashed exactly like
+    create_change_bundle.
+    """
+    start_time = time.time()
+    ids = list(bundle_ids or [])
+    bundles = [governor.bundles.peek(bundle_id) for bundle_id in ids]
+    paths = sorted({target for bundle in bundles if bundle for target in bundle["target_files"]})
+
+    decision = governor.validate_action("squash_bundles", "write", {"bundle_ids": ids, "paths": paths}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    if not ids or len(set(ids)) != len(ids):
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error("bundle_ids must be a non-empty list of distinct ids", code="invalid_input", meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+
+    owner_hash = hashlib.sha256(owner_id.encode("utf-8")).hexdigest() if owner_id else None
+    for bundle_id in ids:
+        # get() (not peek) so squashing counts as use for TTL purposes.
+        bundle = governor.bundles.get(bundle_id)
+        if not bundle or (owner_hash and bundle.get("owner_hash") != owner_hash):
+            governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+            return ToolResponse.error(
+                "Bundle not found",
+                code="not_found",
+                details={"key": "BUNDLE_NOT_FOUND", "details": {"bundle_id": bundle_id}, "config_path": ""},
+                meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+            )
+
+    base: Dict[str, Optional[List[str]]] = {}
+    current: Dict[str, Optional[List[str]]] = {}
+
+    def load(raw_path: str) -> str:
+        safe_path = resolve_path(governor.root, raw_path)
+        check_path(safe_path, governor.root, governor.policy)
+        rel_path = str(safe_path.relative_to(governor.root)).replace("\\", "/")
+        if rel_path not in current:
+            content = safe_path.read_text(encoding="utf-8", errors="replace").splitlines() if safe_path.is_file() else None
+            base[rel_path] = content
+            current[rel_path] = list(content) if content is not None else None
+        return rel_path
+
+    failing_bundle = ids[0]
+    try:
+        for bundle_id in ids:
+            failing_bundle = bundle_id
+            bundle = governor.bundles.peek(bundle_id) or {}
+            for file_diff in parse_unified_diff(bundle.get("diff_text", "")):
+                if file_diff.binary:
+                    raise DiffApplyError(f"{file_diff.path}: binary changes cannot be squashed")
+                source = load(file_diff.old_path) if file_diff.old_path else None
+                dest = load(file_diff.new_path) if file_diff.new_path else None
+                if source is not None:
+                    source_lines = current[source]
+                    if source_lines is None:
+                        raise DiffApplyError(f"{source}: file does not exist at this point in the chain")
+                else:
+                    if dest is not None and current[dest] is not None:
+                        raise DiffApplyError(f"{dest}: file already exists at this point in the chain")
+                    source_lines = []
+                new_lines = apply_hunks(source_lines, file_diff.hunks)
+                if source is not None and source != dest:
+                    current[source] = None
+                if dest is not None:
+                    current[dest] = new_lines
+    except PathSafetyError as e:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.blocked("Patch targets unsafe file", {"key": "PATH_OUTSIDE_ALLOW_PATHS", "details": {"error": str(e)}, "config_path": ""}, meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+    except DiffApplyError as e:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Bundles do not compose",
+            code="invalid_input",
+            details={"key": "BUNDLES_DO_NOT_COMPOSE", "details": {"bundle_id": failing_bundle, "error": str(e)}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    chunks: List[str] = []
+    changed: List[str] = []
+    for path in sorted(current):
+        before, after = base[path], current[path]
+        if before == after:
+            continue
+        changed.append(path)
+        chunks.extend(difflib.unified_diff(
+            before or [],
+            after or [],
+            fromfile=f"a/{path}" if before is not None else "/dev/null",
+            tofile=f"b/{path}" if after is not None else "/dev/null",
+            lineterm="",
+        ))
+
+    if not changed:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error("Squashed bundles produce no changes", code="invalid_input", meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+
+    normalized_diff = normalize_diff_text("\n".join(chunks))
+    squash_metadata = dict(metadata or {})
+    squash_metadata["squashed_from"] = ids
+    bundle, created = register_bundle(governor, normalized_diff, changed, {p: p for p in changed}, squash_metadata, owner_id, start_time)
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=f"{'Created' if created else 'Returned existing'} squashed bundle {bundle['bundle_id']}",
+        data={"bundle_id": bundle["bundle_id"], "target_files": bundle["target_files"], "squashed_from": ids},
+        meta=governor.get_meta(decision.audit_id, "squash_bundles", "write", duration, run_id=run_id, owner_id=owner_id)
+    )
@@ -0,0 +1,77 @@
+import hashlib
+import re
+import time
+from typing import Any, Dict, Literal, Optional
+from ..governor import Governor
+from ..response_schema import ToolResponse
+
+MAX_GREP_MATCHES = 500
+
+
+def read_task_output(
+    governor: Governor,
+    audit_id: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    grep: Optional[str] = None,
+    stream: Literal["stdout", "stderr"] = "stdout",
+    max_matches: int = 100,
+    run_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+) -> ToolResponse:
+    """
+    Pages through (or greps) the full output a truncated run_task kept on disk.
+    Pages are capped at max_output_bytes; a grep scans at most max_file_bytes per
+    call and returns next_offset to continue. Bytes paged or scanned count toward
+    the max_bytes_read quota.
+    """
+    start_time = time.time()
+    decision = governor.validate_action("read_task_output", "read", {"audit_id": audit_id, "stream": stream, "grep": grep}, run_id=run_id, owner_id=owner_id)
+    if not decision.allowed:
+        if decision.block_response:
+            duration_ms = int((time.time() - start_time) * 1000)
+            decision.block_response.meta["duration_ms"] = duration_ms
+            governor.update_audit(decision.audit_id, {"duration_ms": duration_ms})
+            return decision.block_response
+        return ToolResponse.error("Action blocked", code="blocked")
+
+    artifact = governor.task_outputs.get(audit_id)
+    if artifact is not None and owner_id and artifact.owner_hash != hashlib.sha256(owner_id.encode("utf-8")).hexdigest():
+        artifact = None
+    if artifact is None:
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error(
+            "Task output not found",
+            code="not_found",
+            details={"key": "TASK_OUTPUT_NOT_FOUND", "details": {"audit_id": audit_id}, "config_path": ""},
+            meta=governor.get_meta(decision.audit_id, "read_task_output", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id)
+        )
+
+    if stream not in ("stdout", "stderr"):
+        governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+        return ToolResponse.error("stream must be 'stdout' or 'stderr'", code="invalid_input", meta=governor.get_meta(decision.audit_id, "read_task_output", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+
+    data: Dict[str, Any] = {"audit_id": audit_id, "task_name": artifact.task_name, "stream": stream, "truncated": artifact.truncated}
+    if grep:
+        try:
+            pattern = re.compile(grep)
+        except re.error as e:
+            governor.update_audit(decision.audit_id, {"duration_ms": int((time.time() - start_time) * 1000)})
+            return ToolResponse.error(f"Invalid grep pattern: {str(e)}", code="invalid_input", meta=governor.get_meta(decision.audit_id, "read_task_output", "read", int((time.time() - start_time) * 1000), run_id=run_id, owner_id=owner_id))
+        data.update(artifact.grep(stream, pattern, offset, max(1, min(max_matches, MAX_GREP_MATCHES)), governor.config.max_file_bytes))
+        end = data["next_offset"] if data["next_offset"] is not None else data["total_bytes"]
+        governor.charge_usage(run_id, owner_id, bytes_read=end - data["offset"])
+        summary = f"{len(data['matches'])} matching lines in {stream} of {audit_id}"
+    else:
+        page = governor.config.max_output_bytes if length is None else max(0, min(length, governor.config.max_output_bytes))
+        data.update(artifact.read(stream, offset, page))
+        governor.charge_usage(run_id, owner_id, bytes_read=data["length"])
+        summary = f"Read {data['length']} bytes of {stream} at offset {data['offset']}"
+
+    duration = int((time.time() - start_time) * 1000)
+    governor.update_audit(decision.audit_id, {"duration_ms": duration})
+    return ToolResponse.success(
+        summary=summary,
+        data=data,
+        meta=governor.get_meta(decision.audit_id, "read_task_output", "read", duration, run_id=run_id, owner_id=owner_id)
+    )
@@ -29,7 +29,8 @@ def workspace_info(governor: Governor, run_id: Optional[str] = None, owner_id: O
             "limits": {
                 "max_file_bytes": governor.config.max_file_bytes,
                 "max_runtime_seconds": governor.config.max_runtime_seconds
-            }
+            },
+            "governor_stats": governor.stats(),
         },
         meta=governor.get_meta(decision.audit_id, "workspace_info", "read", duration_ms, run_id=run_id, owner_id=owner_id)
     )
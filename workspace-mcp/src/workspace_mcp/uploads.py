@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+
+class UploadError(Exception):
+    pass
+
+
+class DiffUpload:
+    """
+    A diff streamed in chunks into an on-disk spool with incremental sha256.
+
+    Once committed the spool is read-only and can be handed to `patch --input`
+    directly or iterated line by line, so large diffs never need to exist as a
+    single JSON-RPC string.
+    """
+
+    def __init__(self, upload_id: str, owner_hash: Optional[str], max_bytes: int):
+        self.upload_id = upload_id
+        self.owner_hash = owner_hash
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.chunks = 0
+        self.sha256: Optional[str] = None
+        self._hasher = hashlib.sha256()
+        fd, name = tempfile.mkstemp(prefix="workspace-mcp-diff-", suffix=".patch")
+        self.path = Path(name)
+        self._handle: Optional[BinaryIO] = os.fdopen(fd, "wb")
+
+    @property
+    def committed(self) -> bool:
+        return self.sha256 is not None
+
+    def append(self, seq: int, data: bytes) -> None:
+        if self.committed or self._handle is None:
+            raise UploadError("Upload already committed")
+        if seq != self.chunks:
+            raise UploadError(f"Out-of-order chunk: expected seq {self.chunks}, got {seq}")
+        if self.size + len(data) > self.max_bytes:
+            raise UploadError(f"Upload exceeds max_diff_upload_bytes ({self.max_bytes})")
+        self._handle.write(data)
+        self._hasher.update(data)
+        self.size += len(data)
+        self.chunks += 1
+
+    def commit(self) -> str:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self.sha256 is None:
+            self.sha256 = self._hasher.hexdigest()
+        return self.sha256
+
+    def iter_lines(self) -> Iterator[str]:
+        with self.path.open("r", encoding="utf-8", errors="replace", newline="") as handle:
+            for line in handle:
+                yield line.rstrip("\r\n")
+
+    def read_text(self) -> str:
+        return self.path.read_text(encoding="utf-8", errors="replace")
+
+    def discard(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import select
+import socket
+import struct
+import subprocess
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .mcp_logging import logger
+from .task_runner import TASK_ENV, ResourceUsage, Spawner, rlimit_plan
+
+ZYGOTE_SOURCE = Path(__file__).with_name("zygote.py").read_text(encoding="utf-8")
+ZYGOTE_START_TIMEOUT_SECONDS = 30.0
+SPAWN_TIMEOUT_SECONDS = 5.0
+_PYTHON_RE = re.compile(r"^python(\d+(\.\d+)?)?$")
+
+PoolKey = Tuple[str, Tuple[str, ...]]  # (interpreter, preload modules)
+
+
+def python_entry(argv: Sequence[str]) -> Optional[Tuple[str, str, List[str]]]:
+    """
+    Splits `python -c CODE ...`, `python -m MODULE ...` and `python SCRIPT ...`
+    into (kind, target, args). Anything else, including interpreter flags such as
+    -u or -X, returns None and runs as a plain subprocess.
+    """
+    if len(argv) < 2 or not _PYTHON_RE.match(os.path.basename(argv[0])):
+        return None
+    flag = argv[1]
+    if flag in ("-c", "-m"):
+        if len(argv) < 3:
+            return None
+        return ("code" if flag == "-c" else "module"), argv[2], list(argv[3:])
+    if flag.startswith("-"):
+        return None
+    return "script", flag, list(argv[2:])
+
+
+class _Zygote:
+    """
+    One warm interpreter (see zygote.py) and the parent end of its socket.
+    """
+
+    def __init__(self, key: PoolKey, cwd: Path):
+        self.key = key
+        interpreter, preload = key
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.proc = subprocess.Popen(
+                [interpreter, "-c", ZYGOTE_SOURCE, str(child_sock.fileno()), *preload],
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=dict(TASK_ENV),
+                pass_fds=[child_sock.fileno()],
+            )
+        finally:
+            child_sock.close()
+        self.sock = parent_sock
+        self._buffer = bytearray()
+        ready = self.receive(ZYGOTE_START_TIMEOUT_SECONDS)
+        if ready is None or not ready.get("ready"):
+            self.close()
+            raise OSError(f"Warm interpreter {interpreter} did not start")
+        if ready.get("failed"):
+            logger.warning(f"Warm interpreter could not preload {ready['failed']}")
+
+    def receive(self, timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        """
+        Next JSON message, or None on timeout or if the zygote is gone.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while b"\n" not in self._buffer:
+            wait = None if deadline is None else max(0.0, deadline - time.time())
+            readable, _, _ = select.select([self.sock], [], [], wait)
+            if not readable:
+                return None
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                return None
+            self._buffer.extend(chunk)
+        cut = self._buffer.index(b"\n")
+        line = bytes(self._buffer[:cut])
+        del self._buffer[:cut + 1]
+        return json.loads(line.decode("utf-8"))
+
+    def spawn(self, request: Dict[str, Any], out_fd: int, err_fd: int) -> Optional[int]:
+        body = json.dumps(request).encode("utf-8")
+        socket.send_fds(self.sock, [struct.pack("!Q", len(body))], [out_fd, err_fd])
+        self.sock.sendall(body)
+        reply = self.receive(SPAWN_TIMEOUT_SECONDS)
+        return None if reply is None else int(reply["pid"])
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        self.sock.close()
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class WarmProcess:
+    """
+    A task forked from a zygote, with the slice of the Popen interface that
+    run_command uses. The zygote reaps the child and reports its exit status and
+    rusage; the zygote goes back to the pool once that report is read.
+    """
+
+    def __init__(self, pool: "WarmPool", zygote: _Zygote, pid: int, args: List[str], stdout_fd: int, stderr_fd: int):
+        self._pool = pool
+        self._zygote: Optional[_Zygote] = zygote
+        self.pid = pid
+        self.args = args
+        self.stdout = os.fdopen(stdout_fd, "rb", buffering=0)
+        self.stderr = os.fdopen(stderr_fd, "rb", buffering=0)
+        self.returncode: Optional[int] = None
+        self.rusage: Optional[ResourceUsage] = None
+
+    def _collect(self, timeout: Optional[float]) -> bool:
+        if self.returncode is not None:
+            return True
+        assert self._zygote is not None
+        message = self._zygote.receive(timeout)
+        if message is None:
+            if self._zygote.alive:
+                return False
+            # Zygote died under us; the child went with it or was orphaned.
+            self.returncode = -9
+            self._pool.discard(self._zygote)
+        else:
+            self.returncode = int(message["exit_code"])
+            self.rusage = ResourceUsage.from_rusage(SimpleNamespace(**message["rusage"]))
+            self._pool.release(self._zygote)
+        self._zygote = None
+        return True
+
+    def kill(self) -> None:
+        # Only signal a pid the zygote has not reaped yet.
+        if not self._collect(0):
+            try:
+                os.kill(self.pid, 9)
+            except ProcessLookupError:
+                pass
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._collect(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout or 0)
+        assert self.returncode is not None
+        return self.returncode
+
+    def reap(self, deadline: float) -> Tuple[int, Optional[ResourceUsage]]:
+        return self.wait(max(0.0, deadline - time.time())), self.rusage
+
+
+class WarmPool:
+    """
+    Pre-started Python interpreters, keyed by (interpreter, preload modules), that
+    fork once per task so imports such as pytest are paid once per zygote rather
+    than once per run.
+
+    At most `max_workers` zygotes exist per key and each serves one task at a time.
+    spawn() returns None (the caller falls back to a plain subprocess) for
+    non-Python argv, when every zygote is busy, or when the platform cannot fork.
+    """
+
+    def __init__(self, cwd: Path, max_workers: int):
+        self.cwd = cwd
+        self.max_workers = max_workers
+        self._idle: Dict[PoolKey, List[_Zygote]] = {}
+        self._count: Dict[PoolKey, int] = {}
+        self._lock = threading.Lock()
+        self.warm_starts = 0
+        self.cold_starts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0 and hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+    def _acquire(self, key: PoolKey) -> Optional[_Zygote]:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            while idle:
+                zygote = idle.pop()
+                if zygote.alive:
+                    return zygote
+                self._count[key] -= 1
+                zygote.close()
+            if self._count.get(key, 0) >= self.max_workers:
+                return None
+            self._count[key] = self._count.get(key, 0) + 1
+        try:
+            return _Zygote(key, self.cwd)
+        except OSError as e:
+            logger.warning(f"Warm pool unavailable: {str(e)}")
+            with self._lock:
+                self._count[key] -= 1
+            return None
+
+    def release(self, zygote: _Zygote) -> None:
+        with self._lock:
+            self._idle.setdefault(zygote.key, []).append(zygote)
+
+    def discard(self, zygote: _Zygote) -> None:
+        zygote.close()
+        with self._lock:
+            self._count[zygote.key] -= 1
+
+    def spawner(self, preload: Optional[Sequence[str]]) -> Optional[Spawner]:
+        """
+        run_command spawn hook for a task's task_options.preload; None when the
+        task did not opt in or the pool is disabled.
+        """
+        if preload is None or not self.enabled:
+            return None
+        modules = tuple(preload)
+        return lambda argv, cwd, env, limits: self.spawn(modules, argv, cwd, env, limits)
+
+    def spawn(self, preload: Sequence[str], argv: List[str], cwd: Path, env: Dict[str, str], limits: Optional[Mapping[str, int]]) -> Optional[WarmProcess]:
+        entry = python_entry(argv)
+        if entry is None or not self.enabled:
+            return None
+        zygote = self._acquire((argv[0], tuple(preload)))
+        if zygote is None:
+            self.cold_starts += 1
+            return None
+        kind, target, args = entry
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        request = {"kind": kind, "target": target, "args": args, "cwd": str(cwd), "env": env, "rlimits": rlimit_plan(limits)}
+        try:
+            pid = zygote.spawn(request, out_w, err_w)
+        except OSError:
+            pid = None
+        finally:
+            os.close(out_w)
+            os.close(err_w)
+        if pid is None:
+            os.close(out_r)
+            os.close(err_r)
+            self.discard(zygote)
+            self.cold_starts += 1
+            return None
+        self.warm_starts += 1
+        return WarmProcess(self, zygote, pid, list(argv), out_r, err_r)
+
+    def close(self) -> None:
+        with self._lock:
+            zygotes = [z for idle in self._idle.values() for z in idle]
+            self._idle.clear()
+            self._count.clear()
+        for zygote in zygotes:
+            zygote.close()
@@ -0,0 +1,131 @@
+"""
+Warm interpreter process. Not imported by the server: warm_pool starts it as
+`<python> -c <this source> <socket fd> <module>...` so it runs on the task's own
+interpreter, and must only use the standard library.
+
+Protocol over the inherited AF_UNIX socket:
+  parent -> zygote: 8-byte big-endian length (sent with the child's stdout/stderr
+                    fds attached), then that many bytes of JSON request.
+  zygote -> parent: JSON lines; {"ready", "failed"} once, then per request
+                    {"pid"} after the fork and {"exit_code", "rusage"} when reaped.
+The zygote serves one task at a time and exits when the socket closes.
+"""
+import json
+import os
+import runpy
+import socket
+import struct
+import sys
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def _send(sock, message):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _exit_code(code):
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_child(sock, request, out_fd, err_fd):
+    sock.close()
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    for fd in (devnull, out_fd, err_fd):
+        os.close(fd)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    if resource is not None:
+        for rlimit, soft, hard in request["rlimits"]:
+            resource.setrlimit(rlimit, (soft, hard))
+
+    kind, target, args = request["kind"], request["target"], request["args"]
+    code = 0
+    try:
+        if kind == "code":
+            sys.argv = ["-c"] + args
+            exec(compile(target, "<string>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+        elif kind == "module":
+            sys.argv = [target] + args
+            runpy.run_module(target, run_name="__main__", alter_sys=True)
+        else:
+            sys.argv = [target] + args
+            sys.path[0] = os.path.dirname(os.path.abspath(target))
+            runpy.run_path(target, run_name="__main__")
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    os._exit(code)
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    failed = []
+    for name in sys.argv[2:]:
+        try:
+            __import__(name)
+        except Exception:
+            failed.append(name)
+    _send(sock, {"ready": True, "failed": failed})
+
+    while True:
+        try:
+            header, fds, _, _ = socket.recv_fds(sock, 8, 2)
+            if not header:
+                return
+            (size,) = struct.unpack("!Q", header + _recv_exact(sock, 8 - len(header)))
+            request = json.loads(_recv_exact(sock, size).decode("utf-8"))
+        except (EOFError, OSError):
+            return
+        out_fd, err_fd = fds
+        pid = os.fork()
+        if pid == 0:
+            _run_child(sock, request, out_fd, err_fd)
+        os.close(out_fd)
+        os.close(err_fd)
+        _send(sock, {"pid": pid})
+        _, status, usage = os.wait4(pid, 0)
+        _send(sock, {
+            "exit_code": os.waitstatus_to_exitcode(status),
+            "rusage": {
+                "ru_utime": usage.ru_utime,
+                "ru_stime": usage.ru_stime,
+                "ru_maxrss": usage.ru_maxrss,
+                "ru_inblock": usage.ru_inblock,
+                "ru_oublock": usage.ru_oublock,
+            },
+        })
+
+
+if __name__ == "__main__":
+    main()
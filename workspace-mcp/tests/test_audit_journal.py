@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+
+from workspace_mcp.audit_journal import AuditJournal
+from workspace_mcp.config import PolicyConfig, load_runtime_config
+from workspace_mcp.governor import Governor
+from workspace_mcp.tools.explain_policy import explain_policy_decision
+from workspace_mcp.tools.read_file import read_file
+
+
+def _governor(tmp_path: Path, **kwargs) -> Governor:
+    root = tmp_path / "project"
+    root.mkdir(exist_ok=True)
+    (root / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(root), allow_paths=["."], deny_globs=["*.env"], max_audit_logs=2)
+    return Governor(cfg, audit_dir=tmp_path / "audit", **kwargs)
+
+
+def test_evicted_and_restarted_entries_are_read_from_the_journal(tmp_path):
+    gov = _governor(tmp_path)
+    first = read_file(gov, "a.txt").meta["audit_id"]
+    blocked = read_file(gov, "prod.env").meta["audit_id"]
+    for _ in range(3):
+        read_file(gov, "a.txt")
+    assert gov.audit_logs.peek(first) is None
+
+    explained = explain_policy_decision(gov, first)
+    assert explained.status == "ok" and explained.data["decision"] == "allowed"
+    # The hot store is repopulated from disk.
+    assert gov.audit_logs.peek(first)["audit_id"] == first
+
+    restarted = _governor(tmp_path, audit_async=True)
+    entry = restarted.get_audit(blocked)
+    assert entry["decision"] == "blocked"
+    assert entry["violation"]["key"] == "PATH_MATCHES_DENY_GLOBS"
+    assert "duration_ms" in entry
+
+
+def test_segments_rotate_and_index_follows_latest_line(tmp_path):
+    journal = AuditJournal(tmp_path, segment_max_bytes=200, max_segments=2)
+    for i in range(10):
+        journal.append([{"audit_id": str(i), "pad": "x" * 60}])
+    journal.append([{"audit_id": "9", "pad": "updated"}])
+    assert len(list(tmp_path.glob("audit-*.jsonl"))) == 2
+    assert journal.get("0") is None
+    assert journal.get("9")["pad"] == "updated"
+
+    # A torn tail is terminated before the next append.
+    segment = sorted(tmp_path.glob("audit-*.jsonl"))[-1]
+    journal.close()
+    with segment.open("ab") as handle:
+        handle.write(b'{"audit_id": "torn"')
+    reopened = AuditJournal(tmp_path, segment_max_bytes=10_000, max_segments=2)
+    reopened.append([{"audit_id": "after"}])
+    assert reopened.get("after") == {"audit_id": "after"}
+    assert reopened.get("torn") is None
+    assert reopened.get("9")["pad"] == "updated"
+
+
+def test_audit_dir_precedence(tmp_path):
+    cfg_file = tmp_path / "workspace-mcp.yaml"
+    cfg_file.write_text(f"audit_dir: {tmp_path / 'from-file'}\n", encoding="utf-8")
+    assert load_runtime_config(cli={}, env={"PROFILE": "dev"}, config_file=cfg_file).audit_dir == tmp_path / "from-file"
+    env = {"AUDIT_DIR": str(tmp_path / "from-env")}
+    assert load_runtime_config(cli={}, env=env, config_file=cfg_file).audit_dir == tmp_path / "from-env"
+    cli = {"audit_dir": str(tmp_path / "from-cli")}
+    assert load_runtime_config(cli=cli, env=env, config_file=cfg_file).audit_dir == tmp_path / "from-cli"
+    assert load_runtime_config(cli={}, env={"PROFILE": "dev"}).audit_dir is None
+
+
+
+def test_audit_dir_inside_the_workspace_is_rejected(tmp_path):
+    root = tmp_path / "project"
+    for inside in (root, root / "audit", root / "nested" / ".." / "audit"):
+        cli = {"workspace_root": str(root), "audit_dir": str(inside)}
+        with pytest.raises(ValueError, match="outside workspace_root"):
+            load_runtime_config(cli=cli, env={"PROFILE": "dev"})
+    cli = {"workspace_root": str(root), "audit_dir": str(tmp_path / "project-audit")}
+    assert load_runtime_config(cli=cli, env={"PROFILE": "dev"}).audit_dir == tmp_path / "project-audit"
+
+def test_close_drains_the_audit_queue_into_the_journal(tmp_path):
+    gov = _governor(tmp_path, audit_async=True)
+    ids = [read_file(gov, "a.txt").meta["audit_id"] for _ in range(300)]
+    gov.close()
+    gov.close()  # idempotent
+    assert gov.audit_pipeline.stats()["pending"] == 0
+    assert gov.task_pool._shutdown
+
+    restarted = _governor(tmp_path)
+    assert all(restarted.audit_journal.get(audit_id) is not None for audit_id in ids)
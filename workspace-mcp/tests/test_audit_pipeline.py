@@ -0,0 +1,59 @@
+import threading
+from pathlib import Path
+
+from workspace_mcp.audit_pipeline import AuditPipeline
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.tools.explain_policy import explain_policy_decision
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.run_lifecycle import start_run
+
+
+def _governor(tmp_path: Path) -> Governor:
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(tmp_path), allow_paths=["."], deny_globs=["*.env"])
+    return Governor(cfg, audit_async=True)
+
+
+def test_async_audit_is_flushed_for_explain(tmp_path):
+    gov = _governor(tmp_path)
+    res = read_file(gov, "a.txt")
+    audit_id = res.meta["audit_id"]
+
+    explained = explain_policy_decision(gov, audit_id)
+    assert explained.status == "ok"
+    assert explained.data["decision"] == "allowed"
+    # The duration update was merged into the entry by the writer.
+    assert "duration_ms" in gov.audit_logs.get(audit_id)
+    assert gov.stats()["audit_pipeline"]["submitted"] >= 2
+
+
+def test_run_accounting_stays_synchronous(tmp_path):
+    gov = _governor(tmp_path)
+    gate = threading.Event()
+    write_batch = gov._write_audit_batch
+    gov.audit_pipeline._write_batch = lambda batch: (gate.wait(5), write_batch(batch))
+
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    read_file(gov, "a.txt", run_id=run_id, owner_id="alice")
+    run = gov.runs.get(run_id)
+    assert run.tool_sequence() == ["read_file"] and run.allowed_count == 1
+    gate.set()
+    assert gov.flush_audit()
+
+
+def test_full_queue_applies_backpressure_then_drops():
+    started, gate = threading.Event(), threading.Event()
+    written = []
+    pipeline = AuditPipeline(lambda batch: (started.set(), gate.wait(5), written.extend(batch)), max_pending=2, batch_size=1, max_block_seconds=0.01)
+    results = [pipeline.submit(("log", {"audit_id": "0"}))]
+    assert started.wait(5)
+    results += [pipeline.submit(("log", {"audit_id": str(i)})) for i in range(1, 5)]
+    # One record is in flight with the writer, two wait in the queue; the rest are dropped.
+    assert results.count(False) == 2
+    stats = pipeline.stats()
+    assert stats["dropped"] == 2 and stats["blocked_seconds"] > 0
+    gate.set()
+    assert pipeline.flush()
+    assert len(written) == 3
+    pipeline.close()
@@ -0,0 +1,78 @@
+import sys
+import time
+
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.background_task import background_limits, start_task, poll_task, cancel_task
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={
+            "count": [sys.executable, "-c", "for i in range(5): print(i)"],
+            "sleep": [sys.executable, "-c", "import time; time.sleep(30)"],
+        },
+        max_background_tasks=1,
+    )
+    return Governor(cfg)
+
+
+def _wait_until_done(governor, task_id, owner_id=None, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        res = poll_task(governor, task_id, owner_id=owner_id)
+        if res.data["status"] not in ("queued", "running"):
+            return res
+        time.sleep(0.05)
+    raise AssertionError("task did not finish")
+
+
+def test_start_and_poll_incremental_output(governor_instance):
+    started = start_task(governor_instance, "count", owner_id="owner-a")
+    assert started.status == "ok"
+    task_id = started.data["task_id"]
+
+    done = _wait_until_done(governor_instance, task_id, owner_id="owner-a")
+    assert done.data["status"] == "succeeded"
+    assert done.data["exit_code"] == 0
+    assert [entry["line"] for entry in done.data["lines"]] == ["0", "1", "2", "3", "4"]
+
+    tail = poll_task(governor_instance, task_id, cursor=3, owner_id="owner-a")
+    assert [entry["line"] for entry in tail.data["lines"]] == ["3", "4"]
+    assert tail.data["next_cursor"] == 5
+
+    assert poll_task(governor_instance, task_id, owner_id="owner-b").code == "not_found"
+
+
+def test_cancel_running_and_queued_tasks(governor_instance):
+    running = start_task(governor_instance, "sleep").data["task_id"]
+    queued = start_task(governor_instance, "sleep").data["task_id"]
+
+    # One worker, so the pool (queued + running) is full at two tasks.
+    full = start_task(governor_instance, "count")
+    assert full.status == "blocked"
+    assert full.data["policy_violation"]["key"] == "TASK_QUEUE_FULL"
+
+    assert cancel_task(governor_instance, queued).data["status"] == "cancelled"
+    assert cancel_task(governor_instance, running).data["cancel_requested"] is True
+    assert _wait_until_done(governor_instance, running).data["status"] == "cancelled"
+
+
+def test_start_task_requires_allowlisted_task(governor_instance):
+    res = start_task(governor_instance, "rm")
+    assert res.status == "blocked"
+    assert res.data["policy_violation"]["key"] == "TASK_NOT_ALLOWLISTED"
+
+
+def test_background_cpu_limit_scales_with_the_background_runtime(tmp_path):
+    cfg = PolicyConfig(workspace_root=str(tmp_path), max_runtime_seconds=15, max_background_runtime_seconds=600)
+    governor = Governor(cfg)
+    limits = {"cpu_seconds": 30, "open_files": 1024}
+    assert background_limits(governor, limits) == {"cpu_seconds": 1200, "open_files": 1024}
+    assert limits["cpu_seconds"] == 30  # the foreground limit is unchanged
+    assert background_limits(governor, {"open_files": 64}) == {"open_files": 64}
+    assert background_limits(governor, None) is None
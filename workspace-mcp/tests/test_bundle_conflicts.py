@@ -0,0 +1,96 @@
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.bundle_index import HunkIntervalIndex
+from workspace_mcp.tools.change_bundle import WHOLE_FILE_RANGE, create_change_bundle
+from workspace_mcp.tools.bundle_conflicts import bundle_conflicts, bundle_groups
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.txt").write_text("".join(f"line{i}\n" for i in range(1, 31)), encoding="utf-8")
+    (root / "b.txt").write_text("b\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(root),
+        allow_paths=["."],
+        deny_globs=["*.env"],
+        max_bundles=3,
+        bundle_ttl_seconds=3600,
+    )
+    return Governor(cfg)
+
+
+def _edit(path: str, line: int, tag: str) -> str:
+    return f"""--- a/{path}
++++ b/{path}
+@@ -{line},2 +{line},2 @@
+-line{line}
++{tag}
+ line{line + 1}
+"""
+
+
+def test_overlapping_hunks_conflict_and_disjoint_do_not(governor_instance):
+    first = create_change_bundle(governor_instance, _edit("a.txt", 5, "one"), owner_id="o1").data["bundle_id"]
+    second = create_change_bundle(governor_instance, _edit("a.txt", 6, "two"), owner_id="o1").data["bundle_id"]
+    third = create_change_bundle(governor_instance, _edit("a.txt", 20, "three"), owner_id="o2").data["bundle_id"]
+
+    res = bundle_conflicts(governor_instance, first, owner_id="o1")
+    assert res.status == "ok"
+    assert [c["bundle_id"] for c in res.data["conflicts"]] == [second]
+    assert res.data["conflicts"][0]["files"] == [{"path": "a.txt", "ranges": [[6, 7]]}]
+    assert res.data["foreign_conflicts"] == 0
+
+    assert bundle_conflicts(governor_instance, third, owner_id="o2").data["conflicts"] == []
+
+
+def test_foreign_owner_conflicts_are_counted_not_named(governor_instance):
+    mine = create_change_bundle(governor_instance, _edit("a.txt", 5, "mine"), owner_id="o1").data["bundle_id"]
+    create_change_bundle(governor_instance, _edit("a.txt", 5, "theirs"), owner_id="o2")
+
+    res = bundle_conflicts(governor_instance, mine, owner_id="o1")
+    assert res.data["conflicts"] == []
+    assert res.data["foreign_conflicts"] == 1
+
+
+def test_groups_separate_conflicting_bundles(governor_instance):
+    first = create_change_bundle(governor_instance, _edit("a.txt", 5, "one")).data["bundle_id"]
+    second = create_change_bundle(governor_instance, _edit("a.txt", 5, "two")).data["bundle_id"]
+    other = create_change_bundle(governor_instance, "--- a/b.txt\n+++ b/b.txt\n@@ -1 +1 @@\n-b\n+c\n").data["bundle_id"]
+
+    res = bundle_groups(governor_instance, [first, second, other, "missing"])
+    groups = res.data["groups"]
+    assert len(groups) == 2
+    assert {first, second} & set(groups[0]) and {first, second} & set(groups[1])
+    assert other in groups[0]
+    assert res.data["missing"] == ["missing"]
+
+
+def test_evicted_bundles_leave_the_index(governor_instance):
+    first = create_change_bundle(governor_instance, _edit("a.txt", 5, "one")).data["bundle_id"]
+    for i, line in enumerate((10, 15, 20)):
+        create_change_bundle(governor_instance, _edit("a.txt", line, f"n{i}"))
+
+    assert governor_instance.bundles.get(first) is None
+    assert first not in governor_instance.bundle_index
+
+
+def test_interval_queries_stay_sublinear_with_a_whole_file_range():
+    index = HunkIntervalIndex()
+    index.add("binary", {"a.bin": [WHOLE_FILE_RANGE]})
+    n = 20_000
+    for i in range(n):
+        index.add(f"b{i}", {"a.bin": [[i * 3, i * 3 + 1]]})
+    index.add("probe", {"a.bin": [[30_001, 30_001]]})
+
+    assert sorted(index.conflicts("probe")) == ["b10000", "binary"]
+    visited = index._files["a.bin"].last_visited
+    assert visited < 200, visited
+
+    for i in range(0, n, 2):
+        index.remove(f"b{i}")
+    assert sorted(index.conflicts("probe")) == ["binary"]
+    assert len(index._files["a.bin"]) == n // 2 + 2
+    assert index._files["a.bin"].last_visited < 200
@@ -0,0 +1,68 @@
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.change_bundle import create_change_bundle
+from workspace_mcp.tools.bundle_status import bundle_status
+
+DIFF = """--- a/app.py
++++ b/app.py
+@@ -2,3 +2,3 @@
+ def main():
+-    return 'Hello'
++    return 'Hello, world'
+ 
+"""
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "app.py").write_text("import os\ndef main():\n    return 'Hello'\n\nmain()\n", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(root), allow_paths=["."], deny_globs=["*.env"])
+    return Governor(cfg)
+
+
+def _status(gov, bundle_id):
+    res = bundle_status(gov, bundle_id, owner_id="o1")
+    assert res.status == "ok"
+    return res.data
+
+
+def test_unchanged_tree_is_fresh(governor_instance):
+    bundle_id = create_change_bundle(governor_instance, DIFF, owner_id="o1").data["bundle_id"]
+    data = _status(governor_instance, bundle_id)
+    assert data["status"] == "fresh"
+    assert data["files"] == {"app.py": "fresh"}
+
+
+def test_edit_outside_hunk_is_stale(governor_instance):
+    bundle_id = create_change_bundle(governor_instance, DIFF, owner_id="o1").data["bundle_id"]
+    (governor_instance.root / "app.py").write_text(
+        "import os\nimport sys\ndef main():\n    return 'Hello'\n\nmain()\n", encoding="utf-8"
+    )
+    assert _status(governor_instance, bundle_id)["files"] == {"app.py": "stale"}
+
+
+def test_edit_inside_hunk_is_conflicting(governor_instance):
+    bundle_id = create_change_bundle(governor_instance, DIFF, owner_id="o1").data["bundle_id"]
+    (governor_instance.root / "app.py").write_text(
+        "import os\ndef main():\n    return 'Bye'\n\nmain()\n", encoding="utf-8"
+    )
+    assert _status(governor_instance, bundle_id)["status"] == "conflicting"
+
+
+def test_status_is_owner_scoped(governor_instance):
+    bundle_id = create_change_bundle(governor_instance, DIFF, owner_id="o1").data["bundle_id"]
+    res = bundle_status(governor_instance, bundle_id, owner_id="o2")
+    assert res.code == "not_found"
+    assert res.data["key"] == "BUNDLE_NOT_FOUND"
+
+
+def test_bundle_targeting_a_directory_is_created(governor_instance):
+    (governor_instance.root / "pkg").mkdir()
+    diff = "--- a/pkg\n+++ b/pkg\n@@ -1 +1 @@\n-a\n+b\n"
+    res = create_change_bundle(governor_instance, diff, owner_id="o1")
+    assert res.status == "ok"
+    # A directory has no content digest, like a missing file.
+    assert governor_instance.bundles.get(res.data["bundle_id"])["base_digests"] == {"pkg": None}
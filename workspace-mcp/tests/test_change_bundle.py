@@ -112,4 +112,36 @@ def test_bundle_risk_is_policy_driven(governor_instance):
     
     report_res = bundle_report(governor_instance, bundle_id, owner_id="owner1")
     assert report_res.status == "ok"
-    assert report_res.data["risk_level"] == "medium"
\ No newline at end of file
+    assert report_res.data["risk_level"] == "medium"
+
+def test_bundle_report_serves_precomputed_churn_stats(governor_instance):
+    diff = """--- a/a.txt
++++ b/a.txt
+@@ -0,0 +1,2 @@
++hello
++again
+--- a/src/x.py
++++ b/src/x.py
+@@ -0,0 +1 @@
++print('world')
+"""
+
+    res = create_change_bundle(governor_instance, diff, owner_id="owner1")
+    bundle = governor_instance.bundles.get(res.data["bundle_id"])
+    assert bundle["stats"]["churn"]["lines_added"] == 3
+
+    report_res = bundle_report(governor_instance, res.data["bundle_id"], owner_id="owner1")
+    data = report_res.data
+    assert data["churn"] == {
+        "files": 2,
+        "lines_added": 3,
+        "lines_removed": 0,
+        "hunks": 2,
+        "binary_files": 0,
+        "largest_file": "a.txt",
+    }
+    by_path = {s["path"]: s for s in data["file_stats"]}
+    assert by_path["src/x.py"]["risk"] == "medium"
+    assert by_path["a.txt"]["risk"] == "low"
+    # (1 * 2 + 2 * 1) / 3 lines changed
+    assert data["weighted_risk_score"] == 1.33
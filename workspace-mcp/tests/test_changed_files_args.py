@@ -0,0 +1,71 @@
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+import workspace_mcp
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.policy_loader import _validate_profile
+from workspace_mcp.task_args import expand_changed_files
+from workspace_mcp.tools.apply_patch import apply_patch
+from workspace_mcp.tools.change_bundle import create_change_bundle
+from workspace_mcp.tools.run_lifecycle import start_run
+from workspace_mcp.tools.run_task import run_task
+
+KERNEL_POLICY = Path(workspace_mcp.__file__).with_name("policies") / "kernel_policy.yaml"
+ECHO_ARGS = [sys.executable, "-c", "import sys; print(sys.argv[1:])", "--", "{changed_files}"]
+
+
+def _diff(path, old, new):
+    return f"--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n-{old}\n+{new}\n"
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    for name in ("a.py", "b.py", "notes.md", "-rf.py"):
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        deny_globs=["*.env"],
+        allow_tasks={"lint": ECHO_ARGS},
+        task_options={"lint": {"inputs": ["**/*.py"], "max_changed_files": 2}},
+    )
+    return Governor(cfg)
+
+
+def test_expansion_keeps_argv_boundaries():
+    assert expand_changed_files(["tool", "{changed_files}", "--x"], ["a b.py", "-rf"]) == ["tool", "a b.py", "./-rf", "--x"]
+
+
+def test_run_changed_files_expand_filtered_by_inputs(governor_instance):
+    run_id = start_run(governor_instance, owner_id="owner1").data["run_id"]
+    for path in ("a.py", "notes.md"):
+        assert apply_patch(governor_instance, _diff(path, "x = 1", "x = 2"), run_id=run_id, owner_id="owner1").status == "ok"
+
+    res = run_task(governor_instance, "lint", run_id=run_id, owner_id="owner1")
+    assert res.status == "ok"
+    assert res.data["changed_files"] == ["a.py"]
+    assert res.data["stdout"].strip() == "['--', 'a.py']"
+
+
+def test_bundle_files_respect_max_args(governor_instance):
+    diff = "".join(_diff(p, "x = 1", "x = 2") for p in ("a.py", "b.py", "-rf.py"))
+    bundle_id = create_change_bundle(governor_instance, diff, owner_id="owner1").data["bundle_id"]
+    res = run_task(governor_instance, "lint", owner_id="owner1", bundle_id=bundle_id)
+    assert res.status == "blocked"
+    assert res.data["policy_violation"]["key"] == "CHANGED_FILES_EXCEED_MAX_ARGS"
+
+    assert run_task(governor_instance, "lint", owner_id="other", bundle_id=bundle_id).code == "not_found"
+    assert run_task(governor_instance, "lint").data["key"] == "RUN_NOT_FOUND"
+
+
+def test_placeholder_must_be_a_whole_argument():
+    kernel = yaml.safe_load(KERNEL_POLICY.read_text(encoding="utf-8"))
+    profile = copy.deepcopy(kernel["profiles"]["dev"])
+    _validate_profile("dev", profile, strict=True)
+    profile["allow_tasks"]["lint_changed"] = ["flake8", "--files={changed_files}"]
+    with pytest.raises(ValueError, match="whole argument"):
+        _validate_profile("dev", profile, strict=True)
@@ -0,0 +1,48 @@
+from fnmatch import fnmatch
+
+import pytest
+from workspace_mcp.compiled_policy import CompiledPolicy
+from workspace_mcp.path_safety import PathSafetyError, check_path, validate_path
+
+DENY = ["*.env", ".git/**", "**/secrets/*", "id_[rd]sa*", "build/?.log"]
+PATHS = [
+    ".env", "a/b/prod.env", ".git/config", "src/secrets/key.txt", "secrets/key.txt",
+    "id_rsa.pub", "id_ed25519", "build/1.log", "build/10.log", "src/app.py", "srcx/app.py",
+]
+
+
+def test_deny_regex_matches_fnmatch_per_glob():
+    policy = CompiledPolicy(DENY, ["."])
+    for path in PATHS:
+        expected = next((p for p in DENY if fnmatch(path, p)), None)
+        assert policy.denied_by(path) == expected, path
+        assert policy.is_denied(path) is (expected is not None)
+
+
+def test_allow_trie_matches_prefix_semantics():
+    policy = CompiledPolicy([], ["src", "./docs/api/", "tests"])
+    assert policy.is_allowed("src/app.py")
+    assert policy.is_allowed("src")
+    assert policy.is_allowed("./docs/api/index.md")
+    assert not policy.is_allowed("docs/guide.md")
+    assert not policy.is_allowed("srcx/app.py")
+    assert CompiledPolicy([], ["."]).is_allowed("anything/at/all")
+    assert not CompiledPolicy([], []).is_allowed("src/app.py")
+
+
+def test_risk_classification_prefers_high():
+    policy = CompiledPolicy([], ["."], {"high_globs": ["**/auth/*", "*.sql"], "medium_globs": ["src/*"], "low_globs": []})
+    assert policy.classify_risk("src/auth/login.py") == "high"
+    assert policy.classify_risk("src/app.py") == "medium"
+    assert policy.classify_risk("README.md") == "low"
+
+
+def test_check_path_raises_like_validate_path(tmp_path):
+    policy = CompiledPolicy(["*.env"], ["src"])
+    for rel, message in [("prod.env", r"denied pattern '\*\.env'"), ("docs/a.md", "outside allow_paths")]:
+        for check in (lambda p: check_path(p, tmp_path, policy), lambda p: validate_path(p, tmp_path, ["*.env"], ["src"])):
+            with pytest.raises(PathSafetyError, match=message):
+                check(tmp_path / rel)
+    check_path(tmp_path / "src" / "app.py", tmp_path, policy)
+    # Without an allowlist, validate_path only applies the deny globs.
+    validate_path(tmp_path / "docs" / "a.md", tmp_path, ["*.env"])
@@ -0,0 +1,153 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from workspace_mcp.concurrency import AtomicCounter
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.import_graph import ImportGraph
+from workspace_mcp.store import BoundedStore
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.run_lifecycle import get_run_summary, start_run
+from workspace_mcp.tools.run_task import run_task
+
+
+def test_parallel_read_tools_keep_run_statistics_exact(tmp_path):
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(tmp_path), allow_paths=["."], deny_globs=["*.env"], max_audit_logs=1000)
+    gov = Governor(cfg)
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    before = gov.run_counter
+
+    def call(i: int) -> str:
+        return read_file(gov, "a.txt" if i % 2 else "prod.env", run_id=run_id, owner_id="alice").status
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(call, range(400)))
+
+    summary = get_run_summary(gov, run_id, owner_id="alice").data
+    assert summary["allowed_count"] == statuses.count("ok") == 200
+    assert summary["blocked_count"] == 200
+    assert summary["tool_sequence_length"] == 400
+    assert sum(summary["tool_counts"].values()) == 400
+    assert gov.run_counter == before + 400
+
+
+def test_store_and_counter_under_contention():
+    store = BoundedStore[int, int](max_size=50, ttl_seconds=60)
+    counter = AtomicCounter()
+    barrier = threading.Barrier(8)
+
+    def hammer(offset: int) -> None:
+        barrier.wait()
+        for i in range(2000):
+            store.set(offset * 10_000 + i, i)
+            store.get(offset * 10_000 + i - 1)
+            counter.increment()
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store) == 50
+    assert counter.value == 16_000
+
+
+def test_import_graph_queries_never_see_a_half_built_graph(tmp_path):
+    (tmp_path / "core.py").write_text("X = 1\n", encoding="utf-8")
+    for i in range(100):
+        (tmp_path / f"test_{i}.py").write_text("import core\n", encoding="utf-8")
+    graph = ImportGraph(tmp_path, [])
+    expected = graph.affected_tests(["core.py"])
+    assert len(expected) == 100
+    stop = threading.Event()
+
+    def churn() -> None:
+        # Every edit forces refresh() to rebuild the edge maps.
+        i = 0
+        while not stop.is_set():
+            i += 1
+            (tmp_path / "other.py").write_text("#" * (i % 50 + 1), encoding="utf-8")
+
+    # Switch threads often so a query would land inside a rebuild.
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: graph.affected_tests(["core.py"]), range(200)))
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(previous)
+    assert all(result == expected for result in results)
+
+
+def test_read_tool_bindings_run_in_parallel(tmp_path, monkeypatch):
+    pytest.importorskip("mcp")
+    import anyio
+    from mcp.server.fastmcp import FastMCP
+
+    from workspace_mcp import server
+
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    gov = Governor(PolicyConfig(workspace_root=str(tmp_path)))
+    # Each call waits for the other: run one at a time on the event loop, the
+    # first would time out at the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def read_file_in_step(governor, path, *args, **kwargs):
+        barrier.wait()
+        return read_file(governor, path, *args, **kwargs)
+
+    monkeypatch.setattr(server, "_read_file", read_file_in_step)
+    mcp = FastMCP("workspace-mcp-test")
+    server._bind_tools(mcp, gov)
+
+    async def main() -> None:
+        async with anyio.create_task_group() as tg:
+            for _ in range(2):
+                tg.start_soon(mcp.call_tool, "read_file", {"path": "a.txt"})
+
+    try:
+        anyio.run(main)
+    finally:
+        gov.close()
+    assert not barrier.broken
+
+
+def test_offloaded_run_task_and_inline_tools_share_a_run_safely(tmp_path):
+    # The server runs run_task on a worker thread while other tools keep running
+    # on the event loop thread; both audit into the same run and stores.
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"chatty": [sys.executable, "-c", "for i in range(200): print(i)"]},
+        max_audit_logs=1000,
+    )
+    gov = Governor(cfg, audit_async=True)
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    streamed = []
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            tasks = [pool.submit(run_task, gov, "chatty", run_id=run_id, owner_id="alice", on_output=streamed.extend) for _ in range(4)]
+            reads = [read_file(gov, "a.txt", run_id=run_id, owner_id="alice") for _ in range(200)]
+            results = [t.result() for t in tasks]
+    finally:
+        sys.setswitchinterval(previous)
+
+    assert all(r.data["exit_code"] == 0 for r in results) and len(streamed) == 800
+    summary = get_run_summary(gov, run_id, owner_id="alice").data
+    assert summary["tool_counts"] == {"run_task": 4, "read_file": 200}
+    assert summary["allowed_count"] == 204
+    gov.flush_audit()
+    assert all(gov.audit_logs.get(r.meta["audit_id"]) is not None for r in reads)
+    assert all("duration_ms" in gov.audit_logs.get(r.meta["audit_id"]) for r in results)
+    gov.close()
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.run_lifecycle import start_run
+from workspace_mcp.tools.workspace_info import workspace_info
+
+
+def _governor(tmp_path: Path) -> Governor:
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["src"],
+        deny_globs=["*.env"],
+        allow_tasks={"echo": ["echo", "ok"]},
+    )
+    return Governor(cfg)
+
+
+def test_repeated_decisions_hit_the_cache_but_are_still_audited(tmp_path):
+    gov = _governor(tmp_path)
+    ids = [gov.validate_action("read_file", "read", {"path": "src/a.py"}).audit_id for _ in range(3)]
+    assert all(gov.audit_logs.get(audit_id)["decision"] == "allowed" for audit_id in ids)
+
+    # "./src/a.py" normalizes to the same key.
+    assert gov.validate_action("read_file", "read", {"path": "./src/a.py"}).allowed
+    stats = gov.stats()["decision_cache"]
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["hit_ratio"] == 0.75
+
+
+def test_cached_blocks_echo_the_callers_arguments(tmp_path):
+    gov = _governor(tmp_path)
+    first = gov.validate_action("apply_patch", "write", {"paths": ["src/a.py", "prod.env"]})
+    second = gov.validate_action("apply_patch", "write", {"paths": ["./prod.env", "src/a.py"]})
+    assert first.violation["key"] == second.violation["key"] == "PATH_MATCHES_DENY_GLOBS"
+    assert second.violation["details"] == {"paths": ["./prod.env", "src/a.py"]}
+    assert gov.stats()["decision_cache"]["hits"] == 1
+
+    outside = gov.validate_action("read_file", "read", {"path": "docs/x.md"})
+    assert outside.violation["key"] == "PATH_OUTSIDE_ALLOW_PATHS"
+    assert outside.violation["details"] == {"path": "docs/x.md"}
+    assert gov.validate_action("run_task", "execute", {"task_name": "rm"}).violation["key"] == "TASK_NOT_ALLOWLISTED"
+
+
+def test_run_checks_are_not_cached(tmp_path):
+    gov = _governor(tmp_path)
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    assert gov.validate_action("read_file", "read", {"path": "src/a.py"}, run_id=run_id, owner_id="alice").allowed
+    other = gov.validate_action("read_file", "read", {"path": "src/a.py"}, run_id=run_id, owner_id="mallory")
+    assert other.violation["key"] == "RUN_NOT_FOUND"
+    assert gov.runs.get(run_id).allowed_count == 1
+
+
+def test_workspace_info_reports_governor_stats(tmp_path):
+    gov = _governor(tmp_path)
+    read_file(gov, "a.txt")
+    stats = workspace_info(gov).data["governor_stats"]
+    assert stats["decision_cache"]["misses"] >= 1
@@ -0,0 +1,122 @@
+import copy
+import hashlib
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+import workspace_mcp
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.apply_patch import apply_patch, validate_patch
+from workspace_mcp.tools.change_bundle import create_change_bundle
+from workspace_mcp.tools.diff_upload import begin_diff_upload, append_diff_chunk, commit_diff_upload
+from workspace_mcp.tools.explain_policy import explain_policy_decision
+from workspace_mcp.policy_loader import POSITIVE_INT_PROFILE_KEYS, _validate_profile
+
+KERNEL_POLICY = Path(workspace_mcp.__file__).with_name("policies") / "kernel_policy.yaml"
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "app.py").write_text("a\nb\nc\n", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(root), allow_paths=["."], deny_globs=["*.env"], max_diff_upload_bytes=512)
+    return Governor(cfg)
+
+
+DIFF = """--- a/app.py
++++ b/app.py
+@@ -1,3 +1,3 @@
+ a
+-b
++B
+ c
+"""
+
+
+def _upload(governor, text, size=16, owner_id="owner-a"):
+    upload_id = begin_diff_upload(governor, owner_id=owner_id).data["upload_id"]
+    for seq, start in enumerate(range(0, len(text), size)):
+        res = append_diff_chunk(governor, upload_id, seq, text[start:start + size], owner_id=owner_id)
+        assert res.status == "ok"
+    return upload_id
+
+
+def test_handle_produces_same_bundle_as_inline_diff(governor_instance):
+    upload_id = _upload(governor_instance, DIFF)
+    digest = hashlib.sha256(DIFF.encode("utf-8")).hexdigest()
+    committed = commit_diff_upload(governor_instance, upload_id, sha256=digest, owner_id="owner-a")
+    assert committed.status == "ok"
+    assert committed.data["sha256"] == digest
+    handle = committed.data["diff_handle"]
+
+    via_handle = create_change_bundle(governor_instance, diff_handle=handle, owner_id="owner-a")
+    inline = create_change_bundle(governor_instance, DIFF, owner_id="owner-a")
+    assert via_handle.status == "ok"
+    assert via_handle.data["bundle_id"] == inline.data["bundle_id"]
+
+    assert validate_patch(governor_instance, "app.py", diff_handle=handle, owner_id="owner-a").status == "ok"
+    # Other owners cannot see the handle.
+    assert create_change_bundle(governor_instance, diff_handle=handle, owner_id="owner-b").code == "not_found"
+
+
+def test_blocked_bundle_from_handle_does_not_read_the_upload(governor_instance, monkeypatch):
+    denied = DIFF.replace("app.py", "secret.env")
+    upload_id = _upload(governor_instance, denied)
+    handle = commit_diff_upload(governor_instance, upload_id, owner_id="owner-a").data["diff_handle"]
+    upload = governor_instance.uploads.get(handle)
+
+    def fail():
+        raise AssertionError("upload read before validation")
+
+    monkeypatch.setattr(upload, "read_text", fail)
+    res = create_change_bundle(governor_instance, diff_handle=handle, owner_id="owner-a")
+    assert res.status == "blocked"
+
+
+@pytest.mark.skipif(shutil.which("patch") is None, reason="patch binary not available")
+def test_apply_patch_from_handle(governor_instance):
+    upload_id = _upload(governor_instance, DIFF)
+    commit_diff_upload(governor_instance, upload_id, owner_id="owner-a")
+    res = apply_patch(governor_instance, diff_handle=upload_id, owner_id="owner-a")
+    assert res.status == "ok"
+    assert (governor_instance.root / "app.py").read_text(encoding="utf-8") == "a\nB\nc\n"
+
+
+def test_out_of_order_chunk_is_rejected(governor_instance):
+    upload_id = begin_diff_upload(governor_instance).data["upload_id"]
+    res = append_diff_chunk(governor_instance, upload_id, 1, DIFF)
+    assert res.code == "invalid_input"
+    assert res.data["key"] == "UPLOAD_SEQUENCE_MISMATCH"
+    assert append_diff_chunk(governor_instance, upload_id, 0, DIFF).status == "ok"
+
+
+def test_upload_size_cap_blocks_and_discards(governor_instance):
+    upload_id = begin_diff_upload(governor_instance).data["upload_id"]
+    res = append_diff_chunk(governor_instance, upload_id, 0, "x" * 600)
+    assert res.status == "blocked"
+    assert res.data["policy_violation"]["key"] == "UPLOAD_EXCEEDS_MAX_BYTES"
+    assert governor_instance.uploads.get(upload_id) is None
+
+    explained = explain_policy_decision(governor_instance, res.meta["audit_id"])
+    assert explained.data["rule_triggered"] == "UPLOAD_EXCEEDS_MAX_BYTES"
+
+
+def test_digest_mismatch_discards_upload(governor_instance):
+    upload_id = _upload(governor_instance, DIFF)
+    res = commit_diff_upload(governor_instance, upload_id, sha256="0" * 64, owner_id="owner-a")
+    assert res.code == "invalid_input"
+    assert res.data["key"] == "UPLOAD_DIGEST_MISMATCH"
+    assert apply_patch(governor_instance, diff_handle=upload_id, owner_id="owner-a").code == "not_found"
+
+
+@pytest.mark.parametrize("key", sorted(POSITIVE_INT_PROFILE_KEYS))
+def test_store_sizes_and_ttls_must_be_positive(key):
+    kernel = yaml.safe_load(KERNEL_POLICY.read_text(encoding="utf-8"))
+    profile = copy.deepcopy(kernel["profiles"]["dev"])
+    profile[key] = 0
+    # Governor would fail on this later with "max_size must be > 0".
+    with pytest.raises(ValueError, match=f"{key} must be a positive integer"):
+        _validate_profile("dev", profile, strict=True)
@@ -0,0 +1,39 @@
+from workspace_mcp.diffs import parse_unified_diff
+
+
+def test_parse_counts_hunks_and_lines():
+    diff = """--- a/app.py
++++ b/app.py
+@@ -1,3 +1,3 @@
+ import os
+--- removed dashes line
++++ added plus line
+ print(os.name)
+@@ -10 +10,2 @@
+-x = 1
++x = 2
++y = 3
+"""
+    files = parse_unified_diff(diff)
+    assert len(files) == 1
+    file_diff = files[0]
+    assert file_diff.path == "app.py"
+    assert len(file_diff.hunks) == 2
+    assert file_diff.lines_added == 3
+    assert file_diff.lines_removed == 2
+    assert (file_diff.hunks[1].old_start, file_diff.hunks[1].old_len) == (10, 1)
+
+
+def test_parse_new_file_and_binary_sections():
+    diff = """--- /dev/null
++++ b/new.txt
+@@ -0,0 +1 @@
++hello
+diff --git a/logo.png b/logo.png
+Binary files a/logo.png and b/logo.png differ
+"""
+    files = parse_unified_diff(diff)
+    assert [f.path for f in files] == ["new.txt", "logo.png"]
+    assert files[0].old_path is None
+    assert files[1].binary is True
+    assert files[1].hunks == []
@@ -0,0 +1,145 @@
+import os
+import sys
+
+import pytest
+from workspace_mcp import import_graph
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.import_graph import ImportGraph
+from workspace_mcp.task_cache import matching_files
+from workspace_mcp.tools.apply_patch import apply_patch
+from workspace_mcp.tools.change_bundle import bundle_report, create_change_bundle
+from workspace_mcp.tools.run_lifecycle import start_run
+from workspace_mcp.tools.run_task import run_task
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    _write(tmp_path, "src/pkg/__init__.py", "")
+    _write(tmp_path, "src/pkg/core.py", "VALUE = 1\n")
+    _write(tmp_path, "src/pkg/api.py", "from .core import VALUE\n")
+    _write(tmp_path, "src/pkg/util.py", "import os\n")
+    _write(tmp_path, "tests/test_api.py", "from pkg.api import VALUE\n\ndef test_value():\n    assert VALUE == 1\n")
+    _write(tmp_path, "tests/test_util.py", "import pkg.util\n\ndef test_util():\n    pass\n")
+    _write(tmp_path, "web/lib/math.ts", "export const add = (a: number, b: number) => a + b;\n")
+    _write(tmp_path, "web/lib/index.ts", "export * from './math';\n")
+    _write(tmp_path, "web/app.test.ts", "import { add } from './lib';\n")
+    _write(tmp_path, "web/other.spec.js", "const x = require('./lib/other.js');\n")
+    return tmp_path
+
+
+def test_reverse_closure_and_incremental_refresh(workspace):
+    graph = ImportGraph(workspace, ["**/.git/**"])
+    assert graph.affected_tests(["src/pkg/core.py"]) == ["tests/test_api.py"]
+    assert graph.affected_tests(["web/lib/math.ts"]) == ["web/app.test.ts"]
+    assert graph.affected(["src/pkg/util.py"]) == ["src/pkg/util.py", "tests/test_util.py"]
+    parsed = graph.parsed_files
+
+    # Only the edited file is re-parsed; the new edge is visible immediately.
+    _write(workspace, "src/pkg/util.py", "from . import core\n")
+    stat = os.stat(workspace / "src/pkg/util.py")
+    os.utime(workspace / "src/pkg/util.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert graph.affected_tests(["src/pkg/core.py"]) == ["tests/test_api.py", "tests/test_util.py"]
+    assert graph.parsed_files == parsed + 1
+
+    _write(workspace, "tests/conftest.py", "")
+    assert graph.affected_tests(["tests/conftest.py"]) == ["tests/test_api.py", "tests/test_util.py"]
+
+
+def test_bundle_report_and_changed_only_run(workspace):
+    cfg = PolicyConfig(
+        workspace_root=str(workspace),
+        allow_paths=["."],
+        allow_tasks={"test": [sys.executable, "-c", "import sys; print(sys.argv[1:])"]},
+        task_options={"test": {"changed_only": True}},
+    )
+    governor = Governor(cfg)
+    diff = "--- a/src/pkg/core.py\n+++ b/src/pkg/core.py\n@@ -1 +1 @@\n-VALUE = 1\n+VALUE = 2\n"
+
+    bundle = create_change_bundle(governor, diff, owner_id="owner1")
+    report = bundle_report(governor, bundle.data["bundle_id"], owner_id="owner1")
+    assert report.data["affected_tests"] == ["tests/test_api.py"]
+    assert "tests/test_api.py" in report.data["test_recommendations"][0]
+
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+    skipped = run_task(governor, "test", run_id=run_id, owner_id="owner1", changed_only=True)
+    assert skipped.data["skipped"] is True and skipped.data["selected_tests"] == []
+    assert skipped.data["exit_code"] is None  # nothing ran; not a pass
+
+    assert apply_patch(governor, diff, run_id=run_id, owner_id="owner1").status == "ok"
+    assert governor.runs.get(run_id).changed_files == ["src/pkg/core.py"]
+    res = run_task(governor, "test", run_id=run_id, owner_id="owner1", changed_only=True)
+    assert res.data["selected_tests"] == ["tests/test_api.py"]
+    assert res.data["stdout"].strip() == "['tests/test_api.py']"
+
+
+def test_changed_only_requires_opt_in(workspace):
+    cfg = PolicyConfig(workspace_root=str(workspace), allow_paths=["."], allow_tasks={"lint": [sys.executable, "-c", "pass"]})
+    governor = Governor(cfg)
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+    res = run_task(governor, "lint", run_id=run_id, owner_id="owner1", changed_only=True)
+    assert res.code == "invalid_input"
+    assert res.data["key"] == "CHANGED_ONLY_NOT_SUPPORTED"
+
+
+def test_changed_only_runs_everything_when_a_change_is_invisible_to_the_graph(workspace):
+    _write(workspace, "tests/data.json", "{}\n")
+    cfg = PolicyConfig(
+        workspace_root=str(workspace),
+        allow_paths=["."],
+        allow_tasks={"test": [sys.executable, "-c", "import sys; print(sys.argv[1:])"]},
+        task_options={"test": {"changed_only": True}},
+    )
+    governor = Governor(cfg)
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+    diff = "--- a/tests/data.json\n+++ b/tests/data.json\n@@ -1 +1 @@\n-{}\n+{\"a\": 1}\n"
+    assert apply_patch(governor, diff, run_id=run_id, owner_id="owner1").status == "ok"
+
+    res = run_task(governor, "test", run_id=run_id, owner_id="owner1", changed_only=True)
+    assert res.data["changed_only_fallback"] is True
+    assert "selected_tests" not in res.data
+    assert res.data["exit_code"] == 0 and res.data["stdout"].strip() == "[]"
+
+
+def test_changed_only_selects_only_tests_matching_the_task_inputs(workspace):
+    cfg = PolicyConfig(
+        workspace_root=str(workspace),
+        allow_paths=["."],
+        allow_tasks={"test": [sys.executable, "-c", "import sys; print(sys.argv[1:])"]},
+        task_options={"test": {"changed_only": True, "inputs": ["**/*.py"]}},
+    )
+    governor = Governor(cfg)
+    diff = "--- a/web/lib/math.ts\n+++ b/web/lib/math.ts\n@@ -1 +1 @@\n-export const add = (a: number, b: number) => a + b;\n+export const add = (a: number, b: number) => b + a;\n"
+    bundle_id = create_change_bundle(governor, diff, owner_id="owner1").data["bundle_id"]
+
+    # web/app.test.ts is affected, but a pytest task has nothing to run for it.
+    res = run_task(governor, "test", owner_id="owner1", changed_only=True, bundle_id=bundle_id)
+    assert res.data["skipped"] is True and res.data["selected_tests"] == []
+    assert res.data["exit_code"] is None
+
+
+def test_refresh_skips_vendored_trees_and_runs_once_per_selection(workspace, monkeypatch):
+    _write(workspace, ".venv/lib/site-packages/dep.py", "import pkg.core\n")
+    _write(workspace, "env/pyvenv.cfg", "home = /usr/bin\n")
+    _write(workspace, "env/lib/test_vendored.py", "import pkg.core\n")
+    _write(workspace, "web/node_modules/lib/index.test.js", "require('../../lib/math.ts');\n")
+    graph = ImportGraph(workspace, [])
+    graph.refresh()
+    assert not [rel for rel in graph._stats if rel.startswith((".venv/", "env/", "web/node_modules/"))]
+
+    walks = []
+
+    def counting_walk(*args):
+        walks.append(args)
+        return matching_files(*args)
+
+    monkeypatch.setattr(import_graph, "matching_files", counting_walk)
+    assert graph.select_tests(["src/pkg/core.py"]) == ["tests/test_api.py"]
+    assert graph.select_tests(["src/pkg/core.py", "README.md"]) is None
+    assert len(walks) == 2
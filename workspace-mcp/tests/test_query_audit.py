@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from workspace_mcp.audit_index import AuditIndex
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.tools.query_audit import query_audit
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.run_lifecycle import start_run
+
+
+def _governor(tmp_path: Path, **kwargs) -> Governor:
+    root = tmp_path / "project"
+    root.mkdir(exist_ok=True)
+    (root / "a.txt").write_text("hello", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(root), allow_paths=["."], deny_globs=["*.env"])
+    return Governor(cfg, **kwargs)
+
+
+def test_filters_are_owner_scoped_and_paged(tmp_path):
+    gov = _governor(tmp_path)
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    for _ in range(3):
+        read_file(gov, "prod.env", run_id=run_id, owner_id="alice")
+    read_file(gov, "a.txt", run_id=run_id, owner_id="alice")
+    read_file(gov, "prod.env", owner_id="bob")
+
+    page = query_audit(gov, run_id=run_id, tool="read_file", decision="blocked", limit=2, owner_id="alice")
+    assert [e["violation_key"] for e in page.data["entries"]] == ["PATH_MATCHES_DENY_GLOBS"] * 2
+    assert all(e["run_id"] == run_id for e in page.data["entries"])
+    rest = query_audit(gov, run_id=run_id, tool="read_file", decision="blocked", cursor=page.data["next_cursor"], owner_id="alice")
+    assert len(rest.data["entries"]) == 1 and rest.data["next_cursor"] is None
+
+    assert len(query_audit(gov, violation_key="PATH_MATCHES_DENY_GLOBS", owner_id="bob").data["entries"]) == 1
+    # Anonymous callers only see owner-less entries.
+    assert query_audit(gov, tool="read_file").data["entries"] == []
+    assert query_audit(gov, cursor="nope").code == "invalid_input"
+
+
+def test_time_range_and_index_from_journal(tmp_path):
+    gov = _governor(tmp_path, audit_dir=tmp_path / "audit")
+    read_file(gov, "prod.env", owner_id="alice")
+    stamp = query_audit(gov, owner_id="alice").data["entries"][0]["timestamp"]
+
+    restarted = _governor(tmp_path, audit_dir=tmp_path / "audit")
+    found = query_audit(restarted, code="blocked", since=stamp, until=stamp, owner_id="alice").data["entries"]
+    assert len(found) == 1 and found[0]["duration_ms"] is not None
+    assert query_audit(restarted, since="2999-01-01T00:00:00Z", owner_id="alice").data["entries"] == []
+
+
+def test_reindexed_updates_and_bounded_size():
+    index = AuditIndex(max_entries=3)
+    base = {"timestamp": "2026-01-01T00:00:00Z", "tool": "t", "decision": "allowed", "code": "success"}
+    for i in range(5):
+        index.add({**base, "audit_id": str(i)})
+    assert len(index) == 3
+    # A post-validation block moves the entry to the blocked postings.
+    index.add({**base, "audit_id": "4", "decision": "blocked", "code": "blocked", "violation": {"key": "TASK_QUEUE_FULL"}})
+    blocked, _ = index.query({"decision": "blocked"})
+    assert [r["audit_id"] for r in blocked] == ["4"]
+    allowed, _ = index.query({"decision": "allowed"})
+    assert [r["audit_id"] for r in allowed] == ["2", "3"]
@@ -0,0 +1,131 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.policy_loader import _validate_rate_limits
+from workspace_mcp.rate_limits import RateLimiter
+from workspace_mcp.tools.explain_policy import explain_policy_decision
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.repo_search import repo_search
+from workspace_mcp.tools.run_lifecycle import end_run, start_run
+from workspace_mcp.tools.run_task import run_task
+from workspace_mcp.tools.task_output import read_task_output
+
+
+def _governor(tmp_path: Path, rate_limits) -> Governor:
+    (tmp_path / "a.txt").write_text("x" * 100, encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(tmp_path), rate_limits=rate_limits)
+    return Governor(cfg)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = _Clock()
+    limiter = RateLimiter({"per_owner": {"calls_per_minute": 60, "burst": 2}}, clock=clock)
+    key = [("per_owner", "h")]
+    assert limiter.check(key) is None
+    assert limiter.check(key) is None
+    exceeded = limiter.check(key)
+    assert exceeded["scope"] == "per_owner" and exceeded["limit"] == "calls_per_minute"
+    assert exceeded["retry_after_seconds"] == 1.0
+
+    clock.now = 1.0
+    assert limiter.check(key) is None
+    # Other owners have their own bucket.
+    assert limiter.check([("per_owner", "other")]) is None
+    assert limiter.stats() == {"enabled": True, "tracked_keys": 2, "limited": 1}
+
+
+def test_quotas_are_charged_after_the_fact_and_refused_once_used_up():
+    limiter = RateLimiter({"per_run": {"max_calls": 3, "max_bytes_read": 100}})
+    keys = [("per_owner", "h"), ("per_run", "r1")]
+    assert limiter.check(keys) is None
+    limiter.charge(keys, bytes_read=150)
+    exceeded = limiter.check(keys)
+    assert exceeded == {"scope": "per_run", "limit": "max_bytes_read", "value": 100, "used": 150, "retry_after_seconds": None}
+    # A refused call is not counted; another run starts fresh.
+    assert limiter.usage(("per_run", "r1")) == {"calls": 1, "bytes_read": 150, "task_cpu_seconds": 0.0}
+    assert limiter.check([("per_owner", "h"), ("per_run", "r2")]) is None
+    # Unlimited scopes are not tracked at all.
+    assert limiter.usage(("per_owner", "h")) is None
+
+
+def test_a_call_refused_by_one_scope_is_not_counted_by_the_others():
+    limiter = RateLimiter({"per_owner": {"max_calls": 5}, "per_run": {"max_calls": 1}})
+    assert limiter.check([("per_owner", "h"), ("per_run", "r1")]) is None
+    assert limiter.check([("per_owner", "h"), ("per_run", "r1")])["scope"] == "per_run"
+    assert limiter.usage(("per_owner", "h"))["calls"] == 1
+
+
+def test_validate_action_returns_rate_limited_and_explains_it(tmp_path):
+    gov = _governor(tmp_path, {"per_run": {"max_calls": 2, "max_bytes_read": 150}})
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    assert read_file(gov, "a.txt", run_id=run_id, owner_id="alice").status == "ok"
+    assert read_file(gov, "a.txt", run_id=run_id, owner_id="alice").status == "ok"
+
+    res = read_file(gov, "a.txt", run_id=run_id, owner_id="alice")
+    assert res.status == "blocked"
+    violation = res.data["policy_violation"]
+    assert violation["key"] == "RATE_LIMITED"
+    assert violation["details"]["limit"] == "max_calls"
+    assert violation["config_path"] == "profiles.dev.rate_limits.per_run.max_calls"
+
+    explained = explain_policy_decision(gov, res.meta["audit_id"], owner_id="alice")
+    assert explained.data["rule_triggered"] == "RATE_LIMITED"
+    assert "max_calls quota (2 of 2)" in explained.data["evidence"]
+
+    # Winding down a run is never refused.
+    assert end_run(gov, run_id, owner_id="alice").status == "ok"
+    assert gov.stats()["rate_limits"]["limited"] == 1
+
+
+def test_bytes_read_quota_blocks_the_next_read(tmp_path):
+    gov = _governor(tmp_path, {"per_owner": {"max_bytes_read": 150}})
+    assert read_file(gov, "a.txt", owner_id="bob").status == "ok"
+    assert read_file(gov, "a.txt", owner_id="bob").status == "ok"
+    res = read_file(gov, "a.txt", owner_id="bob")
+    assert res.data["policy_violation"]["details"]["limit"] == "max_bytes_read"
+    assert read_file(gov, "a.txt", owner_id="carol").status == "ok"
+
+
+def test_searches_and_task_output_reads_are_charged(tmp_path):
+    gov = _governor(tmp_path, {"per_owner": {"max_bytes_read": 100}})
+    # Either engine charges at least the 100-byte file: rg its output, the fallback the bytes scanned.
+    assert repo_search(gov, "x", owner_id="bob").status == "ok"
+    res = repo_search(gov, "x", owner_id="bob")
+    assert res.data["policy_violation"]["details"]["limit"] == "max_bytes_read"
+
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_tasks={"noisy": [sys.executable, "-c", "print('y' * 5000)"]},
+        max_output_bytes=200,
+        rate_limits={"per_owner": {"max_bytes_read": 1000}},
+    )
+    gov = Governor(cfg)
+    owner_key = gov._rate_limit_keys(None, "bob")[0]
+    audit_id = run_task(gov, "noisy", owner_id="bob").meta["audit_id"]
+    read_task_output(gov, audit_id, length=150, owner_id="bob")
+    assert gov.rate_limiter.usage(owner_key)["bytes_read"] == 150
+    # A grep is charged for everything it scanned, matches or not.
+    read_task_output(gov, audit_id, grep="z", owner_id="bob")
+    assert gov.rate_limiter.usage(owner_key)["bytes_read"] == 150 + 5001
+
+
+def test_policy_validation_rejects_unknown_or_negative_limits():
+    _validate_rate_limits("dev", {"per_owner": {"calls_per_minute": 10}})
+    with pytest.raises(ValueError, match="Unknown keys in rate_limits"):
+        _validate_rate_limits("dev", {"per_tool": {}})
+    with pytest.raises(ValueError, match="Unknown keys in rate_limits.per_run"):
+        _validate_rate_limits("dev", {"per_run": {"max_files": 1}})
+    with pytest.raises(ValueError, match="non-negative"):
+        _validate_rate_limits("dev", {"per_run": {"max_calls": -1}})
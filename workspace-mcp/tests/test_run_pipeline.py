@@ -0,0 +1,98 @@
+import sys
+
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.policy_loader import _validate_task_options
+from workspace_mcp.tools.run_lifecycle import get_run_summary, start_run
+from workspace_mcp.tools.run_pipeline import run_pipeline
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+
+
+def _governor(tmp_path, allow_tasks, task_options, parallelism=2):
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks=allow_tasks,
+        task_options=task_options,
+        max_runtime_seconds=10,
+        max_pipeline_parallelism=parallelism,
+    )
+    return Governor(cfg)
+
+
+def test_independent_dependencies_run_in_parallel(tmp_path):
+    governor = _governor(
+        tmp_path,
+        {"lint": SLEEP, "typecheck": SLEEP, "test": [sys.executable, "-c", "print('ok')"]},
+        {"test": {"depends_on": ["lint", "typecheck"]}},
+    )
+    res = run_pipeline(governor, "test")
+    assert res.status == "ok"
+    assert res.data["status"] == "succeeded"
+    assert res.data["order"] == ["lint", "typecheck", "test"]
+
+    nodes = res.data["nodes"]
+    assert all(nodes[name]["status"] == "succeeded" for name in res.data["order"])
+    # lint and typecheck overlap; test waits for both.
+    assert nodes["typecheck"]["start_offset_seconds"] < nodes["lint"]["start_offset_seconds"] + nodes["lint"]["duration_seconds"]
+    assert nodes["test"]["start_offset_seconds"] >= max(
+        nodes[n]["start_offset_seconds"] + nodes[n]["duration_seconds"] for n in ("lint", "typecheck")
+    ) - 0.01
+    assert nodes["test"]["audit_id"] != nodes["lint"]["audit_id"]
+
+
+def test_failure_skips_downstream_nodes(tmp_path):
+    governor = _governor(
+        tmp_path,
+        {
+            "build": [sys.executable, "-c", "raise SystemExit(3)"],
+            "docs": [sys.executable, "-c", "print('docs')"],
+            "test": [sys.executable, "-c", "print('test')"],
+            "deploy": [sys.executable, "-c", "print('deploy')"],
+        },
+        {"test": {"depends_on": ["build"]}, "deploy": {"depends_on": ["test", "docs"]}},
+    )
+    res = run_pipeline(governor, "deploy")
+    nodes = res.data["nodes"]
+    assert res.data["status"] == "failed"
+    assert nodes["build"]["status"] == "failed" and nodes["build"]["exit_code"] == 3
+    assert nodes["docs"]["status"] == "succeeded"
+    assert nodes["test"] == {"status": "skipped", "skipped_because": ["build"], "start_offset_seconds": None, "duration_seconds": 0.0}
+    assert nodes["deploy"]["skipped_because"] == ["test"]
+    assert res.data["failed"] == ["build"]
+    assert res.data["skipped"] == ["test", "deploy"]
+
+
+def test_unknown_target_is_blocked(tmp_path):
+    governor = _governor(tmp_path, {"lint": SLEEP}, {})
+    res = run_pipeline(governor, "missing")
+    assert res.status == "blocked"
+
+
+def test_dependency_cycles_are_rejected_at_load():
+    tasks = {"a": ["true"], "b": ["true"], "c": ["true"]}
+    options = {"a": {"depends_on": ["b"]}, "b": {"depends_on": ["c"]}, "c": {"depends_on": ["a"]}}
+    with pytest.raises(ValueError, match="cycle.*a -> b -> c -> a"):
+        _validate_task_options("dev", options, tasks, strict=True)
+    with pytest.raises(ValueError, match="unknown tasks"):
+        _validate_task_options("dev", {"a": {"depends_on": ["nope"]}}, tasks, strict=True)
+
+
+def test_parallel_nodes_account_into_one_run(tmp_path):
+    quick = [sys.executable, "-c", "print('ok')"]
+    tasks = {f"t{i}": quick for i in range(8)}
+    tasks["all"] = quick
+    governor = _governor(tmp_path, tasks, {"all": {"depends_on": [f"t{i}" for i in range(8)]}}, parallelism=8)
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+
+    res = run_pipeline(governor, "all", run_id=run_id, owner_id="owner1")
+    assert res.data["status"] == "succeeded"
+
+    summary = get_run_summary(governor, run_id, owner_id="owner1").data
+    assert summary["tool_counts"] == {"run_pipeline": 1, "run_task": 9}
+    assert summary["allowed_count"] == 10
+    with governor.run_lock(run_id):
+        assert set(governor.runs.get(run_id).task_results) == set(tasks)
+    assert all(governor.get_audit(node["audit_id"]) is not None for node in res.data["nodes"].values())
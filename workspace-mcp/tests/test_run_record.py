@@ -0,0 +1,61 @@
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.governor import Governor
+from workspace_mcp.run_record import RunRecord, intern_tool, tool_name
+from workspace_mcp.tools import run_lifecycle
+from workspace_mcp.tools.read_file import read_file
+from workspace_mcp.tools.run_lifecycle import get_run_summary, start_run
+
+
+def test_record_keeps_counters_and_a_packed_sequence():
+    run = RunRecord("r1", "h", {}, 0.0)
+    for tool, allowed in [("read_file", True), ("read_file", True), ("apply_patch", False), ("read_file", True)]:
+        run.record_call(tool, "read" if tool == "read_file" else "write", allowed)
+
+    assert run._tool_ids.typecode == "H" and run.call_count == 4
+    assert (run.allowed_count, run.blocked_count) == (3, 1)
+    assert run.risk_distribution == {"read": 3, "write": 1}
+    assert run.tool_counts() == {"read_file": 3, "apply_patch": 1}
+    assert run.tool_sequence(1, 2) == ["read_file", "apply_patch"]
+    assert run.tool_sequence_rle() == [("read_file", 2), ("apply_patch", 1), ("read_file", 1)]
+    assert run.tool_sequence_rle(1, 10) == [("read_file", 1), ("apply_patch", 1), ("read_file", 1)]
+    assert tool_name(intern_tool("read_file")) == "read_file"
+
+
+def test_summary_pages_through_the_sequence(tmp_path):
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    gov = Governor(PolicyConfig(workspace_root=str(tmp_path), max_audit_logs=100))
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    for _ in range(5):
+        read_file(gov, "a.txt", run_id=run_id, owner_id="alice")
+
+    first = get_run_summary(gov, run_id, owner_id="alice", limit=3).data
+    assert first["tool_sequence"] == ["read_file"] * 3
+    assert (first["tool_sequence_length"], first["tool_sequence_next_cursor"]) == (5, 3)
+    assert first["tool_counts"] == {"read_file": 5} and first["allowed_count"] == 5
+
+    rest = get_run_summary(gov, run_id, owner_id="alice", cursor=3, limit=3).data
+    assert rest["tool_sequence"] == ["read_file"] * 2
+    assert rest["tool_sequence_next_cursor"] is None
+
+    packed = get_run_summary(gov, run_id, owner_id="alice", rle=True).data
+    assert packed["tool_sequence"] == [["read_file", 5]]
+
+
+def test_summary_pages_are_bounded(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_text("hello", encoding="utf-8")
+    gov = Governor(PolicyConfig(workspace_root=str(tmp_path), max_audit_logs=100))
+    run_id = start_run(gov, owner_id="alice").data["run_id"]
+    for _ in range(3):
+        read_file(gov, "a.txt", run_id=run_id, owner_id="alice")
+    monkeypatch.setattr(run_lifecycle, "MAX_SEQUENCE_PAGE", 2)
+    monkeypatch.setattr(run_lifecycle, "MAX_SUMMARY_CHANGED_FILES", 1)
+    with gov.run_lock(run_id):
+        gov.runs.get(run_id).changed_files.extend(["a.py", "b.py"])
+
+    huge = get_run_summary(gov, run_id, owner_id="alice", limit=10**9).data
+    assert len(huge["tool_sequence"]) == 2 and huge["tool_sequence_next_cursor"] == 2
+    assert huge["changed_files"] == ["a.py"] and huge["changed_files_count"] == 2
+
+    # A zero limit still advances the cursor.
+    empty = get_run_summary(gov, run_id, owner_id="alice", cursor=1, limit=0).data
+    assert empty["tool_sequence"] == ["read_file"] and empty["tool_sequence_next_cursor"] == 2
@@ -0,0 +1,125 @@
+import sys
+
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.policy_loader import load_effective_policy
+from workspace_mcp.tools.run_task import run_task
+
+EMIT = "import sys\nfor i in range(120):\n    print(f'line {i}')\nprint('oops', file=sys.stderr)\n"
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={
+            "emit": [sys.executable, "-c", EMIT],
+            "sleep": [sys.executable, "-c", "import time; time.sleep(5)"],
+        },
+        max_runtime_seconds=1,
+        max_output_bytes=64,
+    )
+    return Governor(cfg)
+
+
+def test_output_is_streamed_in_batches(governor_instance):
+    batches = []
+    res = run_task(governor_instance, "emit", on_output=batches.append)
+    assert res.status == "ok"
+    assert res.data["exit_code"] == 0
+
+    streamed = [pair for batch in batches for pair in batch]
+    assert [line for stream, line in streamed if stream == "stdout"] == [f"line {i}" for i in range(120)]
+    assert ("stderr", "oops") in streamed
+    assert all(len(batch) <= 50 for batch in batches)
+
+    # The response keeps only the capped summary.
+    assert res.meta["output_truncated"] is True
+    assert res.data["stdout"].startswith("line 0\n")
+    assert res.data["stdout"].endswith("line 119\n")
+    assert "[TRUNCATED" in res.data["stdout"]
+
+
+def test_timeout_kills_streaming_task(governor_instance):
+    res = run_task(governor_instance, "sleep", on_output=lambda batch: None)
+    assert res.code == "timeout"
+
+
+def test_results_are_cached_by_input_fingerprint(tmp_path):
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"count": [sys.executable, "-c", "import os; print(len(os.listdir('.')))"]},
+        task_options={"count": {"inputs": ["**/*.py"]}},
+    )
+    governor = Governor(cfg)
+
+    first = run_task(governor, "count")
+    assert first.data["cached"] is False
+    second = run_task(governor, "count")
+    assert second.data["cached"] is True
+    assert second.data["stdout"] == first.data["stdout"]
+
+    # Files outside the declared inputs do not invalidate the entry.
+    (tmp_path / "notes.txt").write_text("hi", encoding="utf-8")
+    assert run_task(governor, "count").data["cached"] is True
+
+    (tmp_path / "app.py").write_text("x = 2\n", encoding="utf-8")
+    third = run_task(governor, "count")
+    assert third.data["cached"] is False
+    assert third.data["stdout"].strip() == "2"
+    assert run_task(governor, "count", use_cache=False).data["cached"] is False
+
+
+@pytest.mark.parametrize("profile", ["dev", "ci"])
+def test_kernel_profiles_leave_result_caching_off(tmp_path, profile):
+    # inputs never cover every fixture or data file a test reads; caching is opt-in.
+    cfg = load_effective_policy(profile=profile, project_policy_path=None, strict=True).data
+    assert cfg.task_options["test"]["inputs"]
+    assert not Governor(cfg, workspace_root=tmp_path).task_cache.enabled
+
+
+def test_capture_keeps_head_and_tail_windows(tmp_path):
+    # ~2 MB without a single newline: memory is bounded by the windows, not the output.
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"flood": [sys.executable, "-c", "import sys; sys.stdout.write('a' * 2_000_000 + 'END')"]},
+        max_output_bytes=100,
+    )
+    res = run_task(Governor(cfg), "flood", on_output=lambda batch: None)
+    stats = res.data["output_stats"]["stdout"]
+    assert stats["total_bytes"] == 2_000_003
+    assert stats["head_bytes"] == 50 and stats["tail_bytes"] == 50
+    assert stats["dropped_bytes"] == 2_000_003 - 100
+    assert res.data["stdout"].startswith("a" * 50)
+    assert res.data["stdout"].endswith("END")
+    assert res.meta["output_truncated"] is True
+
+
+def test_rlimits_are_applied_and_rusage_reported(tmp_path):
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={
+            "spin": [sys.executable, "-c", "while True: pass"],
+            "files": [sys.executable, "-c", "import resource; print(resource.getrlimit(resource.RLIMIT_NOFILE)[0])"],
+        },
+        task_options={"spin": {"limits": {"cpu_seconds": 1}}, "files": {"limits": {"open_files": 64}}},
+        max_runtime_seconds=10,
+    )
+    governor = Governor(cfg)
+
+    spin = run_task(governor, "spin")
+    assert spin.status == "ok"
+    assert spin.data["exit_code"] != 0  # SIGXCPU/SIGKILL, well before the wall-clock timeout
+    assert spin.data["rusage"]["user_cpu_seconds"] + spin.data["rusage"]["system_cpu_seconds"] >= 0.9
+
+    files = run_task(governor, "files")
+    assert files.data["stdout"].strip() == "64"
+    usage = files.data["rusage"]
+    assert set(usage) == {"user_cpu_seconds", "system_cpu_seconds", "max_rss_bytes", "block_input_ops", "block_output_ops"}
+    assert usage["max_rss_bytes"] > 0
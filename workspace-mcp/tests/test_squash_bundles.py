@@ -0,0 +1,71 @@
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.change_bundle import create_change_bundle
+from workspace_mcp.tools.squash_bundles import squash_bundles
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "app.py").write_text("a\nb\nc\n", encoding="utf-8")
+    cfg = PolicyConfig(workspace_root=str(root), allow_paths=["."], deny_globs=["*.env"])
+    return Governor(cfg)
+
+
+FIRST = """--- a/app.py
++++ b/app.py
+@@ -1,3 +1,3 @@
+ a
+-b
++B
+ c
+"""
+
+SECOND = """--- a/app.py
++++ b/app.py
+@@ -1,3 +1,4 @@
+ a
+ B
+ c
++d
+--- /dev/null
++++ b/new.txt
+@@ -0,0 +1 @@
++fresh
+"""
+
+
+def test_squash_composes_chain_into_one_canonical_bundle(governor_instance):
+    first = create_change_bundle(governor_instance, FIRST, owner_id="o1").data["bundle_id"]
+    second = create_change_bundle(governor_instance, SECOND, owner_id="o1").data["bundle_id"]
+
+    res = squash_bundles(governor_instance, [first, second], owner_id="o1")
+    assert res.status == "ok"
+    assert res.data["target_files"] == ["app.py", "new.txt"]
+
+    squashed = governor_instance.bundles.get(res.data["bundle_id"])
+    assert "-b\n+B\n c\n+d" in squashed["diff_text"]
+    assert "+++ b/new.txt" in squashed["diff_text"]
+    assert squashed["metadata"]["squashed_from"] == [first, second]
+
+    # Same canonical hashing as create_change_bundle.
+    again = create_change_bundle(governor_instance, squashed["diff_text"], owner_id="o1")
+    assert again.data["bundle_id"] == res.data["bundle_id"]
+    assert "Returned existing" in again.summary
+
+
+def test_squash_reports_non_composing_chain(governor_instance):
+    second = create_change_bundle(governor_instance, SECOND, owner_id="o1").data["bundle_id"]
+    res = squash_bundles(governor_instance, [second], owner_id="o1")
+    assert res.status == "error"
+    assert res.data["key"] == "BUNDLES_DO_NOT_COMPOSE"
+    assert res.data["details"]["bundle_id"] == second
+
+
+def test_squash_is_owner_scoped(governor_instance):
+    first = create_change_bundle(governor_instance, FIRST, owner_id="o1").data["bundle_id"]
+    res = squash_bundles(governor_instance, [first], owner_id="o2")
+    assert res.code == "not_found"
+    assert res.data["key"] == "BUNDLE_NOT_FOUND"
@@ -56,4 +56,23 @@ def test_bounded_store_last_seen_updates_on_get(monkeypatch):
     store.set("k4", "v4")
     
     assert store.get("k2") is None # k2 should be evicted
-    assert store.get("k1") == "v1" # k1 should still exist
\ No newline at end of file
+    assert store.get("k1") == "v1" # k1 should still exist
+
+
+def test_bounded_store_expiry_scan_stops_at_first_live_entry(monkeypatch):
+    evicted = []
+    store = BoundedStore[str, int](max_size=10, ttl_seconds=5, on_evict=lambda k, _v: evicted.append(k))
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    store.set("old", 1)
+    now[0] = 1003.0
+    store.set("mid", 2)
+    store.set("new", 3)
+
+    # Touching "old" moves it behind the others, so order tracks last_seen_at.
+    now[0] = 1004.0
+    assert store.get("old") == 1
+    now[0] = 1008.5
+    store.set("late", 4)
+    assert evicted == ["mid", "new"]
+    assert store.keys() == ["old", "late"]
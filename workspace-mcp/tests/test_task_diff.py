@@ -0,0 +1,100 @@
+import sys
+
+from workspace_mcp.governor import Governor
+from workspace_mcp.task_diff import diff_results
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.run_lifecycle import start_run
+from workspace_mcp.tools.run_task import run_task
+from workspace_mcp.tools.task_output import read_task_output
+
+LINT = "import sys; text = open('issues.txt').read(); print(text, end=''); sys.exit(1 if text else 0)"
+
+
+def test_diff_against_previous_run_of_task(tmp_path):
+    issues = tmp_path / "issues.txt"
+    issues.write_text("a.py:1:1: E1 first\nb.py:2:1: E2 second\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"lint": [sys.executable, "-c", LINT]},
+        task_options={"lint": {"parser": "flake8"}},
+    )
+    governor = Governor(cfg)
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+
+    first = run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+    assert "diff" not in first.data  # nothing to compare with yet
+    assert len(first.data["report"]["failures"]) == 2
+
+    # b.py's issue moved down a line (same failure); a.py's is fixed; c.py is new.
+    issues.write_text("b.py:9:1: E2 second\nc.py:3:1: E3 third\n", encoding="utf-8")
+    second = run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+    diff = second.data["diff"]
+    assert diff["previous_audit_id"] == first.meta["audit_id"]
+    assert [f["id"] for f in diff["new_failures"]] == ["E3"]
+    assert [f["id"] for f in diff["resolved_failures"]] == ["E1"]
+    assert diff["unchanged_failures"] == 1
+    assert diff["summary_diff"] == []
+    assert second.data["stdout"] == "" and "failures" not in second.data["report"]
+    assert second.data["output_omitted"] is True
+
+    # The raw output is still available on demand.
+    full = read_task_output(governor, second.meta["audit_id"], owner_id="owner1")
+    assert "c.py:3:1: E3 third" in full.data["text"]
+
+    issues.write_text("", encoding="utf-8")
+    third = run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+    assert third.data["diff"]["exit_code"] == 0 and third.data["diff"]["previous_exit_code"] == 1
+    assert len(third.data["diff"]["resolved_failures"]) == 2
+    assert third.data["diff"]["summary_diff"] == ["-violations: 2", "+violations: 0"]
+
+
+def _snapshot(audit_id, failures, argv=("flake8", "."), exit_code=1):
+    return {"audit_id": audit_id, "argv": list(argv), "exit_code": exit_code, "failures": failures, "summary_lines": []}
+
+
+def test_identical_failures_are_compared_as_a_multiset():
+    unused = {"id": "F401", "file": "a.py", "line": 1, "message": "'os' imported but unused"}
+    again = dict(unused, line=7)
+    diff = diff_results(_snapshot("1", [unused]), _snapshot("2", [unused, again]))
+    assert diff["new_failures"] == [again]
+    assert diff["resolved_failures"] == []
+    assert diff["unchanged_failures"] == 1
+    assert diff["failure_count_delta"] == 1
+
+    back = diff_results(_snapshot("2", [unused, again]), _snapshot("3", [unused]))
+    assert back["resolved_failures"] == [again] and back["unchanged_failures"] == 1
+
+
+def test_runs_over_different_selections_are_not_compared():
+    full = _snapshot("1", [{"id": "t1", "file": "tests/test_a.py", "message": "boom"}], argv=["pytest", "-q"])
+    selected = _snapshot("2", [], argv=["pytest", "-q", "tests/test_b.py"], exit_code=0)
+    diff = diff_results(full, selected)
+    assert diff["comparable"] is False
+    assert "resolved_failures" not in diff and "summary_diff" not in diff
+
+
+def test_cached_result_keeps_its_output_next_to_the_diff(tmp_path):
+    issues = tmp_path / "issues.txt"
+    issues.write_text("a.py:1:1: E1 first\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"lint": [sys.executable, "-c", LINT]},
+        task_options={"lint": {"parser": "flake8", "inputs": ["*.txt"]}},
+    )
+    governor = Governor(cfg)
+    run_id = start_run(governor, owner_id="owner1").data["run_id"]
+
+    run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+    issues.write_text("b.py:2:1: E2 second\n", encoding="utf-8")
+    run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+    issues.write_text("a.py:1:1: E1 first\n", encoding="utf-8")
+    cached = run_task(governor, "lint", run_id=run_id, owner_id="owner1", diff_previous=True)
+
+    assert cached.data["cached"] is True
+    assert [f["id"] for f in cached.data["diff"]["new_failures"]] == ["E1"]
+    # No artifact backs this call, so the output is not left out.
+    assert "output_omitted" not in cached.data
+    assert cached.data["stdout"] == "a.py:1:1: E1 first\n"
+    assert len(cached.data["report"]["failures"]) == 1
@@ -0,0 +1,60 @@
+import sys
+
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.run_task import run_task
+from workspace_mcp.tools.task_output import read_task_output
+
+NOISY = "for i in range(2000):\n    print(f'line {i}')\nprint('Traceback: boom at line 1000')\n"
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={
+            "noisy": [sys.executable, "-c", NOISY],
+            "quiet": [sys.executable, "-c", "print('ok')"],
+        },
+        max_output_bytes=200,
+        max_task_output_bytes=1_000_000,
+    )
+    return Governor(cfg)
+
+
+def test_truncated_output_is_kept_and_paged(governor_instance):
+    res = run_task(governor_instance, "noisy", owner_id="owner1")
+    artifact = res.data["output_artifact"]
+    audit_id = res.meta["audit_id"]
+    assert artifact["audit_id"] == audit_id and artifact["truncated"] is False
+    assert "\nline 1000\n" not in res.data["stdout"]
+
+    page = read_task_output(governor_instance, audit_id, offset=0, length=100, owner_id="owner1")
+    assert page.status == "ok"
+    assert page.data["text"].startswith("line 0\nline 1\n")
+    assert page.data["next_offset"] == 100
+    assert page.data["total_bytes"] == artifact["stdout_bytes"]
+
+    hits = read_task_output(governor_instance, audit_id, grep=r"^line 100\d$|Traceback", owner_id="owner1")
+    assert [m["text"] for m in hits.data["matches"]][:2] == ["line 1000", "line 1001"]
+    assert hits.data["matches"][0]["line"] == 1001
+    assert hits.data["matches"][-1]["text"] == "Traceback: boom at line 1000"
+    assert hits.data["next_offset"] is None
+
+
+def test_untruncated_output_is_not_kept(governor_instance):
+    res = run_task(governor_instance, "quiet")
+    assert "output_artifact" not in res.data
+    assert read_task_output(governor_instance, res.meta["audit_id"]).code == "not_found"
+    assert len(governor_instance.task_outputs) == 0
+
+
+def test_output_is_owner_scoped(governor_instance):
+    res = run_task(governor_instance, "noisy", owner_id="owner1")
+    other = read_task_output(governor_instance, res.meta["audit_id"], owner_id="owner2")
+    assert other.code == "not_found"
+    assert other.data["key"] == "TASK_OUTPUT_NOT_FOUND"
+    bad = read_task_output(governor_instance, res.meta["audit_id"], grep="(", owner_id="owner1")
+    assert bad.code == "invalid_input"
@@ -0,0 +1,53 @@
+import json
+import sys
+
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.task_parsers import parse_junit, parse_ruff_json, parse_flake8
+from workspace_mcp.tools.run_task import run_task
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="0" failures="1" skipped="1" tests="3">
+<testcase classname="tests.test_app" name="test_ok" time="0.001"/>
+<testcase classname="tests.test_app" name="test_bad" time="0.002">
+<failure message="assert 1 == 2">def test_bad():
+&gt;       assert 1 == 2
+E       assert 1 == 2
+
+tests/test_app.py:7: AssertionError</failure>
+</testcase>
+<testcase classname="tests.test_app" name="test_skip"><skipped message="later"/></testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_junit_failures_are_compact(tmp_path):
+    summary, failures = parse_junit(JUNIT, tmp_path)
+    assert summary == {"tests": 3, "failures": 1, "errors": 0, "skipped": 1}
+    assert failures == [{"id": "tests.test_app::test_bad", "file": "tests/test_app.py", "line": 7, "message": "assert 1 == 2"}]
+
+
+def test_ruff_json_and_flake8(tmp_path):
+    ruff = json.dumps([{"code": "F401", "message": "`os` imported but unused", "filename": str(tmp_path / "src" / "app.py"), "location": {"row": 1, "column": 8}}])
+    _, failures = parse_ruff_json(ruff, tmp_path)
+    assert failures == [{"id": "F401", "file": "src/app.py", "line": 1, "message": "`os` imported but unused"}]
+
+    summary, failures = parse_flake8("./src/app.py:3:1: E302 expected 2 blank lines, found 1\nnoise\n", tmp_path)
+    assert summary == {"violations": 1}
+    assert failures[0] == {"id": "E302", "file": "src/app.py", "line": 3, "message": "expected 2 blank lines, found 1"}
+
+
+def test_run_task_reads_report_file(tmp_path):
+    script = "import sys; open(sys.argv[1], 'w').write(sys.argv[2])"
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={"test": [sys.executable, "-c", script, "{report_file}", JUNIT]},
+        task_options={"test": {"parser": "junit"}},
+    )
+    res = run_task(Governor(cfg), "test")
+    report = res.data["report"]
+    assert report["parser"] == "junit"
+    assert report["summary"]["failures"] == 1
+    assert report["failures"][0]["id"] == "tests.test_app::test_bad"
+    assert report["failures_truncated"] is False
@@ -0,0 +1,68 @@
+import sys
+
+import pytest
+from workspace_mcp.governor import Governor
+from workspace_mcp.config import PolicyConfig
+from workspace_mcp.tools.run_task import run_task
+from workspace_mcp.warm_pool import python_entry
+
+PROBE = "import sys; print('colorsys' in sys.modules); print('err', file=sys.stderr); sys.exit(3)"
+
+
+@pytest.fixture
+def governor_instance(tmp_path):
+    (tmp_path / "script.py").write_text("import sys\nprint(sys.argv[1:])\n", encoding="utf-8")
+    cfg = PolicyConfig(
+        workspace_root=str(tmp_path),
+        allow_paths=["."],
+        allow_tasks={
+            "probe": [sys.executable, "-c", PROBE],
+            "script": [sys.executable, "script.py", "a", "b"],
+            "module": [sys.executable, "-m", "platform"],
+            "unbuffered": [sys.executable, "-u", "-c", "print('cold')"],
+            "sleep": [sys.executable, "-c", "import time; time.sleep(5)"],
+        },
+        task_options={name: {"preload": ["colorsys"]} for name in ("probe", "script", "module", "unbuffered", "sleep")},
+        max_runtime_seconds=1,
+        max_warm_workers=1,
+    )
+    governor = Governor(cfg)
+    yield governor
+    governor.warm_pool.close()
+
+
+def test_python_entry_forms():
+    assert python_entry(["python3", "-c", "pass", "x"]) == ("code", "pass", ["x"])
+    assert python_entry(["/usr/bin/python3.11", "-m", "pytest", "-q"]) == ("module", "pytest", ["-q"])
+    assert python_entry(["python", "tool.py"]) == ("script", "tool.py", [])
+    assert python_entry(["python", "-u", "tool.py"]) is None
+    assert python_entry(["ruff", "check"]) is None
+
+
+def test_tasks_fork_from_preloaded_interpreter(governor_instance):
+    first = run_task(governor_instance, "probe")
+    assert first.data["warm_start"] is True
+    assert first.data["exit_code"] == 3
+    assert first.data["stdout"] == "True\n"
+    assert first.data["stderr"] == "err\n"
+    assert first.data["rusage"]["max_rss_bytes"] > 0
+
+    # The single zygote is reused for the next task.
+    script = run_task(governor_instance, "script")
+    assert script.data["warm_start"] is True
+    assert script.data["stdout"] == "['a', 'b']\n"
+    assert run_task(governor_instance, "module").data["exit_code"] == 0
+    assert governor_instance.warm_pool.warm_starts == 3
+
+
+def test_unsupported_argv_falls_back_to_subprocess(governor_instance):
+    res = run_task(governor_instance, "unbuffered")
+    assert res.data["warm_start"] is False
+    assert res.data["stdout"] == "cold\n"
+
+
+def test_timeout_kills_warm_child_and_keeps_zygote(governor_instance):
+    assert run_task(governor_instance, "sleep").code == "timeout"
+    again = run_task(governor_instance, "probe")
+    assert again.data["warm_start"] is True
+    assert again.data["stdout"] == "True\n"